@@ -2,17 +2,56 @@
 FastAPI Routes for OKX Trading System
 """
 from fastapi import APIRouter, HTTPException
-from typing import Optional, List
+from typing import Callable, Dict, Optional, List, Tuple
 from backend.models.schemas import (
-    OrderRequest, PercentageOrderRequest, ConditionalOrderRequest,
+    OrderRequest, BatchOrderRequest, PercentageOrderRequest, ConditionalOrderRequest,
     LeverageRequest, CancelOrderRequest, HistoryRequest
 )
+from backend.models.records import Fill, Order, okx_response
+from backend.config.config import config
 from backend.services.account_manager import account_manager
+from backend.services.account_snapshots import account_snapshots
+from backend.services.account_stream import STREAM_ORDER_INST_TYPES, AccountState, account_streams
+from backend.services.balance_cache import balance_cache
+from backend.services.okx_client import OKXClient
 from backend.services.trading_service import TradingService
+from backend.services.ws_order_entry import ws_order_entry
+from backend.services.ws_supervisor import ws_supervisor
+from backend.services.flatten_service import FlattenEngine
+from backend.services.http_transport import http_transport
+from backend.services.instrument_registry import instrument_registry
+from backend.services.io_pool import run_read, run_trade
+from backend.services.latency import order_latency
+from backend.services.market_data import market_feed
+from backend.services.order_book import order_book_feed
+from backend.services.order_validator import order_validator
+from backend.services.rate_limiter import rate_limiter
+from backend.services.request_scheduler import Priority, request_priority, request_scheduler
+from backend.services.single_flight import request_coalescer
+from backend.utils.json_codec import FastJSONResponse
+from backend.utils.okx_auth import server_clock
 
 router = APIRouter()
 
 
+def _for_each_account(account_names: List[str], func: Callable[[OKXClient], Dict]) -> Dict:
+    """
+    Run func(client) for each account through the AccountManager fan-out
+    
+    Unknown accounts get an error entry; results keep the input order.
+    """
+    def _run(account_name: str) -> Dict:
+        account = account_manager.get_account(account_name)
+        if not account:
+            return {
+                "code": "-1",
+                "msg": f"Account {account_name} not found"
+            }
+        return func(account)
+    
+    return dict(zip(account_names, account_manager.fan_out(account_names, _run)))
+
+
 # ==================== Account Management ====================
 
 @router.get("/accounts")
@@ -29,10 +68,29 @@ async def get_accounts():
     }
 
 
+def _from_streams(account_names: List[str], channels: tuple,
+                  read: Callable[[AccountState], Dict]) -> Tuple[Dict, List[str]]:
+    """
+    Answer accounts from their live private WebSocket state
+    
+    Returns:
+        (results of accounts served from the stream, accounts that need REST)
+    """
+    served = {}
+    missing = []
+    for account_name in account_names:
+        state = account_streams.live_state(account_name, *channels) if config.ACCOUNT_WS_ENABLED else None
+        if state is None:
+            missing.append(account_name)
+        else:
+            served[account_name] = read(state)
+    return served, missing
+
+
 @router.get("/balance")
 async def get_balance(account_names: Optional[str] = None, ccy: Optional[str] = None):
     """
-    Get account balance
+    Get account balance (from the account streams, cached REST snapshots for accounts without one)
     
     Query params:
         account_names: Comma-separated account names (optional, default: all)
@@ -45,7 +103,10 @@ async def get_balance(account_names: Optional[str] = None, ccy: Optional[str] =
         account = account_manager.get_account(accounts[0])
         if not account:
             raise HTTPException(status_code=404, detail="Account not found")
-        balance = account.get_balance(ccy=ccy)
+        balances, missing = _from_streams(accounts, ("account",), lambda state: state.get_balance(ccy=ccy))
+        if missing:
+            balances = await run_read(account_manager.get_all_balances, accounts, ccy=ccy)
+        balance = balances[accounts[0]]
         return {
             "code": "0",
             "msg": "Success",
@@ -55,11 +116,14 @@ async def get_balance(account_names: Optional[str] = None, ccy: Optional[str] =
         }
     else:
         # Multiple accounts
-        balances = account_manager.get_all_balances(accounts)
+        accounts = accounts or account_manager.get_all_accounts()
+        balances, missing = _from_streams(accounts, ("account",), lambda state: state.get_balance())
+        if missing:
+            balances.update(await run_read(account_manager.get_all_balances, missing))
         return {
             "code": "0",
             "msg": "Success",
-            "data": balances
+            "data": {name: balances[name] for name in accounts if name in balances}
         }
 
 
@@ -68,7 +132,7 @@ async def get_positions(account_names: Optional[str] = None,
                        inst_type: str = "SWAP",
                        inst_id: Optional[str] = None):
     """
-    Get positions
+    Get positions (from the account streams, cached REST snapshots for accounts without one)
     
     Query params:
         account_names: Comma-separated account names (optional)
@@ -82,7 +146,17 @@ async def get_positions(account_names: Optional[str] = None,
         account = account_manager.get_account(accounts[0])
         if not account:
             raise HTTPException(status_code=404, detail="Account not found")
-        positions = account.get_positions(inst_type=inst_type, inst_id=inst_id)
+        served, missing = _from_streams(
+            accounts, ("positions",),
+            lambda state: state.get_positions(inst_type=inst_type, inst_id=inst_id)
+        )
+        if missing:
+            positions = (await run_read(account_manager.get_all_positions, accounts,
+                                        inst_type=inst_type, inst_id=inst_id))[accounts[0]]
+        else:
+            positions = served[accounts[0]]
+            if inst_type == "SWAP" and not inst_id:
+                account_manager.remember_positions(accounts[0], positions)
         return {
             "code": "0",
             "msg": "Success",
@@ -92,11 +166,20 @@ async def get_positions(account_names: Optional[str] = None,
         }
     else:
         # Multiple accounts
-        positions = account_manager.get_all_positions(accounts, inst_type=inst_type)
+        accounts = accounts or account_manager.get_all_accounts()
+        positions, missing = _from_streams(
+            accounts, ("positions",),
+            lambda state: state.get_positions(inst_type=inst_type)
+        )
+        if inst_type == "SWAP":
+            for account_name, response in positions.items():
+                account_manager.remember_positions(account_name, response)
+        if missing:
+            positions.update(await run_read(account_manager.get_all_positions, missing, inst_type=inst_type))
         return {
             "code": "0",
             "msg": "Success",
-            "data": positions
+            "data": {name: positions[name] for name in accounts if name in positions}
         }
 
 
@@ -104,53 +187,42 @@ async def get_positions(account_names: Optional[str] = None,
 async def get_pending_orders(account_names: Optional[str] = None,
                             inst_type: str = "SWAP",
                             inst_id: Optional[str] = None):
-    """Get pending orders (including conditional orders)"""
-    accounts = account_names.split(",") if account_names else None
+    """
+    Get pending orders (including conditional orders) per account
     
-    if accounts and len(accounts) == 1:
-        # Single account
-        account = account_manager.get_account(accounts[0])
-        if not account:
-            raise HTTPException(status_code=404, detail="Account not found")
-        
-        regular_orders = account.get_pending_orders(inst_type=inst_type, inst_id=inst_id)
-        algo_orders = account.get_algo_orders(inst_type=inst_type, inst_id=inst_id)
-        
+    Served from the account streams for stream-seeded instrument types,
+    cached REST snapshots otherwise. Each account maps to {"regular_orders", "algo_orders"}.
+    """
+    accounts = account_names.split(",") if account_names else account_manager.get_all_accounts()
+    if len(accounts) == 1 and not account_manager.get_account(accounts[0]):
+        raise HTTPException(status_code=404, detail="Account not found")
+    
+    def _read(state: AccountState) -> Dict:
         return {
-            "code": "0",
-            "msg": "Success",
-            "data": {
-                "regular_orders": regular_orders,
-                "algo_orders": algo_orders
-            }
+            "regular_orders": state.get_pending_orders(inst_type=inst_type, inst_id=inst_id),
+            "algo_orders": state.get_algo_orders(inst_type=inst_type, inst_id=inst_id)
         }
+    
+    if inst_type in STREAM_ORDER_INST_TYPES:
+        orders, missing = _from_streams(accounts, ("orders", "orders-algo"), _read)
     else:
-        # Multiple accounts
-        orders = account_manager.get_all_pending_orders(accounts, inst_type=inst_type)
-        return {
-            "code": "0",
-            "msg": "Success",
-            "data": orders
-        }
+        orders, missing = {}, accounts
+    if missing:
+        orders.update(await run_read(account_manager.get_all_pending_orders, missing,
+                                     inst_type=inst_type, inst_id=inst_id))
+    return {
+        "code": "0",
+        "msg": "Success",
+        "data": {name: orders[name] for name in accounts if name in orders}
+    }
 
 
 # ==================== Trading Operations ====================
 
-@router.post("/order/place")
-async def place_order(request: OrderRequest):
-    """Place order on specified accounts"""
-    results = {}
-    
-    for account_name in request.account_names:
-        account = account_manager.get_account(account_name)
-        if not account:
-            results[account_name] = {
-                "code": "-1",
-                "msg": f"Account {account_name} not found"
-            }
-            continue
-        
-        trading_service = TradingService(account)
+def _place_orders(request: OrderRequest) -> Dict:
+    """Place order on specified accounts (blocking, runs in executor)"""
+    def _run(account: OKXClient) -> Dict:
+        trading_service = TradingService(account, channel=request.channel)
         
         # Prepare order parameters
         order_params = {
@@ -174,31 +246,135 @@ async def place_order(request: OrderRequest):
         if request.tp_ord_px:
             order_params["tp_ord_px"] = request.tp_ord_px
         
-        result = trading_service.open_position_with_sl_tp(**order_params)
-        results[account_name] = result
+        return trading_service.open_position_with_sl_tp(**order_params)
     
-    return {
-        "code": "0",
-        "msg": "Success",
-        "data": results
-    }
+    return _for_each_account(request.account_names, _run)
 
 
-@router.post("/order/place-by-percentage")
-async def place_order_by_percentage(request: PercentageOrderRequest):
-    """Place order by percentage of available balance"""
-    results = {}
+def _place_orders_simultaneous(request: OrderRequest) -> Dict:
+    """Pre-sign the order for every account and release them at once (blocking)"""
+    order_kwargs = TradingService.build_entry_order(
+        inst_id=request.inst_id,
+        side=request.side,
+        size=request.sz,
+        ord_type=request.ord_type,
+        px=request.px,
+        td_mode=request.td_mode,
+        pos_side=request.pos_side,
+        sl_trigger_px=request.sl_trigger_px,
+        sl_ord_px=request.sl_ord_px,
+        tp_trigger_px=request.tp_trigger_px,
+        tp_ord_px=request.tp_ord_px
+    )
+    dispatched = account_manager.place_order_simultaneous(request.account_names, **order_kwargs)
     
+    results = {}
     for account_name in request.account_names:
-        account = account_manager.get_account(account_name)
-        if not account:
+        outcome = dispatched["accounts"].get(account_name)
+        if not outcome:
             results[account_name] = {
                 "code": "-1",
                 "msg": f"Account {account_name} not found"
             }
             continue
-        
-        trading_service = TradingService(account)
+        results[account_name] = TradingService.entry_result(outcome["result"], order_kwargs)
+        results[account_name]["timing"] = outcome["timing"]
+    return {"results": results, "skew": dispatched["skew"]}
+
+
+@router.post("/order/place")
+async def place_order(request: OrderRequest):
+    """
+    Place order on specified accounts
+    
+    dispatch="simultaneous" pre-signs every account's order and releases them
+    together; the response then carries per-account timing and a skew summary.
+    """
+    if request.dispatch == "simultaneous":
+        dispatched = await run_trade(_place_orders_simultaneous, request)
+        return {
+            "code": "0",
+            "msg": "Success",
+            "data": dispatched["results"],
+            "skew": dispatched["skew"]
+        }
+    
+    results = await run_trade(_place_orders, request)
+    
+    return {
+        "code": "0",
+        "msg": "Success",
+        "data": results
+    }
+
+
+def _place_batch_orders(request: BatchOrderRequest) -> List[Dict]:
+    """Group orders per account, send them as batches and map results back (blocking)"""
+    orders_by_account: Dict[str, List[Dict]] = {}
+    positions: Dict[str, List[int]] = {}
+    for index, order in enumerate(request.orders):
+        body = OKXClient.build_order_data(
+            inst_id=order.inst_id,
+            td_mode=order.td_mode,
+            side=order.side,
+            ord_type=order.ord_type,
+            sz=order.sz,
+            px=order.px,
+            pos_side=order.pos_side,
+            reduce_only=order.reduce_only
+        )
+        if order.cl_ord_id:
+            body["clOrdId"] = order.cl_ord_id
+        for account_name in order.account_names or request.account_names:
+            orders_by_account.setdefault(account_name, []).append(body)
+            positions.setdefault(account_name, []).append(index)
+    
+    batch_results = account_manager.place_batch_orders_multi(orders_by_account, channel=request.channel)
+    
+    results = [{"index": index, "accounts": {}} for index in range(len(request.orders))]
+    for account_name, indexes in positions.items():
+        account_results = batch_results.get(account_name)
+        for position, index in enumerate(indexes):
+            if account_results is None:
+                results[index]["accounts"][account_name] = {
+                    "code": "-1",
+                    "msg": f"Account {account_name} not found"
+                }
+            else:
+                results[index]["accounts"][account_name] = account_results[position]
+    return results
+
+
+@router.post("/order/batch")
+async def place_batch_orders(request: BatchOrderRequest):
+    """
+    Place multiple orders per account via batch-orders
+    
+    Orders are grouped per account into batches of up to 20 that are sent
+    concurrently; `data` lists one entry per submitted order, in request order.
+    """
+    # An order with no accounts of its own and no request-level default would never be sent
+    unrouted = [index for index, order in enumerate(request.orders)
+                if not (order.account_names or request.account_names)]
+    if unrouted:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Orders at index {unrouted} have no account_names and the request sets none"
+        )
+    
+    results = await run_trade(_place_batch_orders, request)
+    
+    return {
+        "code": "0",
+        "msg": "Success",
+        "data": results
+    }
+
+
+def _place_orders_by_percentage(request: PercentageOrderRequest) -> Dict:
+    """Place order by percentage of available balance (blocking, runs in executor)"""
+    def _run(account: OKXClient) -> Dict:
+        trading_service = TradingService(account, channel=request.channel)
         
         kwargs = {}
         if request.pos_side:
@@ -208,7 +384,7 @@ async def place_order_by_percentage(request: PercentageOrderRequest):
         if request.tp_trigger_px:
             kwargs["tp_trigger_px"] = request.tp_trigger_px
         
-        result = trading_service.open_position_by_percentage(
+        return trading_service.open_position_by_percentage(
             inst_id=request.inst_id,
             side=request.side,
             percentage=request.percentage,
@@ -218,7 +394,17 @@ async def place_order_by_percentage(request: PercentageOrderRequest):
             leverage=request.leverage,
             **kwargs
         )
-        results[account_name] = result
+    
+    return _for_each_account(request.account_names, _run)
+
+
+@router.post("/order/place-by-percentage")
+async def place_order_by_percentage(request: PercentageOrderRequest):
+    """Place order by percentage of available balance"""
+    rejection = order_validator.check_percentage(request.percentage)
+    if rejection is not None:
+        return rejection
+    results = await run_trade(_place_orders_by_percentage, request)
     
     return {
         "code": "0",
@@ -227,22 +413,11 @@ async def place_order_by_percentage(request: PercentageOrderRequest):
     }
 
 
-@router.post("/order/conditional")
-async def place_conditional_order(request: ConditionalOrderRequest):
-    """Place conditional order"""
-    results = {}
-    
-    for account_name in request.account_names:
-        account = account_manager.get_account(account_name)
-        if not account:
-            results[account_name] = {
-                "code": "-1",
-                "msg": f"Account {account_name} not found"
-            }
-            continue
-        
+def _place_conditional_orders(request: ConditionalOrderRequest) -> Dict:
+    """Place conditional order (blocking, runs in executor)"""
+    def _run(account: OKXClient) -> Dict:
         trading_service = TradingService(account)
-        result = trading_service.place_conditional_order(
+        return trading_service.place_conditional_order(
             inst_id=request.inst_id,
             side=request.side,
             sz=request.sz,
@@ -253,7 +428,14 @@ async def place_conditional_order(request: ConditionalOrderRequest):
             sl_trigger_px=request.sl_trigger_px,
             tp_trigger_px=request.tp_trigger_px
         )
-        results[account_name] = result
+    
+    return _for_each_account(request.account_names, _run)
+
+
+@router.post("/order/conditional")
+async def place_conditional_order(request: ConditionalOrderRequest):
+    """Place conditional order"""
+    results = await run_trade(_place_conditional_orders, request)
     
     return {
         "code": "0",
@@ -265,7 +447,8 @@ async def place_conditional_order(request: ConditionalOrderRequest):
 @router.post("/leverage/set")
 async def set_leverage(request: LeverageRequest):
     """Set leverage for specified accounts"""
-    results = account_manager.set_leverage_multi(
+    results = await run_trade(
+        account_manager.set_leverage_multi,
         account_names=request.account_names,
         inst_id=request.inst_id,
         lever=request.lever,
@@ -282,158 +465,325 @@ async def set_leverage(request: LeverageRequest):
 @router.post("/order/cancel-all")
 async def cancel_all_orders(request: CancelOrderRequest):
     """Cancel all pending orders (including conditional orders)"""
-    results = account_manager.cancel_all_orders_multi(
-        account_names=request.account_names,
-        inst_id=request.inst_id
-    )
+    # Kill-switch traffic is admitted ahead of every other request
+    with request_priority(Priority.KILL_SWITCH):
+        results = await run_trade(
+            account_manager.cancel_all_orders_multi,
+            account_names=request.account_names,
+            inst_id=request.inst_id
+        )
     
+    # Any account whose listing or cancels failed may still have resting orders
+    incomplete = [name for name, result in results.items() if result.get("code") != "0"]
     return {
-        "code": "0",
-        "msg": "Success",
+        "code": "1" if incomplete else "0",
+        "msg": f"Cancel all incomplete for: {', '.join(incomplete)}" if incomplete else "Success",
         "data": results
     }
 
 
-@router.post("/positions/close-all")
-async def close_all_positions(request: CancelOrderRequest):
-    """Close all positions with market orders"""
-    results = {}
+def _close_all_positions(request: CancelOrderRequest) -> Dict:
+    """Flatten every position of the requested accounts in parallel (blocking, runs in executor)"""
     accounts = request.account_names or account_manager.get_all_accounts()
+    flattened = FlattenEngine(account_manager).flatten(accounts, inst_type="SWAP")
     
+    results = {}
     for account_name in accounts:
-        account = account_manager.get_account(account_name)
-        if not account:
-            results[account_name] = {
-                "code": "-1",
-                "msg": f"Account {account_name} not found"
-            }
-            continue
-        
-        trading_service = TradingService(account)
-        result = trading_service.close_all_positions(inst_type="SWAP")
-        results[account_name] = result
+        results[account_name] = flattened["accounts"].get(account_name) or {
+            "code": "-1",
+            "msg": f"Account {account_name} not found"
+        }
+    return {"accounts": results, "report": flattened["report"]}
+
+
+@router.post("/positions/close-all")
+async def close_all_positions(request: CancelOrderRequest):
+    """Close all positions via close-position, every account and position in parallel"""
+    # Kill-switch traffic is admitted ahead of every other request
+    with request_priority(Priority.KILL_SWITCH):
+        results = await run_trade(_close_all_positions, request)
     
     return {
         "code": "0",
         "msg": "Success",
-        "data": results
+        "data": results["accounts"],
+        "report": results["report"]
     }
 
 
 # ==================== History & Analytics ====================
 
-@router.post("/history/orders")
-async def get_order_history(request: HistoryRequest):
-    """Get order history"""
-    results = {}
+def _get_order_history(request: HistoryRequest) -> Dict:
+    """Get order history (blocking, runs in executor)"""
     accounts = request.account_names or account_manager.get_all_accounts()
     
-    for account_name in accounts:
-        account = account_manager.get_account(account_name)
-        if not account:
-            results[account_name] = {
-                "code": "-1",
-                "msg": f"Account {account_name} not found"
-            }
-            continue
-        
-        history = account.get_order_history(
+    def _run(account: OKXClient) -> Dict:
+        response = account.get_order_history(
             inst_type=request.inst_type,
             inst_id=request.inst_id,
             begin=request.begin,
             end=request.end,
             limit=request.limit
         )
-        results[account_name] = history
+        return okx_response(response, Order.from_response(response))
     
-    return {
+    return _for_each_account(accounts, _run)
+
+
+@router.post("/history/orders")
+async def get_order_history(request: HistoryRequest):
+    """Get order history"""
+    results = await run_read(_get_order_history, request)
+    
+    # Large multi-account payload of plain JSON types: render directly with the fast codec
+    return FastJSONResponse({
         "code": "0",
         "msg": "Success",
         "data": results
-    }
+    })
 
 
-@router.post("/history/fills")
-async def get_fills_history(request: HistoryRequest):
-    """Get transaction history with fees"""
-    results = {}
+def _get_fills_history(request: HistoryRequest) -> Dict:
+    """Get transaction history with fees (blocking, runs in executor)"""
     accounts = request.account_names or account_manager.get_all_accounts()
     
-    for account_name in accounts:
-        account = account_manager.get_account(account_name)
-        if not account:
-            results[account_name] = {
-                "code": "-1",
-                "msg": f"Account {account_name} not found"
-            }
-            continue
-        
-        fills = account.get_fills_history(
+    def _run(account: OKXClient) -> Dict:
+        response = account.get_fills_history(
             inst_type=request.inst_type,
             inst_id=request.inst_id,
             begin=request.begin,
             end=request.end,
             limit=request.limit
         )
-        results[account_name] = fills
+        return okx_response(response, Fill.from_response(response))
     
-    return {
+    return _for_each_account(accounts, _run)
+
+
+@router.post("/history/fills")
+async def get_fills_history(request: HistoryRequest):
+    """Get transaction history with fees"""
+    results = await run_read(_get_fills_history, request)
+    
+    # Large multi-account payload of plain JSON types: render directly with the fast codec
+    return FastJSONResponse({
         "code": "0",
         "msg": "Success",
         "data": results
-    }
+    })
 
 
-@router.post("/analytics/pnl")
-async def get_pnl_summary(request: HistoryRequest):
-    """Get profit/loss summary"""
-    results = {}
+def _get_pnl_summary(request: HistoryRequest) -> Dict:
+    """Get profit/loss summary (blocking, runs in executor)"""
     accounts = request.account_names or account_manager.get_all_accounts()
     
-    for account_name in accounts:
-        account = account_manager.get_account(account_name)
-        if not account:
-            results[account_name] = {
-                "code": "-1",
-                "msg": f"Account {account_name} not found"
-            }
-            continue
-        
+    def _run(account: OKXClient) -> Dict:
         trading_service = TradingService(account)
-        pnl = trading_service.get_pnl_summary(
+        return trading_service.get_pnl_summary(
             inst_type=request.inst_type,
             begin=request.begin,
             end=request.end
         )
-        results[account_name] = pnl
     
-    return {
+    return _for_each_account(accounts, _run)
+
+
+@router.post("/analytics/pnl")
+async def get_pnl_summary(request: HistoryRequest):
+    """Get profit/loss summary"""
+    results = await run_read(_get_pnl_summary, request)
+    
+    # Large multi-account payload of plain JSON types: render directly with the fast codec
+    return FastJSONResponse({
         "code": "0",
         "msg": "Success",
         "data": results
-    }
+    })
 
 
 # ==================== Market Data ====================
 
 @router.get("/market/ticker")
 async def get_ticker(inst_id: str):
-    """Get ticker information"""
+    """Get ticker information (from the market data feed, REST when the feed is down)"""
+    if config.MARKET_DATA_WS_ENABLED:
+        ticker = market_feed.get_ticker(inst_id)
+        if ticker is not None:
+            return ticker
+        await market_feed.track(inst_id)
+    
     # Use first available account for market data
     accounts = account_manager.get_all_accounts()
     if not accounts:
         raise HTTPException(status_code=500, detail="No accounts configured")
     
     account = account_manager.get_account(accounts[0])
-    return account.get_ticker(inst_id=inst_id)
+    ticker = await run_read(account.get_ticker, inst_id=inst_id)
+    ticker["source"] = "rest"
+    return ticker
 
 
-@router.get("/market/instruments")
-async def get_instruments(inst_type: str = "SWAP"):
-    """Get available instruments"""
+@router.get("/market/depth")
+async def get_depth(inst_id: str, levels: int = 20):
+    """
+    Get top order book levels (from the local book, REST when it is not in sync)
+    
+    Query params:
+        inst_id: Instrument ID
+        levels: Levels per side (default: 20, max 400)
+    """
+    levels = max(1, min(levels, 400))
+    if config.ORDER_BOOK_WS_ENABLED:
+        depth = order_book_feed.get_depth(inst_id, levels)
+        if depth is not None:
+            return depth
+        await order_book_feed.track(inst_id)
+    
     accounts = account_manager.get_all_accounts()
     if not accounts:
         raise HTTPException(status_code=500, detail="No accounts configured")
     
     account = account_manager.get_account(accounts[0])
-    return account.get_instruments(inst_type=inst_type)
+    depth = await run_read(account.get_order_book, inst_id=inst_id, sz=levels)
+    depth["source"] = "rest"
+    return depth
+
+
+@router.get("/market/instruments")
+async def get_instruments(inst_type: str = "SWAP"):
+    """Get available instruments (from the instrument registry)"""
+    return await run_read(instrument_registry.get_response, inst_type)
+
+
+# ==================== System ====================
+
+@router.get("/system/http-pool")
+async def get_http_pool_stats():
+    """Get keep-alive connection pool counters (reused vs new connections)"""
+    return {
+        "code": "0",
+        "msg": "Success",
+        "data": http_transport.get_stats()
+    }
+
+
+@router.get("/system/clock")
+async def get_server_clock():
+    """Get the measured offset to the OKX server clock used for signature timestamps"""
+    return {
+        "code": "0",
+        "msg": "Success",
+        "data": server_clock.get_stats()
+    }
+
+
+@router.get("/system/rate-limits")
+async def get_rate_limits():
+    """Get token bucket fill levels per account and endpoint group"""
+    return {
+        "code": "0",
+        "msg": "Success",
+        "data": {
+            "enabled": rate_limiter.enabled,
+            "buckets": rate_limiter.snapshot()
+        }
+    }
+
+
+@router.get("/system/scheduler")
+async def get_scheduler_stats():
+    """Get per-account queue depth and queue-wait time per priority class"""
+    return {
+        "code": "0",
+        "msg": "Success",
+        "data": {
+            "enabled": request_scheduler.enabled,
+            "accounts": request_scheduler.snapshot()
+        }
+    }
+
+
+@router.get("/system/market-data")
+async def get_market_data_stats():
+    """Get market data feed connection state and tracked instruments"""
+    return {
+        "code": "0",
+        "msg": "Success",
+        "data": market_feed.get_stats()
+    }
+
+
+@router.get("/system/account-streams")
+async def get_account_stream_stats():
+    """Get private WebSocket connection and snapshot state per account"""
+    return {
+        "code": "0",
+        "msg": "Success",
+        "data": {
+            "enabled": config.ACCOUNT_WS_ENABLED,
+            "accounts": account_streams.get_stats()
+        }
+    }
+
+
+@router.get("/system/order-latency")
+async def get_order_latency():
+    """Get order entry round-trip latency, REST and WebSocket side by side"""
+    return {
+        "code": "0",
+        "msg": "Success",
+        "data": {
+            "latency": order_latency.snapshot(),
+            "connections": ws_order_entry.get_stats()
+        }
+    }
+
+
+@router.get("/system/order-validation")
+async def get_order_validation():
+    """Get pre-trade validation counters (orders checked, normalized and rejected locally by reason)"""
+    return {
+        "code": "0",
+        "msg": "Success",
+        "data": order_validator.get_stats()
+    }
+
+
+@router.get("/system/request-coalescing")
+async def get_request_coalescing():
+    """Get single-flight coalescing counters (upstream vs coalesced GETs and hit rate per endpoint)"""
+    return {
+        "code": "0",
+        "msg": "Success",
+        "data": request_coalescer.get_stats()
+    }
+
+
+@router.get("/system/account-snapshots")
+async def get_account_snapshots():
+    """Get hit, stale-hit, miss and invalidation counters of the account snapshot cache"""
+    return {
+        "code": "0",
+        "msg": "Success",
+        "data": account_snapshots.get_stats()
+    }
+
+
+@router.get("/system/balance-cache")
+async def get_balance_cache():
+    """Get hit/miss counters and entry ages of the percentage-sizing balance cache"""
+    return {
+        "code": "0",
+        "msg": "Success",
+        "data": balance_cache.get_stats()
+    }
+
+
+@router.get("/system/websockets")
+async def get_websocket_health():
+    """Get health, message rates and reconnect counts of every supervised WebSocket"""
+    return {
+        "code": "0",
+        "msg": "Success",
+        "data": ws_supervisor.get_health()
+    }
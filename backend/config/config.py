@@ -20,14 +20,136 @@ class Config:
     OKX_API_URL = os.getenv("OKX_API_URL", "https://www.okx.com")
     OKX_WS_URL = os.getenv("OKX_WS_URL", "wss://ws.okx.com:8443/ws/v5/public")
     
+    # Request Signing
+    # Seconds between measurements of the OKX server clock offset (signature timestamps)
+    SERVER_CLOCK_SYNC_INTERVAL = float(os.getenv("SERVER_CLOCK_SYNC_INTERVAL", 300))
+    
+    # WebSocket Supervisor (heartbeats and reconnects of every OKX WebSocket)
+    # OKX drops connections idle for 30s; ping after this many silent seconds
+    WS_PING_INTERVAL = float(os.getenv("WS_PING_INTERVAL", 20))
+    # Reconnect when a ping gets no pong within this many seconds
+    WS_PONG_TIMEOUT = float(os.getenv("WS_PONG_TIMEOUT", 5))
+    WS_MONITOR_INTERVAL = float(os.getenv("WS_MONITOR_INTERVAL", 1))
+    # Reconnect backoff doubles from min to max seconds, with jitter
+    WS_RECONNECT_MIN_DELAY = float(os.getenv("WS_RECONNECT_MIN_DELAY", 1))
+    WS_RECONNECT_MAX_DELAY = float(os.getenv("WS_RECONNECT_MAX_DELAY", 30))
+    # Backoff restarts from min only after a connection stayed up this long or received data
+    WS_RECONNECT_RESET_AFTER = float(os.getenv("WS_RECONNECT_RESET_AFTER", 10))
+    
+    # Public Market Data Feed (WebSocket tickers and mark prices)
+    MARKET_DATA_WS_ENABLED = os.getenv("MARKET_DATA_WS_ENABLED", "true").lower() in ('true', '1', 'yes')
+    # Instruments subscribed at startup; others are added when first requested
+    MARKET_DATA_INSTRUMENTS = [
+        inst_id.strip()
+        for inst_id in os.getenv("MARKET_DATA_INSTRUMENTS", "BTC-USDT-SWAP,ETH-USDT-SWAP").split(",")
+        if inst_id.strip()
+    ]
+    # Instruments added on request that stay subscribed (least recently requested are dropped)
+    MARKET_DATA_MAX_TRACKED = int(os.getenv("MARKET_DATA_MAX_TRACKED", 50))
+    
+    # Local L2 Order Books (served by /market/depth)
+    ORDER_BOOK_WS_ENABLED = os.getenv("ORDER_BOOK_WS_ENABLED", "true").lower() in ('true', '1', 'yes')
+    # "books" (400 levels, incremental with checksum) or "books5" (5-level snapshots)
+    ORDER_BOOK_CHANNEL = os.getenv("ORDER_BOOK_CHANNEL", "books")
+    ORDER_BOOK_INSTRUMENTS = [
+        inst_id.strip()
+        for inst_id in os.getenv("ORDER_BOOK_INSTRUMENTS", "BTC-USDT-SWAP,ETH-USDT-SWAP").split(",")
+        if inst_id.strip()
+    ]
+    # Books added on request that are kept (least recently requested are dropped)
+    ORDER_BOOK_MAX_TRACKED = int(os.getenv("ORDER_BOOK_MAX_TRACKED", 20))
+    
+    # Private Account Streams (balance, positions and orders pushed per account)
+    ACCOUNT_WS_ENABLED = os.getenv("ACCOUNT_WS_ENABLED", "true").lower() in ('true', '1', 'yes')
+    OKX_WS_PRIVATE_URL = os.getenv("OKX_WS_PRIVATE_URL", "wss://ws.okx.com:8443/ws/v5/private")
+    OKX_WS_PRIVATE_DEMO_URL = os.getenv("OKX_WS_PRIVATE_DEMO_URL", "wss://wspap.okx.com:8443/ws/v5/private")
+    
+    # Order entry over the private WebSocket (requests choose channel="ws")
+    ORDER_WS_ENABLED = os.getenv("ORDER_WS_ENABLED", "true").lower() in ('true', '1', 'yes')
+    
     # Trading Configuration
     DEFAULT_LEVERAGE = int(os.getenv("DEFAULT_LEVERAGE", 10))
     MAX_RETRY_ATTEMPTS = int(os.getenv("MAX_RETRY_ATTEMPTS", 3))
     REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", 10))
     
+    # HTTP Connection Pool Configuration
+    # Number of per-host pools kept alive, and connections kept per host
+    HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", 4))
+    HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", 32))
+    # Block instead of opening throwaway connections when a host pool is exhausted
+    HTTP_POOL_BLOCK = os.getenv("HTTP_POOL_BLOCK", "false").lower() in ('true', '1', 'yes')
+    # Drop pooled connections after this many idle seconds (0 disables)
+    HTTP_POOL_IDLE_TIMEOUT = float(os.getenv("HTTP_POOL_IDLE_TIMEOUT", 50))
+    # Connections opened at startup so the first orders skip the TLS handshake
+    HTTP_POOL_WARM_CONNECTIONS = int(os.getenv("HTTP_POOL_WARM_CONNECTIONS", 4))
+    # Shared aiohttp connector limits for AsyncOKXClient (0 = unlimited)
+    ASYNC_HTTP_LIMIT = int(os.getenv("ASYNC_HTTP_LIMIT", 1000))
+    ASYNC_HTTP_LIMIT_PER_HOST = int(os.getenv("ASYNC_HTTP_LIMIT_PER_HOST", 0))
+    
+    # Serialization
+    # JSON codec for OKX payloads and API responses: auto (orjson when installed), orjson or json
+    JSON_CODEC = os.getenv("JSON_CODEC", "auto").lower()
+    
+    # Metrics
+    # Prometheus /metrics endpoint (OKX call and route latency histograms, error counters)
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ('true', '1', 'yes')
+    # Label combinations kept per metric; further ones are folded into label value "other"
+    METRICS_MAX_SERIES = int(os.getenv("METRICS_MAX_SERIES", 2000))
+    
     # Multi-Account Request Configuration
-    # Delay between requests when operating on multiple accounts (in seconds)
-    MULTI_ACCOUNT_REQUEST_INTERVAL = float(os.getenv("MULTI_ACCOUNT_REQUEST_INTERVAL", 0.2))
+    # Fan-out mode: "concurrent" sends to all accounts at once, "serial" one by one
+    MULTI_ACCOUNT_FANOUT_MODE = os.getenv("MULTI_ACCOUNT_FANOUT_MODE", "concurrent").lower()
+    # Maximum number of accounts requested at the same time in concurrent mode
+    MULTI_ACCOUNT_MAX_CONCURRENCY = int(os.getenv("MULTI_ACCOUNT_MAX_CONCURRENCY", 10))
+    # Simultaneous dispatch: max seconds accounts wait for each other before sending anyway
+    DISPATCH_BARRIER_TIMEOUT = float(os.getenv("DISPATCH_BARRIER_TIMEOUT", 5))
+    # Alert when the same order lands on different accounts further apart than this (ms)
+    ORDER_SKEW_ALERT_MS = float(os.getenv("ORDER_SKEW_ALERT_MS", 50))
+    
+    # Rate Limiting (token buckets per account and endpoint group)
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ('true', '1', 'yes')
+    # Fraction of OKX's published limit we allow ourselves to use
+    RATE_LIMIT_HEADROOM = float(os.getenv("RATE_LIMIT_HEADROOM", 0.9))
+    # After a 50011/429 the refill rate halves, never below this fraction of the limit
+    RATE_LIMIT_MIN_RATE_FRACTION = float(os.getenv("RATE_LIMIT_MIN_RATE_FRACTION", 0.1))
+    # Fraction of the limit restored per successful request while recovering
+    RATE_LIMIT_RECOVERY_STEP = float(os.getenv("RATE_LIMIT_RECOVERY_STEP", 0.05))
+    
+    # Flatten (close-all) Configuration
+    # Positions read within this many seconds are closed without re-fetching first
+    FLATTEN_SNAPSHOT_MAX_AGE = float(os.getenv("FLATTEN_SNAPSHOT_MAX_AGE", 10))
+    
+    # Priority Request Scheduler (per account)
+    SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "true").lower() in ('true', '1', 'yes')
+    # Requests in flight per account; beyond this requests queue by priority class
+    SCHEDULER_MAX_INFLIGHT_PER_ACCOUNT = int(os.getenv("SCHEDULER_MAX_INFLIGHT_PER_ACCOUNT", 8))
+    # Queued history / market-data reads are dropped after waiting this long (seconds)
+    SCHEDULER_DROP_AFTER_HISTORY = float(os.getenv("SCHEDULER_DROP_AFTER_HISTORY", 5))
+    SCHEDULER_DROP_AFTER_MARKET = float(os.getenv("SCHEDULER_DROP_AFTER_MARKET", 2))
+    
+    # Exchange I/O Thread Pools (route layer)
+    # Order traffic gets its own workers so dashboard reads never queue in front of it
+    TRADE_IO_WORKERS = int(os.getenv("TRADE_IO_WORKERS", 16))
+    READ_IO_WORKERS = int(os.getenv("READ_IO_WORKERS", 16))
+    # Parallel sub-requests inside one client operation (e.g. chunked batch cancels)
+    CLIENT_IO_WORKERS = int(os.getenv("CLIENT_IO_WORKERS", 32))
+    
+    # Instrument registry: seconds between background reloads of instrument metadata
+    INSTRUMENT_REFRESH_INTERVAL = float(os.getenv("INSTRUMENT_REFRESH_INTERVAL", 3600))
+    
+    # Single-flight: identical in-flight GETs of an account share one upstream request
+    REQUEST_COALESCING_ENABLED = os.getenv("REQUEST_COALESCING_ENABLED", "true").lower() in ('true', '1', 'yes')
+    
+    # Account snapshot cache: REST balance/positions/orders reused for TTL seconds, served stale
+    # (while refreshing in the background) up to STALE_TTL seconds; 0 disables
+    ACCOUNT_SNAPSHOT_TTL = float(os.getenv("ACCOUNT_SNAPSHOT_TTL", 1))
+    ACCOUNT_SNAPSHOT_STALE_TTL = float(os.getenv("ACCOUNT_SNAPSHOT_STALE_TTL", 5))
+    
+    # Percentage sizing: seconds an account's available balance is reused
+    BALANCE_CACHE_TTL = float(os.getenv("BALANCE_CACHE_TTL", 5))
+    
+    # Pre-trade validation: normalize and reject orders locally against cached instrument rules
+    PRETRADE_VALIDATION_ENABLED = os.getenv("PRETRADE_VALIDATION_ENABLED", "true").lower() in ('true', '1', 'yes')
     
     # Position Size Presets (percentage of available balance)
     POSITION_SIZE_PRESETS = [10, 20, 25, 33, 50, 66, 100]
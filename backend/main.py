@@ -1,16 +1,34 @@
 """
 OKX Trading System - FastAPI Backend
 """
-from fastapi import FastAPI
+import asyncio
+import time
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from backend.api.routes import router
 from backend.config.config import config
+from backend.services.http_transport import http_transport
+from backend.services.instrument_registry import instrument_registry
+from backend.services.async_okx_client import close_shared_session
+from backend.services.market_data import market_feed
+from backend.services.order_book import order_book_feed
+from backend.services.account_manager import account_manager
+from backend.services.account_stream import account_streams
+from backend.services.ws_order_entry import ws_order_entry
+from backend.services.ws_supervisor import ws_supervisor
+from backend.services import io_pool
+from backend.services.metrics import CONTENT_TYPE, http_request_seconds, metrics
+from backend.utils.json_codec import FastJSONResponse
+from backend.utils.okx_auth import server_clock
 
 # Create FastAPI app
 app = FastAPI(
     title="OKX Trading System",
     description="Multi-account trading system for OKX perpetual contracts",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
 
 # Configure CORS
@@ -26,6 +44,97 @@ app.add_middleware(
 app.include_router(router, prefix="/api/v1", tags=["trading"])
 
 
+@app.middleware("http")
+async def time_requests(request: Request, call_next):
+    """Record handling time per route template (not raw path, which would include ids)"""
+    if not config.METRICS_ENABLED:
+        return await call_next(request)
+    start = time.perf_counter()
+    status = "500"
+    try:
+        response = await call_next(request)
+        status = str(response.status_code)
+        return response
+    finally:
+        route = request.scope.get("route")
+        http_request_seconds.observe(
+            request.method,
+            getattr(route, "path", "unmatched"),
+            status,
+            seconds=time.perf_counter() - start
+        )
+
+
+@app.on_event("startup")
+def warm_connections():
+    """Open keep-alive connections to OKX before the first request"""
+    result = http_transport.warm()
+    print(f"HTTP pool warmed: {result['requested'] - result['failed']}/{result['requested']} connections")
+
+
+async def _clock_sync_loop():
+    """Re-measure the server clock offset every SERVER_CLOCK_SYNC_INTERVAL seconds"""
+    while True:
+        await asyncio.sleep(config.SERVER_CLOCK_SYNC_INTERVAL)
+        result = await io_pool.run_read(http_transport.sync_clock)
+        if result.get("code") != "0":
+            print(f"Server clock sync failed: {result.get('msg')}")
+
+
+@app.on_event("startup")
+async def sync_server_clock():
+    """Measure the offset to the OKX server clock before the first signed request"""
+    result = await io_pool.run_read(http_transport.sync_clock)
+    if result.get("code") == "0":
+        print(f"Server clock offset: {server_clock.get_stats()['offset_ms']}ms")
+    else:
+        print(f"Server clock sync failed: {result.get('msg')}")
+    app.state.clock_sync_task = asyncio.get_running_loop().create_task(_clock_sync_loop())
+
+
+@app.on_event("startup")
+async def load_instruments():
+    """Load SWAP instrument metadata and keep it refreshed in the background"""
+    result = await io_pool.run_read(instrument_registry.load, "SWAP")
+    if result.get("code") != "0":
+        print(f"Instrument registry load failed: {result.get('msg')}")
+    instrument_registry.start_refresh()
+
+
+@app.on_event("startup")
+async def start_websockets():
+    """Register the enabled WebSocket connections with the supervisor and start them"""
+    if config.MARKET_DATA_WS_ENABLED:
+        ws_supervisor.add("market", market_feed)
+    if config.ORDER_BOOK_WS_ENABLED:
+        ws_supervisor.add("books", order_book_feed)
+    if config.ACCOUNT_WS_ENABLED:
+        for name, stream in account_streams.create(account_manager.accounts).items():
+            ws_supervisor.add(f"account:{name}", stream)
+    if config.ORDER_WS_ENABLED:
+        for name, connection in ws_order_entry.create(account_manager.async_accounts).items():
+            ws_supervisor.add(f"orders:{name}", connection)
+            account_manager.accounts[name].ws_orders = connection
+            account_manager.async_accounts[name].ws_orders = connection
+    ws_supervisor.start()
+
+
+@app.on_event("shutdown")
+async def close_async_connector():
+    """Stop the WebSocket connections and close the shared aiohttp connector"""
+    await ws_supervisor.stop()
+    await instrument_registry.stop_refresh()
+    if getattr(app.state, "clock_sync_task", None) is not None:
+        app.state.clock_sync_task.cancel()
+    await close_shared_session()
+
+
+@app.on_event("shutdown")
+def release_io_threads():
+    """Release the exchange I/O thread pools"""
+    io_pool.shutdown()
+
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -45,6 +154,14 @@ async def health_check():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """OKX call and route latency histograms and error counters in the Prometheus text format"""
+    if not config.METRICS_ENABLED:
+        return Response(status_code=404)
+    return Response(content=metrics.render(), media_type=CONTENT_TYPE)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -0,0 +1,228 @@
+"""
+OKX Records - typed, compact records for OKX string-number payloads
+
+OKX sends every number as a string. Records parse the fields the services
+compute with once, on ingestion: money and sizes become Decimal (exact,
+same digits as sent), timestamps int, everything else stays str. Each
+record class only stores its declared fields in __slots__; to_okx() turns
+a record back into the OKX string format at the edge.
+"""
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ZERO = Decimal(0)
+
+
+def to_decimal(value: Any, default: Optional[Decimal] = ZERO) -> Optional[Decimal]:
+    """Decimal of an OKX number string ("" and missing values give default)"""
+    if value is None or value == "":
+        return default
+    try:
+        return Decimal(value)
+    except (InvalidOperation, TypeError, ValueError):
+        return default
+
+
+def _price(value: Any) -> Optional[Decimal]:
+    """Prices have no natural zero: "" stays None"""
+    return to_decimal(value, None)
+
+
+def _ms(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _text(value: Any) -> str:
+    return "" if value is None else value
+
+
+def format_number(value: Any) -> str:
+    """OKX string form of a parsed field (None gives "")"""
+    return "" if value is None else str(value)
+
+
+def okx_response(response: Dict, records: List["Record"]) -> Dict:
+    """OKX response with its data rebuilt from records (error responses pass through)"""
+    if response.get("code") != "0":
+        return response
+    return dict(response, data=[record.to_okx() for record in records])
+
+
+def _slots(fields: Tuple[Tuple[str, str, Callable], ...]) -> Tuple[str, ...]:
+    return tuple(attr for attr, _, _ in fields)
+
+
+class Record:
+    """
+    Base record: FIELDS lists (attribute, OKX field, parser) in payload order
+
+    Subclasses declare FIELDS and __slots__ = _slots(FIELDS).
+    """
+
+    __slots__ = ()
+    FIELDS: Tuple[Tuple[str, str, Callable], ...] = ()
+
+    @classmethod
+    def from_okx(cls, data: Dict) -> "Record":
+        record = cls.__new__(cls)
+        get = data.get
+        for attr, key, parse in cls.FIELDS:
+            setattr(record, attr, parse(get(key)))
+        return record
+
+    @classmethod
+    def from_response(cls, response: Dict) -> List["Record"]:
+        """Records of a successful OKX response's data ([] for errors)"""
+        if response.get("code") != "0":
+            return []
+        return [cls.from_okx(entry) for entry in response.get("data") or []]
+
+    def to_okx(self) -> Dict[str, str]:
+        """OKX-format dict (numbers as strings)"""
+        return {key: format_number(getattr(self, attr)) for attr, key, _ in self.FIELDS}
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{attr}={getattr(self, attr)!r}" for attr, _, _ in self.FIELDS)
+        return f"{type(self).__name__}({values})"
+
+
+class BalanceDetail(Record):
+    """One currency of /account/balance details"""
+
+    FIELDS = (
+        ("ccy", "ccy", _text),
+        ("eq", "eq", to_decimal),
+        ("cash_bal", "cashBal", to_decimal),
+        ("avail_bal", "availBal", to_decimal),
+        ("avail_eq", "availEq", to_decimal),
+        ("frozen_bal", "frozenBal", to_decimal),
+        ("upl", "upl", to_decimal),
+        ("u_time", "uTime", _ms),
+    )
+    __slots__ = _slots(FIELDS)
+
+
+class Balance(Record):
+    """/account/balance entry with its currency details"""
+
+    FIELDS = (
+        ("total_eq", "totalEq", to_decimal),
+        ("iso_eq", "isoEq", to_decimal),
+        ("adj_eq", "adjEq", _price),
+        ("imr", "imr", _price),
+        ("mmr", "mmr", _price),
+        ("u_time", "uTime", _ms),
+    )
+    __slots__ = _slots(FIELDS) + ("details",)
+
+    @classmethod
+    def from_okx(cls, data: Dict) -> "Balance":
+        record = super().from_okx(data)
+        record.details = [BalanceDetail.from_okx(detail) for detail in data.get("details") or []]
+        return record
+
+    def to_okx(self) -> Dict:
+        return dict(super().to_okx(), details=[detail.to_okx() for detail in self.details])
+
+    def detail(self, ccy: str) -> Optional[BalanceDetail]:
+        for detail in self.details:
+            if detail.ccy == ccy:
+                return detail
+        return None
+
+
+class Position(Record):
+    """/account/positions entry"""
+
+    FIELDS = (
+        ("inst_type", "instType", _text),
+        ("inst_id", "instId", _text),
+        ("mgn_mode", "mgnMode", _text),
+        ("pos_side", "posSide", _text),
+        ("pos", "pos", to_decimal),
+        ("avail_pos", "availPos", to_decimal),
+        ("avg_px", "avgPx", _price),
+        ("mark_px", "markPx", _price),
+        ("liq_px", "liqPx", _price),
+        ("upl", "upl", to_decimal),
+        ("upl_ratio", "uplRatio", to_decimal),
+        ("lever", "lever", _price),
+        ("margin", "margin", to_decimal),
+        ("pos_id", "posId", _text),
+        ("c_time", "cTime", _ms),
+        ("u_time", "uTime", _ms),
+    )
+    __slots__ = _slots(FIELDS)
+
+
+class Order(Record):
+    """/trade/order(s) entry"""
+
+    FIELDS = (
+        ("inst_type", "instType", _text),
+        ("inst_id", "instId", _text),
+        ("ord_id", "ordId", _text),
+        ("cl_ord_id", "clOrdId", _text),
+        ("side", "side", _text),
+        ("pos_side", "posSide", _text),
+        ("td_mode", "tdMode", _text),
+        ("ord_type", "ordType", _text),
+        ("state", "state", _text),
+        ("px", "px", _price),
+        ("sz", "sz", to_decimal),
+        ("acc_fill_sz", "accFillSz", to_decimal),
+        ("avg_px", "avgPx", _price),
+        ("fee", "fee", to_decimal),
+        ("fee_ccy", "feeCcy", _text),
+        ("pnl", "pnl", to_decimal),
+        ("reduce_only", "reduceOnly", _text),
+        ("c_time", "cTime", _ms),
+        ("u_time", "uTime", _ms),
+    )
+    __slots__ = _slots(FIELDS)
+
+
+class Fill(Record):
+    """/trade/fills(-history) entry"""
+
+    FIELDS = (
+        ("inst_type", "instType", _text),
+        ("inst_id", "instId", _text),
+        ("trade_id", "tradeId", _text),
+        ("ord_id", "ordId", _text),
+        ("bill_id", "billId", _text),
+        ("side", "side", _text),
+        ("pos_side", "posSide", _text),
+        ("fill_px", "fillPx", _price),
+        ("fill_sz", "fillSz", to_decimal),
+        ("fill_pnl", "fillPnl", to_decimal),
+        ("fee", "fee", to_decimal),
+        ("fee_ccy", "feeCcy", _text),
+        ("exec_type", "execType", _text),
+        ("ts", "ts", _ms),
+    )
+    __slots__ = _slots(FIELDS)
+
+
+class Bill(Record):
+    """/account/bills(-archive) entry"""
+
+    FIELDS = (
+        ("bill_id", "billId", _text),
+        ("inst_type", "instType", _text),
+        ("inst_id", "instId", _text),
+        ("ccy", "ccy", _text),
+        ("type", "type", _text),
+        ("sub_type", "subType", _text),
+        ("pnl", "pnl", to_decimal),
+        ("fee", "fee", to_decimal),
+        ("bal_chg", "balChg", to_decimal),
+        ("bal", "bal", to_decimal),
+        ("px", "px", _price),
+        ("sz", "sz", _price),
+        ("ts", "ts", _ms),
+    )
+    __slots__ = _slots(FIELDS)
@@ -19,6 +19,29 @@ class OrderRequest(BaseModel):
     sl_ord_px: Optional[str] = Field(None, description="Stop loss order price")
     tp_trigger_px: Optional[str] = Field(None, description="Take profit trigger price")
     tp_ord_px: Optional[str] = Field(None, description="Take profit order price")
+    dispatch: str = Field(default="fanout", description="Dispatch mode: fanout or simultaneous (pre-signed, released at once)")
+    channel: str = Field(default="rest", description="Order entry channel: rest or ws (private WebSocket, fanout only)")
+
+
+class BatchOrderItem(BaseModel):
+    """One order of a batch"""
+    inst_id: str = Field(..., description="Instrument ID (e.g., BTC-USDT-SWAP)")
+    side: str = Field(..., description="Order side: buy or sell")
+    ord_type: str = Field(default="market", description="Order type: market or limit")
+    sz: str = Field(..., description="Order size (contracts)")
+    px: Optional[str] = Field(None, description="Order price (for limit orders)")
+    td_mode: str = Field(default="cross", description="Trade mode: cross or isolated")
+    pos_side: Optional[str] = Field(None, description="Position side: long or short")
+    reduce_only: bool = Field(default=False, description="Reduce position only")
+    cl_ord_id: Optional[str] = Field(None, description="Client order ID")
+    account_names: Optional[List[str]] = Field(None, description="Accounts for this order (default: request accounts)")
+
+
+class BatchOrderRequest(BaseModel):
+    """Multi-order placement request (sent through batch-orders, 20 per request)"""
+    account_names: List[str] = Field(default_factory=list, description="Default accounts for every order")
+    orders: List[BatchOrderItem] = Field(..., description="Orders to place")
+    channel: str = Field(default="rest", description="Order entry channel: rest or ws (private WebSocket)")
 
 
 class PercentageOrderRequest(BaseModel):
@@ -34,6 +57,7 @@ class PercentageOrderRequest(BaseModel):
     pos_side: Optional[str] = Field(None, description="Position side")
     sl_trigger_px: Optional[str] = Field(None, description="Stop loss trigger price")
     tp_trigger_px: Optional[str] = Field(None, description="Take profit trigger price")
+    channel: str = Field(default="rest", description="Order entry channel: rest or ws (private WebSocket)")
 
 
 class ConditionalOrderRequest(BaseModel):
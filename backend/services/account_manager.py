@@ -1,11 +1,17 @@
 """
 Multi-Account Management Service
 """
-import time
 import asyncio
-from typing import Dict, List, Optional, Any
+import contextvars
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor
+from backend.models.records import Order, okx_response
+from backend.services.account_snapshots import account_snapshots
 from backend.services.okx_client import OKXClient
+from backend.services.async_okx_client import AsyncOKXClient
+from backend.services.io_pool import run_parallel
 from backend.config.config import config
 
 
@@ -14,11 +20,21 @@ class AccountManager:
     
     def __init__(self):
         self.accounts: Dict[str, OKXClient] = {}
+        self.async_accounts: Dict[str, AsyncOKXClient] = {}
+        # Last positions response per account: name -> (monotonic time, response)
+        self._position_snapshots: Dict[str, Tuple[float, Dict]] = {}
+        # Short-lived REST snapshots behind the aggregated queries (stale-while-revalidate)
+        self.snapshots = account_snapshots
         self._load_accounts()
-        # Request interval between accounts (in seconds) - configurable
-        self.request_interval = config.MULTI_ACCOUNT_REQUEST_INTERVAL
-        self.executor = ThreadPoolExecutor(max_workers=5)
-        print(f"AccountManager initialized with {len(self.accounts)} accounts, request interval: {self.request_interval}s")
+        # Multi-account fan-out: "concurrent" (bounded thread pool) or "serial"
+        self.fanout_mode = config.MULTI_ACCOUNT_FANOUT_MODE
+        self.max_concurrency = config.MULTI_ACCOUNT_MAX_CONCURRENCY
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix="account-fanout"
+        )
+        print(f"AccountManager initialized with {len(self.accounts)} accounts, "
+              f"fan-out: {self.fanout_mode} (max {self.max_concurrency})")
     
     def _load_accounts(self):
         """Load all configured accounts"""
@@ -30,13 +46,19 @@ class AccountManager:
                 api_key=credentials["api_key"],
                 secret_key=credentials["secret_key"],
                 passphrase=credentials["passphrase"],
-                simulated=simulated
+                simulated=simulated,
+                name=name
             )
+            self.async_accounts[name] = AsyncOKXClient.from_client(self.accounts[name])
     
     def get_account(self, account_name: str) -> Optional[OKXClient]:
         """Get specific account client"""
         return self.accounts.get(account_name)
     
+    def get_async_account(self, account_name: str) -> Optional[AsyncOKXClient]:
+        """Get specific account asyncio client"""
+        return self.async_accounts.get(account_name)
+    
     def get_all_accounts(self) -> List[str]:
         """Get list of all account names"""
         return list(self.accounts.keys())
@@ -82,9 +104,63 @@ class AccountManager:
                 "data": []
             }
     
+    def fan_out(self, account_names: List[str], func: Callable[[str], Any]) -> List[Any]:
+        """
+        Run func(account_name) for every account
+        
+        Concurrent mode keeps at most MULTI_ACCOUNT_MAX_CONCURRENCY calls in
+        flight, so total latency tracks the slowest account instead of the sum.
+        Serial mode runs one account at a time. Pacing against OKX limits is
+        done per account and endpoint by the client's rate limiter.
+        
+        Args:
+            account_names: List of account names
+            func: Callable receiving the account name
+        
+        Returns:
+            Results in the same order as account_names
+        """
+        if self.fanout_mode == "concurrent":
+            return self.run_concurrent(account_names, func)
+        
+        return [func(account_name) for account_name in account_names]
+    
+    def run_concurrent(self, items: List[Any], func: Callable[[Any], Any]) -> List[Any]:
+        """
+        Run func(item) for every item on the fan-out pool
+        
+        Args:
+            items: Work items
+            func: Callable receiving one item
+        
+        Returns:
+            Results in the same order as items
+        """
+        if len(items) <= 1:
+            return [func(item) for item in items]
+        # Carry context variables (e.g. request priority) into the worker threads
+        context = contextvars.copy_context()
+        return list(self.executor.map(lambda item: context.copy().run(func, item), items))
+    
+    def fan_out_accounts(self, account_names: List[str],
+                          call: Callable[[OKXClient], Any]) -> Dict[str, Any]:
+        """
+        Run call(client) for every known account
+        
+        Args:
+            account_names: List of account names (unknown names are skipped)
+            call: Callable receiving the account's OKXClient
+        
+        Returns:
+            Dict of account name to result, in input order
+        """
+        names = [name for name in account_names if name in self.accounts]
+        results = self.fan_out(names, lambda name: call(self.accounts[name]))
+        return dict(zip(names, results))
+    
     def execute_multi(self, account_names: List[str], operation: str, **kwargs) -> List[Dict]:
         """
-        Execute operation on multiple accounts with delay to prevent API conflicts
+        Execute operation on multiple accounts
         
         Args:
             account_names: List of account names
@@ -92,18 +168,12 @@ class AccountManager:
             **kwargs: Arguments for the operation
         
         Returns:
-            List of results for each account
+            List of results for each account (in input order)
         """
-        results = []
-        for i, account_name in enumerate(account_names):
-            # Add delay between requests (except for the first one)
-            if i > 0:
-                time.sleep(self.request_interval)
-            
-            result = self.execute_single(account_name, operation, **kwargs)
-            results.append(result)
-        
-        return results
+        return self.fan_out(
+            account_names,
+            lambda account_name: self.execute_single(account_name, operation, **kwargs)
+        )
     
     def execute_all(self, operation: str, **kwargs) -> List[Dict]:
         """
@@ -120,93 +190,106 @@ class AccountManager:
     
     # ==================== Aggregated Queries ====================
     
-    def get_all_balances(self, account_names: Optional[List[str]] = None) -> Dict:
+    def get_all_balances(self, account_names: Optional[List[str]] = None,
+                         ccy: Optional[str] = None) -> Dict:
         """
-        Get balances for multiple accounts with request interval delay
+        Get balances for multiple accounts (through the snapshot cache)
         
         Args:
             account_names: List of account names (None for all accounts)
+            ccy: Currency (optional)
         
         Returns:
             Aggregated balance information
         """
         accounts = account_names or self.get_all_accounts()
-        balances = {}
-        
-        for i, account_name in enumerate(accounts):
-            # Add delay between requests to prevent API conflicts
-            if i > 0:
-                time.sleep(self.request_interval)
-            
-            account = self.get_account(account_name)
-            if account:
-                balance = account.get_balance()
-                balances[account_name] = balance
-        
-        return balances
+        return self.fan_out_accounts(
+            accounts,
+            lambda account: self.snapshots.get(
+                account.name, ("balance", ccy), lambda: account.get_balance(ccy=ccy)
+            )
+        )
     
     def get_all_positions(self, account_names: Optional[List[str]] = None,
-                         inst_type: str = "SWAP") -> Dict:
+                         inst_type: str = "SWAP", inst_id: Optional[str] = None) -> Dict:
         """
-        Get positions for multiple accounts with request interval delay
+        Get positions for multiple accounts (through the snapshot cache)
         
         Args:
             account_names: List of account names (None for all accounts)
             inst_type: Instrument type
+            inst_id: Instrument ID (optional)
         
         Returns:
             Aggregated position information
         """
         accounts = account_names or self.get_all_accounts()
-        positions = {}
-        
-        for i, account_name in enumerate(accounts):
-            # Add delay between requests to prevent API conflicts
-            if i > 0:
-                time.sleep(self.request_interval)
-            
-            account = self.get_account(account_name)
-            if account:
-                position = account.get_positions(inst_type=inst_type)
-                positions[account_name] = position
-        
+        positions = self.fan_out_accounts(
+            accounts,
+            lambda account: self.snapshots.get(
+                account.name, ("positions", inst_type, inst_id),
+                lambda: account.get_positions(inst_type=inst_type, inst_id=inst_id)
+            )
+        )
+        if inst_type == "SWAP" and not inst_id:
+            for account_name, response in positions.items():
+                self.remember_positions(account_name, response)
         return positions
     
+    def remember_positions(self, account_name: str, response: Dict):
+        """Keep a full SWAP positions response as the account's known position state"""
+        if response.get("code") == "0":
+            # Cached REST snapshots are dated by when they were fetched
+            age = (response.get("age_ms") or 0) if response.get("source") == "rest" else 0
+            self._position_snapshots[account_name] = (time.monotonic() - age / 1000, response)
+    
+    def get_known_positions(self, account_name: str, max_age: float) -> Optional[Dict]:
+        """
+        Get the last positions response if it is younger than max_age seconds
+        
+        Returns:
+            Positions response or None when unknown/stale
+        """
+        snapshot = self._position_snapshots.get(account_name)
+        if snapshot and time.monotonic() - snapshot[0] <= max_age:
+            return snapshot[1]
+        return None
+    
     def get_all_pending_orders(self, account_names: Optional[List[str]] = None,
-                              inst_type: str = "SWAP") -> Dict:
-        """Get pending orders for multiple accounts with request interval delay"""
+                              inst_type: str = "SWAP", inst_id: Optional[str] = None) -> Dict:
+        """
+        Get pending regular and algo orders for multiple accounts (through the snapshot cache)
+        
+        Returns:
+            Dict of account name to {"regular_orders": ..., "algo_orders": ...}
+        """
         accounts = account_names or self.get_all_accounts()
-        orders = {}
         
-        for i, account_name in enumerate(accounts):
-            # Add delay between requests to prevent API conflicts
-            if i > 0:
-                time.sleep(self.request_interval)
-            
-            account = self.get_account(account_name)
-            if account:
-                pending = account.get_pending_orders(inst_type=inst_type)
-                orders[account_name] = pending
+        def _orders(account: OKXClient) -> Dict:
+            regular_orders, algo_orders = run_parallel([
+                lambda: self.snapshots.get(
+                    account.name, ("orders", inst_type, inst_id),
+                    lambda: account.get_pending_orders(inst_type=inst_type, inst_id=inst_id)
+                ),
+                lambda: self.snapshots.get(
+                    account.name, ("algo_orders", inst_type, inst_id),
+                    lambda: account.get_algo_orders(inst_type=inst_type, inst_id=inst_id)
+                )
+            ])
+            # Same shape as the stream-served orders (see AccountState.get_pending_orders)
+            regular_orders = okx_response(regular_orders, Order.from_response(regular_orders))
+            return {"regular_orders": regular_orders, "algo_orders": algo_orders}
         
-        return orders
+        return self.fan_out_accounts(accounts, _orders)
     
     def cancel_all_orders_multi(self, account_names: Optional[List[str]] = None,
                                inst_id: Optional[str] = None) -> Dict:
-        """Cancel all orders for multiple accounts with request interval delay"""
+        """Cancel all orders for multiple accounts"""
         accounts = account_names or self.get_all_accounts()
-        results = {}
-        
-        for i, account_name in enumerate(accounts):
-            # Add delay between requests to prevent API conflicts
-            if i > 0:
-                time.sleep(self.request_interval)
-            
-            account = self.get_account(account_name)
-            if account:
-                result = account.cancel_all_orders(inst_id=inst_id)
-                results[account_name] = result
-        
-        return results
+        return self.fan_out_accounts(
+            accounts,
+            lambda account: account.cancel_all_orders(inst_id=inst_id)
+        )
     
     # ==================== Trading Operations ====================
     
@@ -214,21 +297,40 @@ class AccountManager:
                          td_mode: str, side: str, ord_type: str, sz: str,
                          **kwargs) -> Dict:
         """
-        Place order on multiple accounts with request interval delay
+        Place order on multiple accounts
         
-        IMPORTANT: Adds delay between each account to prevent API conflicts
+        In concurrent mode all accounts are sent at once (bounded by
+        MULTI_ACCOUNT_MAX_CONCURRENCY); serial mode sends them one by one.
         """
-        results = {}
-        
-        for i, account_name in enumerate(account_names):
-            # Add delay between requests to prevent API conflicts
-            # Critical for trading operations to avoid rate limits
-            if i > 0:
-                time.sleep(self.request_interval)
-            
+        return self.fan_out_accounts(
+            account_names,
+            lambda account: account.place_order(
+                inst_id=inst_id,
+                td_mode=td_mode,
+                side=side,
+                ord_type=ord_type,
+                sz=sz,
+                **kwargs
+            )
+        )
+    
+    def place_order_simultaneous(self, account_names: List[str], inst_id: str,
+                                 td_mode: str, side: str, ord_type: str, sz: str,
+                                 **kwargs) -> Dict:
+        """
+        Place the same order on multiple accounts at the same instant
+        
+        Every account's request is built and signed up front, then all of
+        them are released together (see dispatch_simultaneous).
+        
+        Returns:
+            Per-account results with send/ack/exchange timestamps and skew summary
+        """
+        prepared = {}
+        for account_name in account_names:
             account = self.get_account(account_name)
             if account:
-                result = account.place_order(
+                prepared[account_name] = account.prepare_order(
                     inst_id=inst_id,
                     td_mode=td_mode,
                     side=side,
@@ -236,30 +338,170 @@ class AccountManager:
                     sz=sz,
                     **kwargs
                 )
-                results[account_name] = result
+        return self.dispatch_simultaneous(prepared)
+    
+    def dispatch_simultaneous(self, prepared: Dict[str, Dict]) -> Dict:
+        """
+        Release pre-signed requests for several accounts at the same instant
+        
+        One thread per account takes its scheduler slot and rate budget, then
+        all threads wait on a barrier and send together, so the spread between
+        the first and the last account is a thread wake-up rather than a round trip.
+        
+        Args:
+            prepared: Account name to request built by OKXClient.prepare()/prepare_order()
+        
+        Returns:
+            {"accounts": {name: {"result", "timing"}}, "skew": {...}} in input order
+        """
+        # Orders the validator rejected while preparing are answered without dispatching
+        rejected = {
+            name: {"result": request["rejection"], "timing": {}}
+            for name, request in prepared.items() if name in self.accounts and "rejection" in request
+        }
+        names = [name for name in prepared if name in self.accounts and name not in rejected]
+        if not names:
+            return {"accounts": rejected, "skew": self._dispatch_skew({})}
+        
+        barrier = threading.Barrier(len(names))
+        outcomes: Dict[str, Dict] = {}
+        
+        def _dispatch(account_name: str):
+            account = self.accounts[account_name]
+            request = prepared[account_name]
+            admitted = False
+            error = None
+            try:
+                admitted = account.acquire_budget(request["endpoint"], request["data"])
+            except Exception as e:
+                # Still meet the barrier below so the other accounts stay synchronized
+                error = f"Request failed: {str(e)}"
+            try:
+                try:
+                    barrier.wait(config.DISPATCH_BARRIER_TIMEOUT)
+                    synchronized = True
+                except threading.BrokenBarrierError:
+                    synchronized = False
+                if not admitted:
+                    outcomes[account_name] = {
+                        "result": {"code": "-1", "msg": error or "Request dropped by scheduler", "data": []},
+                        "timing": {"synchronized": synchronized}
+                    }
+                    return
+                send_ts = time.time()
+                start = time.perf_counter()
+                try:
+                    result = account.send_prepared(request)
+                except Exception as e:
+                    # The order may or may not have reached OKX; report it rather than lose the account
+                    result = {"code": "-1", "msg": f"Request failed: {str(e)}", "data": []}
+                latency = time.perf_counter() - start
+            finally:
+                if admitted:
+                    account.release_budget()
+            outcomes[account_name] = {
+                "result": result,
+                "timing": {
+                    "send_ts": round(send_ts * 1000, 3),
+                    "ack_ts": round((send_ts + latency) * 1000, 3),
+                    "latency_ms": round(latency * 1000, 3),
+                    "exchange_ts": self._exchange_ts(result),
+                    "synchronized": synchronized
+                }
+            }
         
+        threads = [threading.Thread(target=_dispatch, args=(name,), daemon=True) for name in names]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        accounts = {
+            name: outcomes.get(name) or rejected.get(name) or {
+                "result": {"code": "-1", "msg": "Dispatch failed without a result", "data": []},
+                "timing": {}
+            }
+            for name in prepared if name in self.accounts
+        }
+        return {"accounts": accounts, "skew": self._dispatch_skew(accounts)}
+    
+    @staticmethod
+    def _exchange_ts(result: Dict) -> Optional[int]:
+        """Exchange-side processing timestamp (ms) of an order acknowledgement"""
+        try:
+            return int(result["data"][0]["ts"])
+        except (KeyError, IndexError, TypeError, ValueError):
+            return None
+    
+    @staticmethod
+    def _dispatch_skew(accounts: Dict[str, Dict]) -> Dict:
+        """Spread of send, ack and exchange timestamps across accounts"""
+        def _spread(field: str) -> Optional[float]:
+            values = [entry["timing"][field] for entry in accounts.values()
+                      if entry["timing"].get(field) is not None]
+            return round(max(values) - min(values), 3) if len(values) > 1 else None
+        
+        skew = {
+            "send_skew_ms": _spread("send_ts"),
+            "ack_skew_ms": _spread("ack_ts"),
+            "exchange_skew_ms": _spread("exchange_ts"),
+            "alert_threshold_ms": config.ORDER_SKEW_ALERT_MS
+        }
+        measured = skew["exchange_skew_ms"] if skew["exchange_skew_ms"] is not None else skew["ack_skew_ms"]
+        skew["alert"] = measured is not None and measured > config.ORDER_SKEW_ALERT_MS
+        if skew["alert"]:
+            print(f"WARNING: cross-account order skew {measured}ms exceeds "
+                  f"{config.ORDER_SKEW_ALERT_MS}ms across {len(accounts)} accounts")
+        return skew
+    
+    def place_batch_orders_multi(self, orders_by_account: Dict[str, List[Dict]],
+                                 channel: str = "rest") -> Dict[str, List[Dict]]:
+        """
+        Place several orders per account through /api/v5/trade/batch-orders
+        
+        Each account's orders are split into batches of BATCH_ORDER_MAX_SIZE and
+        all batches of all accounts are sent concurrently.
+        
+        Args:
+            orders_by_account: Account name to list of order bodies
+                               (OKXClient.build_order_data format)
+            channel: Order entry channel ("rest" or "ws")
+        
+        Returns:
+            Account name to per-order results, aligned with the input lists
+        """
+        chunk_size = OKXClient.BATCH_ORDER_MAX_SIZE
+        chunks = [
+            (account_name, orders[i:i + chunk_size])
+            for account_name, orders in orders_by_account.items()
+            if account_name in self.accounts
+            for i in range(0, len(orders), chunk_size)
+        ]
+        
+        def _send(chunk):
+            account_name, orders = chunk
+            return self.accounts[account_name].place_batch_orders(orders, channel=channel)
+        
+        responses = self.run_concurrent(chunks, _send)
+        
+        results: Dict[str, List[Dict]] = {}
+        for (account_name, orders), response in zip(chunks, responses):
+            results.setdefault(account_name, []).extend(
+                OKXClient.split_batch_response(response, len(orders))
+            )
         return results
     
     def set_leverage_multi(self, account_names: List[str], inst_id: str,
                           lever: int, mgn_mode: str = "cross") -> Dict:
-        """Set leverage on multiple accounts with request interval delay"""
-        results = {}
-        
-        for i, account_name in enumerate(account_names):
-            # Add delay between requests to prevent API conflicts
-            if i > 0:
-                time.sleep(self.request_interval)
-            
-            account = self.get_account(account_name)
-            if account:
-                result = account.set_leverage(
-                    inst_id=inst_id,
-                    lever=lever,
-                    mgn_mode=mgn_mode
-                )
-                results[account_name] = result
-        
-        return results
+        """Set leverage on multiple accounts"""
+        return self.fan_out_accounts(
+            account_names,
+            lambda account: account.set_leverage(
+                inst_id=inst_id,
+                lever=lever,
+                mgn_mode=mgn_mode
+            )
+        )
 
 
 # Global account manager instance
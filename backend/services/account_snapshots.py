@@ -0,0 +1,112 @@
+"""
+Account Snapshot Cache - short-lived REST snapshots of account state with stale-while-revalidate
+"""
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from backend.config.config import config
+from backend.services.io_pool import read_executor
+
+
+class AccountSnapshotCache:
+    """
+    Balance, positions and pending (algo) order responses per account
+
+    A response younger than ACCOUNT_SNAPSHOT_TTL is served as is. Up to
+    ACCOUNT_SNAPSHOT_STALE_TTL it is still served, flagged stale, while one
+    background refresh fetches a new one; older entries are fetched inline.
+    Every state-changing request of an account drops all of its entries, and
+    a generation counter keeps reads that were in flight at that moment from
+    being stored.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, stale_ttl: Optional[float] = None):
+        self.ttl = config.ACCOUNT_SNAPSHOT_TTL if ttl is None else ttl
+        self.stale_ttl = max(config.ACCOUNT_SNAPSHOT_STALE_TTL if stale_ttl is None else stale_ttl, self.ttl)
+        # (account name, key) -> (fetched at, response)
+        self._entries: Dict[Tuple[str, tuple], Tuple[float, Dict]] = {}
+        self._generations: Dict[str, int] = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._counts = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "invalidations": 0}
+
+    def get(self, account_name: str, key: tuple, fetch: Callable[[], Dict]) -> Dict:
+        """
+        Cached response for (account, key), calling fetch() when there is none usable
+
+        Args:
+            account_name: Account name
+            key: Request identity, e.g. ("positions", inst_type, inst_id)
+            fetch: Blocking call returning the REST response
+
+        Returns:
+            Response with "source": "rest", "age_ms" (age of the snapshot) and "stale"
+        """
+        cache_key = (account_name, key)
+        if self.ttl <= 0:
+            return self._response(fetch(), 0.0, stale=False)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            age = now - entry[0] if entry else None
+            if entry is not None and age < self.ttl:
+                self._counts["hits"] += 1
+                return self._response(entry[1], age, stale=False)
+            if entry is not None and age < self.stale_ttl:
+                self._counts["stale_hits"] += 1
+                if cache_key not in self._refreshing:
+                    self._refreshing.add(cache_key)
+                    self._counts["refreshes"] += 1
+                    read_executor.submit(self._refresh, cache_key, fetch)
+                return self._response(entry[1], age, stale=True)
+            self._counts["misses"] += 1
+        return self._response(self._fetch(cache_key, fetch), 0.0, stale=False)
+
+    def invalidate(self, account_name: str):
+        """Drop every snapshot of an account (called after every state-changing request)"""
+        with self._lock:
+            for cache_key in [cache_key for cache_key in self._entries if cache_key[0] == account_name]:
+                del self._entries[cache_key]
+            self._generations[account_name] = self._generations.get(account_name, 0) + 1
+            self._counts["invalidations"] += 1
+
+    def _fetch(self, cache_key: Tuple[str, tuple], fetch: Callable[[], Dict]) -> Dict:
+        generation = self._generations.get(cache_key[0], 0)
+        fetched_at = time.monotonic()
+        response = fetch()
+        if response.get("code") == "0":
+            with self._lock:
+                if self._generations.get(cache_key[0], 0) == generation:
+                    self._entries[cache_key] = (fetched_at, response)
+        return response
+
+    def _refresh(self, cache_key: Tuple[str, tuple], fetch: Callable[[], Dict]):
+        try:
+            self._fetch(cache_key, fetch)
+        except Exception as e:
+            print(f"Snapshot refresh failed for {cache_key[0]} {cache_key[1]}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(cache_key)
+
+    @staticmethod
+    def _response(response: Dict, age: float, stale: bool) -> Dict:
+        result = dict(response)
+        result["source"] = "rest"
+        result["age_ms"] = round(age * 1000, 3)
+        result["stale"] = stale
+        return result
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._counts)
+            stats["entries"] = len(self._entries)
+            stats["refreshing"] = len(self._refreshing)
+        stats["ttl_s"] = self.ttl
+        stats["stale_ttl_s"] = self.stale_ttl
+        return stats
+
+
+# Global snapshot cache (invalidated by OKXClient on every state-changing request)
+account_snapshots = AccountSnapshotCache()
@@ -0,0 +1,258 @@
+"""
+Account Stream Service - per-account private WebSocket state (balance, positions, orders)
+"""
+import time
+from typing import Callable, Dict, List, Optional
+
+from backend.models.records import Order, okx_response, to_decimal
+from backend.services.io_pool import run_parallel, run_read
+from backend.services.okx_client import OKXClient
+from backend.services.okx_ws import PrivateOKXWebSocket
+
+
+# Private channels mirrored into the account state
+PRIVATE_CHANNELS = [
+    {"channel": "account"},
+    {"channel": "positions", "instType": "ANY"},
+    {"channel": "orders", "instType": "ANY"},
+    {"channel": "orders-algo", "instType": "ANY"},
+]
+
+# Order states that are still pending; anything else removes the order
+LIVE_ORDER_STATES = ("live", "partially_filled")
+LIVE_ALGO_STATES = ("live", "pause", "partially_effective")
+# Algo order types covered by the orders-algo channel
+STREAM_ALGO_ORDER_TYPES = ("conditional,oco", "trigger")
+# Instrument types whose pending orders are seeded, so only these are served from the stream
+STREAM_ORDER_INST_TYPES = ("SWAP",)
+
+
+def _order_key(order: Dict) -> str:
+    return order.get("ordId") or order.get("clOrdId")
+
+
+def _algo_key(order: Dict) -> str:
+    return order.get("algoId") or order.get("algoClOrdId")
+
+
+def _position_key(position: Dict) -> str:
+    return position.get("posId") or f"{position.get('instId')}:{position.get('posSide')}:{position.get('mgnMode')}"
+
+
+class AccountState:
+    """
+    Live in-memory copy of one account
+
+    Tables become ready once their initial snapshot arrived: balance from
+    the channel's first push, positions from the first push or the REST gap
+    fill, pending orders from the gap fill (the orders channels only push
+    changes).
+    """
+
+    def __init__(self):
+        self.balance: Optional[Dict] = None
+        self.balance_details: Dict[str, Dict] = {}
+        self.positions: Dict[str, Dict] = {}
+        self.orders: Dict[str, Order] = {}
+        self.algo_orders: Dict[str, Dict] = {}
+        self.ready = {"account": False, "positions": False, "orders": False, "orders-algo": False}
+        self.updated = 0.0
+        # ids removed by a push before the REST seed landed, so the seed cannot revive them;
+        # only kept until that channel is seeded
+        self._closed_positions = set()
+        self._closed_orders = set()
+        self._closed_algos = set()
+        self._seeded = set()
+
+    def reset(self):
+        self.__init__()
+
+    def apply(self, channel: str, entries: List[Dict]):
+        """Apply one channel push"""
+        self.updated = time.monotonic()
+        if channel == "account":
+            for entry in entries:
+                self.balance = {key: value for key, value in entry.items() if key != "details"}
+                for detail in entry.get("details") or []:
+                    self.balance_details[detail.get("ccy")] = detail
+            self.ready["account"] = True
+        elif channel == "positions":
+            for position in entries:
+                key = _position_key(position)
+                if to_decimal(position.get("pos")) == 0:
+                    self.positions.pop(key, None)
+                    if "positions" not in self._seeded:
+                        self._closed_positions.add(key)
+                else:
+                    self.positions[key] = position
+            self.ready["positions"] = True
+        elif channel == "orders":
+            closed = None if "orders" in self._seeded else self._closed_orders
+            self._merge(self.orders, closed, entries, _order_key, LIVE_ORDER_STATES, Order.from_okx)
+        elif channel == "orders-algo":
+            closed = None if "orders-algo" in self._seeded else self._closed_algos
+            self._merge(self.algo_orders, closed, entries, _algo_key, LIVE_ALGO_STATES)
+
+    @staticmethod
+    def _merge(table: Dict, closed: Optional[set], entries: List[Dict], key_func: Callable,
+               live_states: tuple, parse: Optional[Callable] = None):
+        for order in entries:
+            key = key_func(order)
+            if order.get("state") in live_states:
+                table[key] = parse(order) if parse else order
+            else:
+                table.pop(key, None)
+                if closed is not None:
+                    closed.add(key)
+
+    def seed(self, channel: str, response: Dict) -> bool:
+        """Load positions or pending orders from a REST response (pushes received meanwhile win)"""
+        if response.get("code") != "0":
+            return False
+        entries = response.get("data") or []
+        parse = None
+        if channel == "positions":
+            table, closed, key_func = self.positions, self._closed_positions, _position_key
+            entries = [entry for entry in entries if to_decimal(entry.get("pos")) != 0]
+        elif channel == "orders":
+            table, closed, key_func = self.orders, self._closed_orders, _order_key
+            parse = Order.from_okx
+        else:
+            table, closed, key_func = self.algo_orders, self._closed_algos, _algo_key
+        for entry in entries:
+            key = key_func(entry)
+            if key not in closed and key not in table:
+                table[key] = parse(entry) if parse else entry
+        # Pushes are authoritative from here on; tombstones are no longer needed
+        closed.clear()
+        self._seeded.add(channel)
+        self.ready[channel] = True
+        return True
+
+    def age_ms(self) -> float:
+        return round((time.monotonic() - self.updated) * 1000, 3) if self.updated else None
+
+    def _response(self, data: List[Dict]) -> Dict:
+        return {"code": "0", "msg": "", "data": data, "source": "ws", "age_ms": self.age_ms()}
+
+    def get_balance(self, ccy: Optional[str] = None) -> Dict:
+        """Balance in the /account/balance response format"""
+        details = [
+            detail for name, detail in self.balance_details.items()
+            if not ccy or name == ccy
+        ]
+        return self._response([dict(self.balance or {}, details=details)])
+
+    def get_positions(self, inst_type: str = "SWAP", inst_id: Optional[str] = None) -> Dict:
+        """Open positions in the /account/positions response format"""
+        return self._response(self._filter(self.positions.values(), inst_type, inst_id))
+
+    def pending_orders(self, inst_type: str = "SWAP", inst_id: Optional[str] = None) -> List[Order]:
+        """Pending order records"""
+        return [
+            order for order in self.orders.values()
+            if (not inst_type or order.inst_type == inst_type)
+            and (not inst_id or order.inst_id == inst_id)
+        ]
+
+    def get_pending_orders(self, inst_type: str = "SWAP", inst_id: Optional[str] = None) -> Dict:
+        """Pending orders in the /trade/orders-pending response format"""
+        return okx_response(self._response([]), self.pending_orders(inst_type, inst_id))
+
+    def get_algo_orders(self, inst_type: str = "SWAP", inst_id: Optional[str] = None) -> Dict:
+        """Pending algo orders in the /trade/orders-algo-pending response format"""
+        return self._response(self._filter(self.algo_orders.values(), inst_type, inst_id))
+
+    @staticmethod
+    def _filter(entries, inst_type: Optional[str], inst_id: Optional[str]) -> List[Dict]:
+        return [
+            entry for entry in entries
+            if (not inst_type or entry.get("instType") == inst_type)
+            and (not inst_id or entry.get("instId") == inst_id)
+        ]
+
+
+class AccountStream(PrivateOKXWebSocket):
+    """Private WebSocket of one account, mirrored into an AccountState"""
+
+    def __init__(self, client: OKXClient):
+        super().__init__(client, f"Account stream {client.name}")
+        self.state = AccountState()
+
+    async def on_connect(self):
+        await super().on_connect()
+        self.state.reset()
+        await self.subscribe(PRIVATE_CHANNELS)
+
+    async def gap_fill(self) -> bool:
+        """
+        Snapshot positions and pending orders over REST after every connect
+        
+        Covers changes missed while disconnected and seeds the orders tables,
+        which the orders channels never push on subscribe.
+        """
+        calls = [lambda inst_type=inst_type: self.client.get_positions(inst_type=inst_type)
+                 for inst_type in STREAM_ORDER_INST_TYPES]
+        calls += [lambda inst_type=inst_type: self.client.get_pending_orders(inst_type=inst_type)
+                  for inst_type in STREAM_ORDER_INST_TYPES]
+        calls += [lambda inst_type=inst_type, ord_type=ord_type:
+                  self.client.get_algo_orders(ord_type=ord_type, inst_type=inst_type)
+                  for inst_type in STREAM_ORDER_INST_TYPES
+                  for ord_type in STREAM_ALGO_ORDER_TYPES]
+        responses = await run_read(run_parallel, calls)
+        
+        count = len(STREAM_ORDER_INST_TYPES)
+        self.state.seed("positions", OKXClient.merge_responses(responses[:count]))
+        self.state.seed("orders", OKXClient.merge_responses(responses[count:2 * count]))
+        self.state.seed("orders-algo", OKXClient.merge_responses(responses[2 * count:]))
+        return True
+
+    def handle_message(self, message: Dict):
+        channel = (message.get("arg") or {}).get("channel")
+        if "data" in message and channel in self.state.ready:
+            self.state.apply(channel, message["data"])
+
+    def on_disconnect(self):
+        self.state.reset()
+
+    def live_state(self, *channels: str) -> Optional[AccountState]:
+        """The account state if connected and all channels have their snapshot, else None"""
+        if self.connected and all(self.state.ready[channel] for channel in channels):
+            return self.state
+        return None
+
+    def get_stats(self) -> Dict:
+        stats = super().get_stats()
+        stats.update(
+            ready=dict(self.state.ready),
+            positions=len(self.state.positions),
+            orders=len(self.state.orders),
+            algo_orders=len(self.state.algo_orders),
+            age_ms=self.state.age_ms()
+        )
+        return stats
+
+
+class AccountStreamManager:
+    """Account streams keyed by account name (run by the WebSocket supervisor)"""
+
+    def __init__(self):
+        self.streams: Dict[str, AccountStream] = {}
+
+    def create(self, clients: Dict[str, OKXClient]) -> Dict[str, AccountStream]:
+        """Create one stream per account"""
+        for name, client in clients.items():
+            self.streams.setdefault(name, AccountStream(client))
+        return dict(self.streams)
+
+    def live_state(self, account_name: str, *channels: str) -> Optional[AccountState]:
+        """Live state of an account for the given channels, None when REST must answer"""
+        stream = self.streams.get(account_name)
+        return stream.live_state(*channels) if stream else None
+
+    def get_stats(self) -> Dict:
+        return {name: stream.get_stats() for name, stream in sorted(self.streams.items())}
+
+
+# Global stream manager
+account_streams = AccountStreamManager()
@@ -0,0 +1,333 @@
+"""
+Async OKX API Client - asyncio trading functionality on a shared aiohttp connector
+"""
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from backend.services.latency import order_latency
+from backend.services.io_pool import run_read
+from backend.services.metrics import record_dropped, record_okx_call, record_retry
+from backend.services.okx_client import TIMESTAMP_EXPIRED_CODE, OKXClient
+from backend.services.rate_limiter import RATE_LIMIT_CODE
+from backend.services.request_scheduler import priority_for
+from backend.config.config import config
+from backend.utils.json_codec import loads
+
+
+# One session (and connector) per event loop, shared by every AsyncOKXClient
+_shared_sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+
+
+def get_shared_session() -> aiohttp.ClientSession:
+    """
+    Get the aiohttp session shared by all async clients on the running loop
+
+    Returns:
+        aiohttp.ClientSession backed by a single pooled TCPConnector
+    """
+    loop = asyncio.get_running_loop()
+    session = _shared_sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=config.ASYNC_HTTP_LIMIT,
+            limit_per_host=config.ASYNC_HTTP_LIMIT_PER_HOST,
+            keepalive_timeout=config.HTTP_POOL_IDLE_TIMEOUT or None,
+            ttl_dns_cache=300
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            # Shared across accounts, so never carry cookies between them
+            cookie_jar=aiohttp.DummyCookieJar()
+        )
+        _shared_sessions[loop] = session
+    return session
+
+
+async def close_shared_session():
+    """Close the shared session of the running loop (call on shutdown)"""
+    session = _shared_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
+class AsyncOKXClient(OKXClient):
+    """
+    Asyncio OKX API client
+
+    Exposes the same methods as OKXClient; every method returns an awaitable:
+
+        balance = await client.get_balance()
+
+    All instances share one connector per event loop, so many account
+    requests can be in flight at once without a thread per request.
+    """
+
+    def __init__(self, api_key: str, secret_key: str, passphrase: str, simulated: bool = False,
+                 session: Optional[aiohttp.ClientSession] = None, name: Optional[str] = None):
+        super().__init__(api_key, secret_key, passphrase, simulated, name=name)
+        self._session = session
+
+    @classmethod
+    def from_client(cls, client: OKXClient) -> "AsyncOKXClient":
+        """Create an async client with the credentials of an existing OKXClient"""
+        return cls(
+            api_key=client.api_key,
+            secret_key=client.secret_key,
+            passphrase=client.passphrase,
+            simulated=client.simulated,
+            name=client.name
+        )
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Session used for requests (shared session unless one was injected)"""
+        if self._session is not None and not self._session.closed:
+            return self._session
+        return get_shared_session()
+
+    async def _request(self, method: str, endpoint: str, params: Optional[Dict] = None,
+                       data: Optional[Any] = None) -> Dict:
+        """
+        Make authenticated request to OKX API
+
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            endpoint: API endpoint
+            params: Query parameters
+            data: Request body data
+
+        Returns:
+            API response as dictionary
+        """
+        if method == "GET" and self.coalescer.enabled:
+            key = self.coalescer.key(self.name, method, endpoint, params)
+            return await self.coalescer.do_async(key, lambda: self._request_once(method, endpoint, params, data))
+        return await self._request_once(method, endpoint, params, data)
+
+    async def _request_once(self, method: str, endpoint: str, params: Optional[Dict] = None,
+                            data: Optional[Any] = None) -> Dict:
+        """Send of one request, invalidating cached state after POSTs (see _request)"""
+        try:
+            return await self._send(method, endpoint, params, data)
+        finally:
+            if method == "POST":
+                self.state_changed()
+
+    async def _wait_budget_async(self, endpoint: str, cost: int):
+        """Sleep until the account's rate-limit budget covers the request (no scheduler slot held)"""
+        wait = self.limiter.reserve(self.name, endpoint, cost)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def _send(self, method: str, endpoint: str, params: Optional[Dict] = None,
+                    data: Optional[Any] = None, slot_held: bool = False) -> Dict:
+        """Send a request within the rate-limit budget, retrying when OKX throttles it (see OKXClient._send)"""
+        priority = priority_for(endpoint)
+        cost = self.limiter.request_cost(endpoint, data)
+        result = None
+        resynced = False
+
+        for attempt in range(self.max_attempts):
+            await self._wait_budget_async(endpoint, cost)
+            if not slot_held and not await self.scheduler.acquire_async(self.name, priority):
+                record_dropped(self.name, priority.name.lower())
+                return self._dropped_response(priority)
+            # Sign once admitted (timestamp must be fresh)
+            url, headers, body = self._prepare_request(method, endpoint, params, data)
+
+            start = time.perf_counter()
+            try:
+                result, throttled = await self._transmit_async(method, url, headers, params, body)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                record_okx_call(self.name, endpoint, "rest", time.perf_counter() - start, None)
+                return self._failed_response(e)
+            finally:
+                if not slot_held:
+                    self.scheduler.release(self.name)
+
+            record_okx_call(self.name, endpoint, "rest", time.perf_counter() - start, result, throttled)
+
+            self.limiter.record(self.name, endpoint, throttled)
+            if not throttled and result.get("code") == TIMESTAMP_EXPIRED_CODE and not resynced:
+                resynced = True
+                record_retry(self.name, endpoint, "timestamp_expired")
+                await run_read(self.transport.sync_clock)
+                continue
+            if not throttled:
+                return result
+            if attempt + 1 < self.max_attempts:
+                record_retry(self.name, endpoint, "throttled")
+
+        # Still throttled after all attempts (rejected requests are never executed)
+        return result or {
+            "code": RATE_LIMIT_CODE,
+            "msg": f"Rate limited by OKX after {self.max_attempts} attempts",
+            "data": []
+        }
+
+    async def _transmit_async(self, method: str, url: str, headers: Dict, params: Optional[Dict],
+                              body: str) -> Tuple[Optional[Dict], bool]:
+        """
+        Send one signed request over the shared aiohttp session
+
+        Returns:
+            Tuple of (response dict or None, whether OKX throttled the request)
+
+        Raises:
+            aiohttp.ClientError / asyncio.TimeoutError on network/HTTP errors,
+            ValueError when the body is not JSON (e.g. a proxy error page)
+        """
+        async with self.session.request(
+            method=method,
+            url=url,
+            headers=headers,
+            params=params,
+            data=body,
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        ) as response:
+            if response.status == 429:
+                return None, True
+            response.raise_for_status()
+            result = loads(await response.read())
+            return result, result.get("code") == RATE_LIMIT_CODE
+
+    @staticmethod
+    def _failed_response(error: Exception) -> Dict:
+        return {
+            "code": "-1",
+            "msg": f"Request failed: {str(error) or type(error).__name__}",
+            "data": []
+        }
+
+    async def send_prepared(self, prepared: Dict) -> Dict:
+        """Send a pre-signed request immediately (see OKXClient.send_prepared)"""
+        start = time.perf_counter()
+        try:
+            result, throttled = await self._transmit_async(
+                prepared["method"], prepared["url"], prepared["headers"],
+                prepared["params"], prepared["body"]
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            record_okx_call(self.name, prepared["endpoint"], "rest", time.perf_counter() - start, None)
+            return self._failed_response(e)
+        finally:
+            if prepared["method"] == "POST":
+                self.state_changed()
+        record_okx_call(self.name, prepared["endpoint"], "rest", time.perf_counter() - start, result, throttled)
+        self.limiter.record(self.name, prepared["endpoint"], throttled)
+        if throttled:
+            record_retry(self.name, prepared["endpoint"], "throttled")
+            return await self._send(prepared["method"], prepared["endpoint"], prepared["params"], prepared["data"],
+                                    slot_held=True)
+        return result
+
+    async def place_batch_orders(self, orders: List[Dict], channel: str = "rest") -> Dict:
+        """Place up to 20 orders in one request (see OKXClient.place_batch_orders)"""
+        if len(orders) > self.BATCH_ORDER_MAX_SIZE:
+            return self._batch_too_large()
+        return await self._trade_request("/api/v5/trade/batch-orders", orders, channel)
+
+    async def cancel_batch_orders(self, orders: List[Dict[str, str]]) -> Dict:
+        """Cancel up to 20 orders in one request (see OKXClient.cancel_batch_orders)"""
+        if len(orders) > self.BATCH_ORDER_MAX_SIZE:
+            return self._batch_too_large()
+        return await self._request("POST", "/api/v5/trade/cancel-batch-orders", data=orders)
+
+    async def _trade_request(self, endpoint: str, data: Any, channel: str = "rest") -> Dict:
+        """Send an order-entry request over REST or the order WebSocket and record its latency"""
+        data, rejects = self.validator.check(endpoint, data)
+        if rejects and not data:
+            return self.validator.rejection_response(data, rejects)
+        start = time.perf_counter()
+        if channel == "ws" and self.ws_orders is not None and self.ws_orders.connected:
+            result = await self._send_ws_async(endpoint, data)
+            used = "ws"
+        else:
+            result = await self._request("POST", endpoint, data=data)
+            used = "rest"
+        order_latency.record(used, endpoint.rsplit("/", 1)[-1], time.perf_counter() - start)
+        if rejects:
+            result = self.validator.merge_batch_response(result, rejects, len(data) + len(rejects))
+        return result
+
+    async def _send_ws_async(self, endpoint: str, data: Any) -> Dict:
+        """Send an order-entry request over the order WebSocket (see OKXClient._send_ws)"""
+        priority = priority_for(endpoint)
+        await self._wait_budget_async(endpoint, self.limiter.request_cost(endpoint, data))
+        if not await self.scheduler.acquire_async(self.name, priority):
+            record_dropped(self.name, priority.name.lower())
+            return self._dropped_response(priority)
+        sent = time.perf_counter()
+        try:
+            result = await self.ws_orders.request_async(endpoint, data)
+        finally:
+            self.scheduler.release(self.name)
+            self.state_changed()
+        throttled = result.get("code") == RATE_LIMIT_CODE
+        record_okx_call(self.name, endpoint, "ws", time.perf_counter() - sent, result, throttled)
+        self.limiter.record(self.name, endpoint, throttled)
+        return result
+
+    async def cancel_all_orders(self, inst_id: Optional[str] = None,
+                                inst_type: str = "SWAP") -> Dict:
+        """
+        Cancel all pending orders
+
+        Regular orders and algo orders of every ordType are listed concurrently,
+        then cancelled in concurrent cancel-batch-orders / cancel-algos chunks.
+
+        Args:
+            inst_id: Instrument ID (optional)
+            inst_type: Instrument type
+
+        Returns:
+            Combined response from canceling all orders (see OKXClient.cancel_all_orders)
+        """
+        start = time.perf_counter()
+
+        listings = self._gathered(await asyncio.gather(
+            self.get_pending_orders(inst_id=inst_id, inst_type=inst_type),
+            *[self.get_algo_orders(ord_type=ord_type, inst_id=inst_id, inst_type=inst_type)
+              for ord_type in self.ALGO_ORDER_TYPES],
+            return_exceptions=True
+        ))
+        pending_orders = listings[0]
+        algo_orders = self.merge_algo_orders(list(listings[1:]))
+
+        order_ids, algo_ids = self._cancel_targets(pending_orders, algo_orders)
+        regular_chunks = self._chunk(order_ids, self.BATCH_ORDER_MAX_SIZE)
+        algo_chunks = self._chunk(algo_ids, self.CANCEL_ALGO_MAX_SIZE)
+
+        responses = self._gathered(await asyncio.gather(
+            *[self.cancel_batch_orders(chunk) for chunk in regular_chunks],
+            *[self.cancel_algo_order(chunk) for chunk in algo_chunks],
+            return_exceptions=True
+        ))
+
+        return self._cancel_summary(
+            responses[:len(regular_chunks)], regular_chunks,
+            responses[len(regular_chunks):], algo_chunks,
+            start, self._listing_errors(listings)
+        )
+
+    @staticmethod
+    def _gathered(results: List) -> List[Dict]:
+        """Results of gather(return_exceptions=True) with exceptions turned into error responses"""
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, Exception):
+                raise result
+        return [
+            AsyncOKXClient._failed_response(result) if isinstance(result, Exception) else result
+            for result in results
+        ]
+
+    async def get_all_algo_orders(self, inst_type: str = "SWAP",
+                                  inst_id: Optional[str] = None) -> Dict:
+        """Get pending algo orders of every order type (queried concurrently)"""
+        return self.merge_algo_orders(list(await asyncio.gather(*[
+            self.get_algo_orders(ord_type=ord_type, inst_id=inst_id, inst_type=inst_type)
+            for ord_type in self.ALGO_ORDER_TYPES
+        ])))
@@ -0,0 +1,105 @@
+"""
+Balance Cache - short-lived per-account available balances for order sizing
+"""
+import threading
+import time
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
+
+from backend.config.config import config
+from backend.models.records import Balance, ZERO
+
+
+class BalanceCache:
+    """
+    Available balance per currency of each account, kept for BALANCE_CACHE_TTL seconds
+
+    Entries hold the already extracted `availBal` per currency. Every
+    state-changing request of an account (orders, cancels, leverage, ...)
+    marks its entry dirty, and the next sizing read fetches the balance
+    inline. Concurrent reads of a dirty account share one /account/balance
+    request through the client's single-flight coalescing, so a burst of
+    orders costs one read per state change rather than one per order. A
+    generation counter keeps a balance read that was in flight during a
+    change from being stored as clean.
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        self.ttl = config.BALANCE_CACHE_TTL if ttl is None else ttl
+        # account name -> (available by currency, fetched at)
+        self._entries: Dict[str, Tuple[Dict[str, Decimal], float]] = {}
+        self._generations: Dict[str, int] = {}
+        # accounts whose entry predates their last state-changing request
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def extract_available(response: Dict) -> Dict[str, Decimal]:
+        """availBal by currency from an /account/balance response"""
+        available = {}
+        for balance in Balance.from_response(response):
+            for detail in balance.details:
+                if detail.ccy:
+                    available[detail.ccy] = detail.avail_bal
+        return available
+
+    def state_changed(self, account_name: str):
+        """Mark an account's entry dirty (called after every state-changing request)"""
+        with self._lock:
+            self._generations[account_name] = self._generations.get(account_name, 0) + 1
+            if account_name in self._entries:
+                self._dirty.add(account_name)
+
+    def get_available(self, client, ccy: str = "USDT") -> Tuple[Optional[Decimal], Optional[Dict]]:
+        """
+        Available balance of one currency, fetched only when the cached entry is stale
+
+        Args:
+            client: OKXClient of the account
+            ccy: Currency
+
+        Returns:
+            Tuple of (available balance, None) or (None, error response)
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(client.name)
+            generation = self._generations.get(client.name, 0)
+            if entry is not None and client.name not in self._dirty and now - entry[1] < self.ttl:
+                self.hits += 1
+                return entry[0].get(ccy, ZERO), None
+            self.misses += 1
+
+        # Concurrent callers of the same account share this GET (single-flight)
+        response = client.get_balance()
+        if response.get("code") != "0":
+            return None, response
+        available = self.extract_available(response)
+        with self._lock:
+            if self._generations.get(client.name, 0) == generation:
+                self._entries[client.name] = (available, now)
+                self._dirty.discard(client.name)
+        return available.get(ccy, ZERO), None
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "ttl_s": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "accounts": {
+                    name: {
+                        "age_s": round(now - fetched_at, 3),
+                        "currencies": len(available),
+                        "dirty": name in self._dirty
+                    }
+                    for name, (available, fetched_at) in sorted(self._entries.items())
+                }
+            }
+
+
+# Global cache (marked dirty by OKXClient on every state-changing request)
+balance_cache = BalanceCache()
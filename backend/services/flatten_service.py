@@ -0,0 +1,156 @@
+"""
+Flatten Service - close every position on every account in parallel
+"""
+import time
+from typing import Dict, List, Tuple
+
+from backend.config.config import config
+from backend.models.records import Position, format_number
+from backend.services.io_pool import run_parallel
+from backend.services.okx_client import OKXClient
+from backend.services.request_scheduler import Priority, request_priority
+
+
+def position_key(position: Position) -> Tuple[str, str, str]:
+    """Identity of a position: (instId, posSide, mgnMode)"""
+    return position.inst_id, position.pos_side or "net", position.mgn_mode or "cross"
+
+
+def open_positions(response: Dict) -> List[Position]:
+    """Positions with a non-zero size from a get_positions response"""
+    return [position for position in Position.from_response(response) if position.pos != 0]
+
+
+def close_position(client: OKXClient, position: Position, source: str) -> Dict:
+    """
+    Close one position with /api/v5/trade/close-position and time the call
+
+    Args:
+        client: Account client
+        position: Position record
+        source: Where the position state came from ("snapshot" or "fresh")
+
+    Returns:
+        Per-position result with latency_ms
+    """
+    inst_id, pos_side, mgn_mode = position_key(position)
+    start = time.perf_counter()
+    try:
+        result = client.close_position(
+            inst_id=inst_id,
+            mgn_mode=mgn_mode,
+            pos_side=pos_side if pos_side in ("long", "short") else None,
+            auto_cxl=True
+        )
+    except Exception as e:
+        result = {"code": "-1", "msg": str(e), "data": []}
+    latency = round((time.perf_counter() - start) * 1000, 3)
+
+    entry = {
+        "instId": inst_id,
+        "posSide": pos_side,
+        "mgnMode": mgn_mode,
+        "size": format_number(position.pos),
+        "source": source,
+        "latency_ms": latency
+    }
+    if result.get("code") == "0":
+        entry.update(status="success", message="Position closed successfully")
+    else:
+        entry.update(status="failed", message=result.get("msg", "Unknown error"))
+    return entry
+
+
+def close_report(results: List[Dict]) -> Dict:
+    """Wrap per-position results in the close-all response format"""
+    success_count = sum(1 for result in results if result["status"] == "success")
+    failed_count = len(results) - success_count
+    return {
+        "code": "0",
+        "msg": f"Closed {success_count} positions, {failed_count} failed" if results
+               else "No positions to close",
+        "data": {
+            "success_count": success_count,
+            "failed_count": failed_count,
+            "results": results
+        }
+    }
+
+
+class FlattenEngine:
+    """Close all positions of many accounts at once"""
+
+    def __init__(self, manager):
+        self.manager = manager
+
+    def flatten(self, account_names: List[str], inst_type: str = "SWAP") -> Dict:
+        """
+        Close every open position of the given accounts
+
+        Positions already known from a recent snapshot (younger than
+        FLATTEN_SNAPSHOT_MAX_AGE) are closed immediately, while a fresh
+        positions GET per account runs alongside them; anything the fresh
+        read finds that the snapshot missed is closed in a second wave.
+        All calls run in parallel as kill-switch traffic.
+
+        Args:
+            account_names: Accounts to flatten
+            inst_type: Instrument type
+
+        Returns:
+            {"accounts": {name: close-all result}, "report": totals and elapsed_ms}
+        """
+        start = time.perf_counter()
+        accounts = [name for name in account_names if self.manager.get_account(name)]
+        results: Dict[str, List[Dict]] = {name: [] for name in accounts}
+        errors: Dict[str, Dict] = {}
+
+        with request_priority(Priority.KILL_SWITCH):
+            # Wave 1: close known positions and refresh every account's positions
+            known: Dict[str, set] = {}
+            calls = []
+            for name in accounts:
+                client = self.manager.get_account(name)
+                snapshot = self.manager.get_known_positions(name, config.FLATTEN_SNAPSHOT_MAX_AGE)
+                positions = open_positions(snapshot) if snapshot else []
+                known[name] = {position_key(position) for position in positions}
+                for position in positions:
+                    calls.append(("close", name, lambda c=client, p=position: close_position(c, p, "snapshot")))
+                calls.append(("fetch", name, lambda c=client: c.get_positions(inst_type=inst_type)))
+
+            wave_one = run_parallel([call for _, _, call in calls])
+
+            # Wave 2: close positions the snapshot did not know about
+            second = []
+            for (kind, name, _), outcome in zip(calls, wave_one):
+                if kind == "close":
+                    results[name].append(outcome)
+                    continue
+                if outcome.get("code") != "0":
+                    if not known[name]:
+                        errors[name] = outcome
+                    continue
+                self.manager.remember_positions(name, outcome)
+                client = self.manager.get_account(name)
+                for position in open_positions(outcome):
+                    if position_key(position) not in known[name]:
+                        second.append((name, lambda c=client, p=position: close_position(c, p, "fresh")))
+
+            for (name, _), outcome in zip(second, run_parallel([call for _, call in second])):
+                results[name].append(outcome)
+
+        entries = [entry for name in accounts for entry in results[name]]
+        latencies = [entry["latency_ms"] for entry in entries]
+        success_count = sum(1 for entry in entries if entry["status"] == "success")
+        return {
+            "accounts": {name: errors.get(name) or close_report(results[name]) for name in accounts},
+            "report": {
+                "accounts": len(accounts),
+                "failed_accounts": sorted(errors),
+                "positions": len(entries),
+                "success_count": success_count,
+                "failed_count": len(entries) - success_count,
+                "max_position_latency_ms": max(latencies) if latencies else None,
+                "elapsed_ms": round((time.perf_counter() - start) * 1000, 3)
+            }
+        }
@@ -0,0 +1,170 @@
+"""
+Shared HTTP Transport - pooled keep-alive sessions for OKX REST calls
+"""
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from backend.config.config import config
+from backend.utils.json_codec import loads
+from backend.utils.okx_auth import ServerClock, server_clock
+
+
+class HTTPTransport:
+    """Keep-alive connection pool shared by all OKX clients"""
+
+    WARM_ENDPOINT = "/api/v5/public/time"
+
+    def __init__(self, base_url: str = None, pool_connections: int = None,
+                 pool_maxsize: int = None, pool_block: bool = None,
+                 idle_timeout: float = None):
+        self.base_url = base_url or config.OKX_API_URL
+        self.pool_connections = pool_connections or config.HTTP_POOL_CONNECTIONS
+        self.pool_maxsize = pool_maxsize or config.HTTP_POOL_MAXSIZE
+        self.pool_block = config.HTTP_POOL_BLOCK if pool_block is None else pool_block
+        self.idle_timeout = config.HTTP_POOL_IDLE_TIMEOUT if idle_timeout is None else idle_timeout
+
+        self.adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+        # The session is shared across accounts, so never carry cookies between them
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+        self._lock = threading.Lock()
+        self._last_used = time.monotonic()
+        # Counters of pools that were dropped by an idle reset
+        self._retired_connections = 0
+        self._retired_requests = 0
+        self._idle_resets = 0
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request over the pooled session
+
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            **kwargs: Passed through to requests.Session.request
+
+        Returns:
+            requests.Response
+        """
+        self._expire_idle()
+        return self.session.request(method=method, url=url, **kwargs)
+
+    def _expire_idle(self):
+        """Drop pooled connections that have been idle longer than idle_timeout"""
+        now = time.monotonic()
+        with self._lock:
+            idle_for = now - self._last_used
+            self._last_used = now
+            if not self.idle_timeout or idle_for < self.idle_timeout:
+                return
+            connections, requests_sent = self._pool_counters()
+            self._retired_connections += connections
+            self._retired_requests += requests_sent
+            self._idle_resets += 1
+            self.adapter.poolmanager.clear()
+
+    def _pool_counters(self):
+        """Sum connection and request counters over the live host pools"""
+        connections = 0
+        requests_sent = 0
+        pools = self.adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            connections += pool.num_connections
+            requests_sent += pool.num_requests
+        return connections, requests_sent
+
+    def warm(self, connections: Optional[int] = None) -> Dict:
+        """
+        Open keep-alive connections ahead of the first trading request
+
+        Args:
+            connections: Number of connections to open (default: HTTP_POOL_WARM_CONNECTIONS)
+
+        Returns:
+            Warm-up summary
+        """
+        count = min(connections or config.HTTP_POOL_WARM_CONNECTIONS, self.pool_maxsize)
+        url = f"{self.base_url}{self.WARM_ENDPOINT}"
+        errors = []
+
+        def _open():
+            try:
+                self.request("GET", url, timeout=config.REQUEST_TIMEOUT).close()
+            except requests.exceptions.RequestException as e:
+                errors.append(str(e))
+
+        # Concurrent requests force the pool to open distinct connections
+        threads = [threading.Thread(target=_open, daemon=True) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return {
+            "requested": count,
+            "failed": len(errors),
+            "errors": errors[:3]
+        }
+
+    def sync_clock(self, clock: Optional[ServerClock] = None) -> Dict:
+        """
+        Measure the offset to the OKX server clock used for signature timestamps
+
+        Args:
+            clock: Clock to update (default: the shared server_clock)
+
+        Returns:
+            /api/v5/public/time response
+        """
+        clock = clock or server_clock
+        try:
+            sent = time.time()
+            response = self.request("GET", f"{self.base_url}{self.WARM_ENDPOINT}", timeout=config.REQUEST_TIMEOUT)
+            received = time.time()
+            response.raise_for_status()
+            result = loads(response.content)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            return {"code": "-1", "msg": f"Request failed: {str(e)}", "data": []}
+        if result.get("code") == "0" and result.get("data"):
+            clock.update(int(result["data"][0]["ts"]), sent, received)
+        return result
+
+    def get_stats(self) -> Dict:
+        """Get connection reuse counters"""
+        with self._lock:
+            connections, requests_sent = self._pool_counters()
+            connections += self._retired_connections
+            requests_sent += self._retired_requests
+            idle_resets = self._idle_resets
+
+        reused = max(requests_sent - connections, 0)
+        return {
+            "requests": requests_sent,
+            "new_connections": connections,
+            "reused_connections": reused,
+            "reuse_ratio": round(reused / requests_sent, 4) if requests_sent else 0.0,
+            "idle_resets": idle_resets,
+            "pool_connections": self.pool_connections,
+            "pool_maxsize": self.pool_maxsize,
+            "pool_block": self.pool_block,
+            "idle_timeout": self.idle_timeout
+        }
+
+
+# Global transport instance shared by all OKX clients
+http_transport = HTTPTransport()
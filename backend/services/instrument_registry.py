@@ -0,0 +1,191 @@
+"""
+Instrument Registry - cached instrument metadata (contract value, lot/tick/min size, max leverage)
+"""
+import asyncio
+import threading
+import time
+from decimal import Decimal, ROUND_DOWN, ROUND_HALF_EVEN
+from typing import Dict, List, Optional
+
+import requests
+
+from backend.config.config import config
+from backend.services.http_transport import HTTPTransport, http_transport
+from backend.services.io_pool import run_read
+from backend.utils.json_codec import loads
+
+
+class Instrument:
+    """Trading rules of one instrument"""
+
+    __slots__ = ("inst_id", "inst_type", "ct_val", "ct_val_ccy", "ct_type", "lot_sz",
+                 "tick_sz", "min_sz", "max_lever", "state")
+
+    def __init__(self, data: Dict):
+        self.inst_id = data["instId"]
+        self.inst_type = data.get("instType")
+        self.ct_val = Decimal(data.get("ctVal") or "1")
+        self.ct_val_ccy = data.get("ctValCcy")
+        self.ct_type = data.get("ctType") or "linear"
+        self.lot_sz = Decimal(data.get("lotSz") or "1")
+        self.tick_sz = Decimal(data.get("tickSz") or "0")
+        self.min_sz = Decimal(data.get("minSz") or "0")
+        self.max_lever = int(float(data.get("lever") or 0)) or None
+        self.state = data.get("state")
+
+    def round_size(self, size: Decimal) -> Decimal:
+        """Round a size down to a whole number of lots"""
+        return (size / self.lot_sz).to_integral_value(rounding=ROUND_DOWN) * self.lot_sz
+
+    def round_price(self, price: Decimal, rounding: str = ROUND_HALF_EVEN) -> Decimal:
+        """Round a price to a whole number of ticks (nearest tick by default)"""
+        if not self.tick_sz:
+            return price
+        return (price / self.tick_sz).to_integral_value(rounding=rounding) * self.tick_sz
+
+    def contracts_for_notional(self, notional: Decimal, price: Decimal) -> Decimal:
+        """
+        Contracts worth `notional` (quote currency, USD for inverse) at `price`
+
+        Linear contracts are worth ctVal units of the base currency each,
+        inverse contracts ctVal USD; the result is rounded down to lotSz.
+        """
+        if self.ct_type == "inverse":
+            contracts = notional / self.ct_val
+        else:
+            contracts = notional / (price * self.ct_val)
+        return self.round_size(contracts)
+
+    def to_dict(self) -> Dict:
+        return {
+            "instId": self.inst_id,
+            "instType": self.inst_type,
+            "ctVal": str(self.ct_val),
+            "ctValCcy": self.ct_val_ccy,
+            "ctType": self.ct_type,
+            "lotSz": str(self.lot_sz),
+            "tickSz": str(self.tick_sz),
+            "minSz": str(self.min_sz),
+            "lever": self.max_lever,
+            "state": self.state
+        }
+
+
+class InstrumentRegistry:
+    """
+    Instruments by instId, loaded once per instrument type and refreshed in the background
+
+    Loads go straight to the public endpoint (no signing, no account needed).
+    """
+
+    ENDPOINT = "/api/v5/public/instruments"
+
+    def __init__(self, transport: Optional[HTTPTransport] = None):
+        self.transport = transport or http_transport
+        self._instruments: Dict[str, Instrument] = {}
+        # Raw /public/instruments response and load time per instrument type
+        self._responses: Dict[str, Dict] = {}
+        self._loaded_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def load(self, inst_type: str = "SWAP") -> Dict:
+        """
+        Download all instruments of a type and replace the cached ones
+
+        Returns:
+            API response (the cache is kept when the download fails)
+        """
+        try:
+            response = self.transport.request(
+                "GET",
+                f"{self.transport.base_url}{self.ENDPOINT}",
+                params={"instType": inst_type},
+                timeout=config.REQUEST_TIMEOUT
+            )
+            response.raise_for_status()
+            result = loads(response.content)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            return {"code": "-1", "msg": f"Request failed: {str(e)}", "data": []}
+        if result.get("code") != "0":
+            return result
+
+        instruments = {item["instId"]: Instrument(item) for item in result.get("data") or []}
+        with self._lock:
+            for inst_id in [key for key, value in self._instruments.items() if value.inst_type == inst_type]:
+                if inst_id not in instruments:
+                    del self._instruments[inst_id]
+            self._instruments.update(instruments)
+            self._responses[inst_type] = result
+            self._loaded_at[inst_type] = time.monotonic()
+        return result
+
+    def ensure_loaded(self, inst_type: str = "SWAP") -> bool:
+        """Load a type on first use; True if it is cached"""
+        if inst_type not in self._responses:
+            self.load(inst_type)
+        return inst_type in self._responses
+
+    @staticmethod
+    def inst_type_of(inst_id: str) -> str:
+        """Instrument type implied by an instId (BTC-USDT-SWAP, BTC-USD-250627, BTC-USDT)"""
+        parts = inst_id.split("-")
+        if parts[-1] == "SWAP":
+            return "SWAP"
+        if len(parts) == 3 and parts[-1].isdigit():
+            return "FUTURES"
+        if len(parts) > 3:
+            return "OPTION"
+        return "SPOT"
+
+    def get(self, inst_id: str) -> Optional[Instrument]:
+        """Instrument by instId (loads its type on first use)"""
+        instrument = self._instruments.get(inst_id)
+        if instrument is None and self.inst_type_of(inst_id) not in self._responses:
+            self.ensure_loaded(self.inst_type_of(inst_id))
+            instrument = self._instruments.get(inst_id)
+        return instrument
+
+    def lookup(self, inst_id: str) -> Optional[Instrument]:
+        """Cached instrument only (never triggers a download)"""
+        return self._instruments.get(inst_id)
+
+    def is_loaded(self, inst_type: str) -> bool:
+        return inst_type in self._responses
+
+    def get_response(self, inst_type: str = "SWAP") -> Dict:
+        """Cached /public/instruments response of a type (loads on first use)"""
+        if not self.ensure_loaded(inst_type):
+            return self.load(inst_type)
+        response = dict(self._responses[inst_type])
+        response["age_s"] = round(time.monotonic() - self._loaded_at[inst_type], 3)
+        return response
+
+    def loaded_types(self) -> List[str]:
+        return sorted(self._responses)
+
+    def start_refresh(self):
+        """Reload every loaded type every INSTRUMENT_REFRESH_INTERVAL seconds on the running loop"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.get_running_loop().create_task(self._refresh_loop())
+
+    async def stop_refresh(self):
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(config.INSTRUMENT_REFRESH_INTERVAL)
+            for inst_type in self.loaded_types():
+                result = await run_read(self.load, inst_type)
+                if result.get("code") != "0":
+                    print(f"Instrument refresh failed for {inst_type}: {result.get('msg')}")
+
+
+# Global registry
+instrument_registry = InstrumentRegistry()
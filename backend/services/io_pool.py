@@ -0,0 +1,89 @@
+"""
+Exchange I/O Executors - run blocking OKX calls off the asyncio event loop
+"""
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List
+
+from backend.config.config import config
+
+
+# Separate pools so heavy dashboard reads can never occupy the threads
+# that order placement, cancels and position closes need
+trade_executor = ThreadPoolExecutor(
+    max_workers=config.TRADE_IO_WORKERS,
+    thread_name_prefix="okx-trade"
+)
+read_executor = ThreadPoolExecutor(
+    max_workers=config.READ_IO_WORKERS,
+    thread_name_prefix="okx-read"
+)
+# Leaf requests issued in parallel from inside a single client operation
+CLIENT_THREAD_PREFIX = "okx-client"
+client_executor = ThreadPoolExecutor(
+    max_workers=config.CLIENT_IO_WORKERS,
+    thread_name_prefix=CLIENT_THREAD_PREFIX
+)
+
+
+async def _run_in(executor: ThreadPoolExecutor, func: Callable, *args, **kwargs) -> Any:
+    """Run func in executor, carrying context variables (e.g. request priority) along"""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(executor, context.run, functools.partial(func, *args, **kwargs))
+
+
+async def run_trade(func: Callable, *args, **kwargs) -> Any:
+    """
+    Run a blocking trading call (orders, cancels, leverage) in the trade pool
+
+    Args:
+        func: Blocking callable
+        *args, **kwargs: Arguments for the callable
+
+    Returns:
+        Result of the callable
+    """
+    return await _run_in(trade_executor, func, *args, **kwargs)
+
+
+async def run_read(func: Callable, *args, **kwargs) -> Any:
+    """
+    Run a blocking read call (balances, positions, history, market data) in the read pool
+
+    Args:
+        func: Blocking callable
+        *args, **kwargs: Arguments for the callable
+
+    Returns:
+        Result of the callable
+    """
+    return await _run_in(read_executor, func, *args, **kwargs)
+
+
+def run_parallel(calls: List[Callable[[], Any]]) -> List[Any]:
+    """
+    Run independent blocking calls concurrently (from synchronous code)
+
+    Args:
+        calls: Zero-argument callables, typically single OKX requests
+
+    Returns:
+        Results in the same order as calls
+    """
+    # Calls made from a client worker run inline so the pool can never wait on itself
+    if len(calls) <= 1 or threading.current_thread().name.startswith(CLIENT_THREAD_PREFIX):
+        return [call() for call in calls]
+    context = contextvars.copy_context()
+    futures = [client_executor.submit(context.copy().run, call) for call in calls]
+    return [future.result() for future in futures]
+
+
+def shutdown():
+    """Stop accepting work and release executor threads"""
+    trade_executor.shutdown(wait=False)
+    read_executor.shutdown(wait=False)
+    client_executor.shutdown(wait=False)
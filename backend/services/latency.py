@@ -0,0 +1,51 @@
+"""
+Latency Recorder - rolling per-key latency statistics
+"""
+import threading
+from collections import defaultdict, deque
+from typing import Dict, Tuple
+
+
+class LatencyRecorder:
+    """Keeps the last `window` samples per (channel, operation) and summarises them"""
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._samples: Dict[Tuple[str, str], deque] = defaultdict(lambda: deque(maxlen=self.window))
+        self._counts: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, channel: str, operation: str, seconds: float):
+        """Record one call of `operation` over `channel`"""
+        with self._lock:
+            self._samples[(channel, operation)].append(seconds)
+            self._counts[(channel, operation)] += 1
+
+    @staticmethod
+    def _summary(samples: list, count: int) -> Dict:
+        ordered = sorted(samples)
+
+        def percentile(fraction: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000, 3)
+
+        return {
+            "count": count,
+            "avg_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+            "p50_ms": percentile(0.5),
+            "p99_ms": percentile(0.99),
+            "max_ms": round(ordered[-1] * 1000, 3)
+        }
+
+    def snapshot(self) -> Dict:
+        """{operation: {channel: summary}} so channels of the same operation sit side by side"""
+        with self._lock:
+            samples = {key: list(values) for key, values in self._samples.items() if values}
+            counts = dict(self._counts)
+        result: Dict[str, Dict] = {}
+        for (channel, operation), values in sorted(samples.items()):
+            result.setdefault(operation, {})[channel] = self._summary(values, counts[(channel, operation)])
+        return result
+
+
+# Round-trip latency of order entry calls, by channel ("rest" / "ws") and operation
+order_latency = LatencyRecorder()
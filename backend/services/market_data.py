@@ -0,0 +1,159 @@
+"""
+Market Data Service - public WebSocket feed of tickers and mark prices
+"""
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+from backend.config.config import config
+from backend.services.instrument_registry import instrument_registry
+from backend.services.okx_ws import OKXWebSocket
+
+
+# Public channels kept for every tracked instrument
+MARKET_CHANNELS = ("tickers", "mark-price")
+
+
+class MarketDataStore:
+    """Latest ticker and mark price per instrument, as pushed by the feed"""
+
+    def __init__(self):
+        # inst_id -> channel -> (monotonic receive time, latest data entry)
+        self._data: Dict[str, Dict[str, tuple]] = {}
+
+    def update(self, channel: str, inst_id: str, entry: Dict):
+        """Store the latest push of a channel for an instrument"""
+        self._data.setdefault(inst_id, {})[channel] = (time.monotonic(), entry)
+
+    def get(self, channel: str, inst_id: str) -> Optional[Dict]:
+        """
+        Get the latest value of a channel
+
+        Returns:
+            {"data": entry, "age_ms": time since it was received} or None
+        """
+        value = self._data.get(inst_id, {}).get(channel)
+        if value is None:
+            return None
+        received, entry = value
+        return {
+            "data": entry,
+            "age_ms": round((time.monotonic() - received) * 1000, 3)
+        }
+
+    def instruments(self) -> List[str]:
+        return sorted(self._data)
+
+    def discard(self, inst_id: str):
+        self._data.pop(inst_id, None)
+
+    def clear(self):
+        self._data.clear()
+
+
+class MarketDataFeed(OKXWebSocket):
+    """
+    Background subscription to OKX public market data
+
+    Instruments can be added at runtime with track(); they are
+    resubscribed after every reconnect. Only instruments known to the
+    instrument registry are added, and at most `max_tracked` of them: the
+    least recently requested one is unsubscribed to make room. Configured
+    instruments are never dropped.
+    """
+
+    def __init__(self, url: str = None, instruments: Iterable[str] = (), max_tracked: int = None):
+        super().__init__(url or config.OKX_WS_URL, "Market data feed")
+        self.store = MarketDataStore()
+        self.instruments = set(instruments)
+        self.max_tracked = config.MARKET_DATA_MAX_TRACKED if max_tracked is None else max_tracked
+        # Instruments added by track(), least recently requested first
+        self._tracked: OrderedDict = OrderedDict()
+
+    async def track(self, inst_id: str) -> bool:
+        """
+        Add an instrument to the feed (subscribes immediately when connected)
+
+        Returns:
+            Whether the instrument is tracked (False for unknown instruments)
+        """
+        if inst_id in self.instruments:
+            self._touch(inst_id)
+            return True
+        if self.max_tracked <= 0 or instrument_registry.lookup(inst_id) is None:
+            return False
+        self.instruments.add(inst_id)
+        self._tracked[inst_id] = None
+        evicted = []
+        while len(self._tracked) > self.max_tracked:
+            old, _ = self._tracked.popitem(last=False)
+            self.instruments.discard(old)
+            self.store.discard(old)
+            evicted.append(old)
+        if self.connected:
+            await self.unsubscribe(self._channels(evicted))
+            await self.subscribe(self._channels([inst_id]))
+        return True
+
+    def _touch(self, inst_id: str):
+        if inst_id in self._tracked:
+            self._tracked.move_to_end(inst_id)
+
+    def get_ticker(self, inst_id: str) -> Optional[Dict]:
+        """
+        Latest ticker of an instrument, or None when the feed cannot answer
+
+        Returns:
+            REST-shaped ticker response with source, age_ms and markPx
+        """
+        if not self.connected:
+            return None
+        ticker = self.store.get("tickers", inst_id)
+        if ticker is None:
+            return None
+        self._touch(inst_id)
+        mark = self.store.get("mark-price", inst_id)
+        return {
+            "code": "0",
+            "msg": "",
+            "data": [ticker["data"]],
+            "source": "ws",
+            "ts": ticker["data"].get("ts"),
+            "age_ms": ticker["age_ms"],
+            "mark_price": mark["data"].get("markPx") if mark else None
+        }
+
+    def get_stats(self) -> Dict:
+        stats = super().get_stats()
+        stats["instruments"] = sorted(self.instruments)
+        return stats
+
+    @staticmethod
+    def _channels(instruments: Iterable[str]) -> List[Dict]:
+        return [
+            {"channel": channel, "instId": inst_id}
+            for inst_id in instruments
+            for channel in MARKET_CHANNELS
+        ]
+
+    async def on_connect(self):
+        await self.subscribe(self._channels(sorted(self.instruments)))
+
+    def handle_message(self, message: Dict):
+        arg = message.get("arg") or {}
+        channel = arg.get("channel")
+        if channel not in MARKET_CHANNELS or "data" not in message:
+            return
+        for entry in message["data"]:
+            inst_id = entry.get("instId") or arg.get("instId")
+            # Pushes still in flight for a dropped instrument are ignored
+            if inst_id in self.instruments:
+                self.store.update(channel, inst_id, entry)
+
+    def on_disconnect(self):
+        # Values from a dead connection must not be served as live
+        self.store.clear()
+
+
+# Global feed instance (run by the WebSocket supervisor)
+market_feed = MarketDataFeed(instruments=config.MARKET_DATA_INSTRUMENTS)
@@ -0,0 +1,236 @@
+"""
+Metrics - Prometheus counters and latency histograms for OKX calls and API routes
+"""
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+from backend.config.config import config
+
+
+# Latency buckets in seconds (OKX round trips are typically 5-500 ms)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+# Label value that absorbs label combinations beyond the series limit
+OVERFLOW_LABEL = "other"
+# Prometheus text exposition format (Response appends the charset)
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    """
+    Labelled metric with a bounded number of series
+
+    Once `max_series` label combinations exist, new combinations are recorded
+    under a single series whose labels are all "other", so an unexpected
+    label value (an unknown error code, a misbehaving client) cannot grow
+    memory or the scrape without bound.
+    """
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...], max_series: int):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.max_series = max_series
+        self.overflowed = 0
+        self._series: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, values: Tuple) -> Tuple[str, ...]:
+        """Series key for label values (caller holds the lock)"""
+        key = tuple(str(value) for value in values)
+        if key not in self._series and len(self._series) >= self.max_series:
+            self.overflowed += 1
+            return (OVERFLOW_LABEL,) * len(self.labels)
+        return key
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            series = sorted(self._series.items())
+            lines.extend(self._render_series(series))
+        return lines
+
+    def _render_series(self, series: list) -> List[str]:
+        """One sample line per series (single-value metrics; Histogram overrides)"""
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in series
+        ]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *values, amount: float = 1):
+        with self._lock:
+            key = self._key(values)
+            self._series[key] = self._series.get(key, 0) + amount
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...], max_series: int,
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels, max_series)
+        self.buckets = buckets
+
+    def observe(self, *values, seconds: float):
+        # Per-bucket (not cumulative) counts, the +Inf bucket last; then sum and count
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            key = self._key(values)
+            state = self._series.get(key)
+            if state is None:
+                state = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += seconds
+            state[2] += 1
+
+    def _render_series(self, series: list) -> List[str]:
+        lines = []
+        bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+        for key, (counts, total, count) in series:
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labels, key, 'le="' + bound + '"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {repr(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Metrics exposed on /metrics, rendered in the Prometheus text format"""
+
+    def __init__(self, max_series: Optional[int] = None):
+        self.max_series = config.METRICS_MAX_SERIES if max_series is None else max_series
+        self._metrics: List[_Metric] = []
+
+    def counter(self, name: str, documentation: str, labels: Tuple[str, ...]) -> Counter:
+        metric = Counter(name, documentation, labels, self.max_series)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labels: Tuple[str, ...]) -> Histogram:
+        metric = Histogram(name, documentation, labels, self.max_series)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        overflowed = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+            overflowed.append(f'metrics_series_overflow_total{{metric="{metric.name}"}} {metric.overflowed}')
+        lines.append("# HELP metrics_series_overflow_total Observations folded into the \"other\" series")
+        lines.append("# TYPE metrics_series_overflow_total counter")
+        lines.extend(overflowed)
+        return "\n".join(lines) + "\n"
+
+
+# Global registry
+metrics = MetricsRegistry()
+
+okx_request_seconds = metrics.histogram(
+    "okx_request_duration_seconds",
+    "OKX request round trip per attempt",
+    ("account", "endpoint", "channel", "outcome")
+)
+okx_errors = metrics.counter(
+    "okx_errors_total",
+    "OKX responses with a non-zero code (sCode for failed orders of order endpoints)",
+    ("account", "endpoint", "code")
+)
+okx_retries = metrics.counter(
+    "okx_retries_total",
+    "OKX requests sent again (throttled, timestamp_expired)",
+    ("account", "endpoint", "reason")
+)
+okx_throttled = metrics.counter(
+    "okx_throttled_total",
+    "OKX requests rejected by rate limiting (HTTP 429 or code 50011)",
+    ("account", "endpoint")
+)
+okx_dropped = metrics.counter(
+    "okx_requests_dropped_total",
+    "Requests dropped by the priority scheduler before reaching OKX",
+    ("account", "priority")
+)
+http_request_seconds = metrics.histogram(
+    "http_request_duration_seconds",
+    "API request handling time by route template",
+    ("method", "route", "status")
+)
+
+
+def _error_codes(result: Dict) -> List[str]:
+    """Error codes of a response: per-order sCodes for partial/failed batches, else the code"""
+    code = str(result.get("code"))
+    if code in ("1", "2"):
+        codes = [
+            str(entry.get("sCode")) for entry in result.get("data") or []
+            if isinstance(entry, dict) and entry.get("sCode") not in (None, "", "0")
+        ]
+        return codes or [code]
+    return [code]
+
+
+def record_okx_call(account: str, endpoint: str, channel: str, seconds: float,
+                    result: Optional[Dict], throttled: bool = False):
+    """
+    Record one OKX request attempt
+
+    Args:
+        account: Account name
+        endpoint: API endpoint path
+        channel: "rest" or "ws"
+        seconds: Round trip time
+        result: Parsed response, or None when the request failed in transport
+            (or OKX answered HTTP 429)
+        throttled: Whether OKX rate-limited the request
+    """
+    if not config.METRICS_ENABLED:
+        return
+    if throttled:
+        outcome = "throttled"
+        okx_throttled.inc(account, endpoint)
+    elif result is None:
+        outcome = "network_error"
+    elif result.get("code") == "0":
+        outcome = "ok"
+    else:
+        outcome = "okx_error"
+        for code in _error_codes(result):
+            okx_errors.inc(account, endpoint, code)
+    okx_request_seconds.observe(account, endpoint, channel, outcome, seconds=seconds)
+
+
+def record_retry(account: str, endpoint: str, reason: str):
+    if config.METRICS_ENABLED:
+        okx_retries.inc(account, endpoint, reason)
+
+
+def record_dropped(account: str, priority: str):
+    if config.METRICS_ENABLED:
+        okx_dropped.inc(account, priority)
@@ -1,29 +1,71 @@
 """
 OKX API Client - Core trading functionality
 """
-import json
+import time
 import requests
-from typing import Dict, List, Optional, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from backend.utils.json_codec import dumps, loads
 from backend.utils.okx_auth import OKXAuth
+from backend.models.records import Order
 from backend.config.config import config
+from backend.services.account_snapshots import account_snapshots
+from backend.services.balance_cache import balance_cache
+from backend.services.http_transport import HTTPTransport, http_transport
+from backend.services.io_pool import run_parallel
+from backend.services.latency import order_latency
+from backend.services.metrics import record_dropped, record_okx_call, record_retry
+from backend.services.order_validator import order_validator
+from backend.services.rate_limiter import RateLimiter, RATE_LIMIT_CODE, rate_limiter
+from backend.services.single_flight import request_coalescer
+from backend.services.request_scheduler import (
+    Priority, RequestScheduler, priority_for, request_scheduler
+)
+
+
+# OKX error code for a request timestamp outside the accepted window
+TIMESTAMP_EXPIRED_CODE = "50102"
 
 
 class OKXClient:
     """OKX API Client for trading operations"""
     
-    def __init__(self, api_key: str, secret_key: str, passphrase: str, simulated: bool = False):
+    # Maximum orders per /api/v5/trade/batch-orders and cancel-batch-orders request
+    BATCH_ORDER_MAX_SIZE = 20
+    # Maximum algo orders per /api/v5/trade/cancel-algos request
+    CANCEL_ALGO_MAX_SIZE = 10
+    # orders-algo-pending takes one ordType per query (conditional and oco may be combined)
+    ALGO_ORDER_TYPES = ["conditional,oco", "trigger", "move_order_stop", "iceberg", "twap", "chase"]
+    
+    def __init__(self, api_key: str, secret_key: str, passphrase: str, simulated: bool = False,
+                 transport: Optional[HTTPTransport] = None, name: Optional[str] = None,
+                 limiter: Optional[RateLimiter] = None,
+                 scheduler: Optional[RequestScheduler] = None):
         self.api_key = api_key
+        self.name = name or api_key[:8]
         self.secret_key = secret_key
         self.passphrase = passphrase
         self.simulated = simulated  # True for demo trading, False for real trading
         self.auth = OKXAuth(api_key, secret_key, passphrase)
         self.base_url = config.OKX_API_URL
         self.timeout = config.REQUEST_TIMEOUT
+        # Pooled keep-alive session (shared by all clients unless overridden)
+        self.transport = transport or http_transport
+        # Token buckets per account and endpoint group (shared by all clients)
+        self.limiter = limiter or rate_limiter
+        self.max_attempts = max(config.MAX_RETRY_ATTEMPTS, 1)
+        # Per-account priority admission (kill-switch > trade > account > history > market)
+        self.scheduler = scheduler or request_scheduler
+        # Logged-in private WebSocket for order entry (attached at startup when enabled)
+        self.ws_orders = None
+        # Local pre-trade checks against cached instrument rules (shared by all clients)
+        self.validator = order_validator
+        # Single-flight coalescing of identical in-flight GETs (shared by all clients)
+        self.coalescer = request_coalescer
     
-    def _request(self, method: str, endpoint: str, params: Optional[Dict] = None, 
-                 data: Optional[Dict] = None) -> Dict:
+    def _prepare_request(self, method: str, endpoint: str, params: Optional[Dict] = None,
+                         data: Optional[Any] = None) -> Tuple[str, Dict, str]:
         """
-        Make authenticated request to OKX API
+        Build URL, signed headers and body for an OKX API request
         
         Args:
             method: HTTP method (GET, POST, etc.)
@@ -32,10 +74,10 @@ class OKXClient:
             data: Request body data
         
         Returns:
-            API response as dictionary
+            Tuple of (url, headers, body)
         """
         url = f"{self.base_url}{endpoint}"
-        body = json.dumps(data) if data else ''
+        body = dumps(data) if data else ''
         
         # Build request path with query string for signature
         request_path = endpoint
@@ -51,23 +93,235 @@ class OKXClient:
         # 0 = real trading (default), 1 = simulated/demo trading
         headers['x-simulated-trading'] = '1' if self.simulated else '0'
         
+        return url, headers, body
+    
+    def _request(self, method: str, endpoint: str, params: Optional[Dict] = None, 
+                 data: Optional[Any] = None) -> Dict:
+        """
+        Make authenticated request to OKX API
+        
+        Each attempt first waits for rate-limit budget, then for an in-flight
+        slot from the account's priority scheduler; low-priority reads may be
+        dropped when the account is saturated.
+        Identical GETs of the same account that are already in flight
+        share that request's response (single-flight coalescing).
+        
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            endpoint: API endpoint
+            params: Query parameters
+            data: Request body data
+        
+        Returns:
+            API response as dictionary
+        """
+        if method == "GET" and self.coalescer.enabled:
+            key = self.coalescer.key(self.name, method, endpoint, params)
+            return self.coalescer.do(key, lambda: self._request_once(method, endpoint, params, data))
+        return self._request_once(method, endpoint, params, data)
+    
+    def _request_once(self, method: str, endpoint: str, params: Optional[Dict] = None,
+                      data: Optional[Any] = None) -> Dict:
+        """Send of one request, invalidating cached state after POSTs (see _request)"""
         try:
-            response = requests.request(
-                method=method,
-                url=url,
-                headers=headers,
-                params=params,
-                data=body,
-                timeout=self.timeout
+            return self._send(method, endpoint, params, data)
+        finally:
+            if method == "POST":
+                self.state_changed()
+    
+    def state_changed(self):
+        """
+        Drop cached state of this account after a state-changing request
+        
+        Every POST (orders, cancels, leverage, position closes) may move the
+        balance, positions and pending orders: snapshots are invalidated, the
+        sizing balance is marked dirty, and reads already in flight are no
+        longer shared with new callers.
+        """
+        balance_cache.state_changed(self.name)
+        account_snapshots.invalidate(self.name)
+        self.coalescer.forget(self.name)
+    
+    @staticmethod
+    def _dropped_response(priority: Priority) -> Dict:
+        """Response for a request the scheduler dropped under load"""
+        return {
+            "code": "-1",
+            "msg": f"Request dropped by scheduler: {priority.name.lower()} queue wait exceeded",
+            "data": []
+        }
+    
+    def _wait_budget(self, endpoint: str, cost: int):
+        """Sleep until the account's rate-limit budget covers the request (no scheduler slot held)"""
+        wait = self.limiter.reserve(self.name, endpoint, cost)
+        if wait > 0:
+            time.sleep(wait)
+    
+    def _send(self, method: str, endpoint: str, params: Optional[Dict] = None,
+              data: Optional[Any] = None, slot_held: bool = False) -> Dict:
+        """
+        Send a request within the rate-limit budget, retrying when OKX throttles it
+        
+        Every attempt waits for budget before taking the scheduler slot, and
+        holds the slot only for the round trip: a throttled read backing off
+        never keeps a queued trade out. slot_held skips the scheduler for a
+        caller that already holds a slot (send_prepared).
+        """
+        priority = priority_for(endpoint)
+        cost = self.limiter.request_cost(endpoint, data)
+        result = None
+        resynced = False
+        
+        for attempt in range(self.max_attempts):
+            self._wait_budget(endpoint, cost)
+            if not slot_held and not self.scheduler.acquire(self.name, priority):
+                record_dropped(self.name, priority.name.lower())
+                return self._dropped_response(priority)
+            # Sign once admitted (timestamp must be fresh)
+            url, headers, body = self._prepare_request(method, endpoint, params, data)
+            
+            start = time.perf_counter()
+            try:
+                result, throttled = self._transmit(method, url, headers, params, body)
+            except requests.exceptions.RequestException as e:
+                record_okx_call(self.name, endpoint, "rest", time.perf_counter() - start, None)
+                return {
+                    "code": "-1",
+                    "msg": f"Request failed: {str(e)}",
+                    "data": []
+                }
+            finally:
+                if not slot_held:
+                    self.scheduler.release(self.name)
+            record_okx_call(self.name, endpoint, "rest", time.perf_counter() - start, result, throttled)
+            
+            self.limiter.record(self.name, endpoint, throttled)
+            if not throttled and result.get("code") == TIMESTAMP_EXPIRED_CODE and not resynced:
+                # Rejected for clock skew (never executed): re-measure the offset and re-sign
+                resynced = True
+                record_retry(self.name, endpoint, "timestamp_expired")
+                self.transport.sync_clock()
+                continue
+            if not throttled:
+                return result
+            if attempt + 1 < self.max_attempts:
+                record_retry(self.name, endpoint, "throttled")
+        
+        # Still throttled after all attempts (rejected requests are never executed)
+        return result or {
+            "code": RATE_LIMIT_CODE,
+            "msg": f"Rate limited by OKX after {self.max_attempts} attempts",
+            "data": []
+        }
+    
+    def _transmit(self, method: str, url: str, headers: Dict, params: Optional[Dict],
+                  body: str) -> Tuple[Optional[Dict], bool]:
+        """
+        Send one signed request over the pooled transport
+        
+        Returns:
+            Tuple of (response dict or None, whether OKX throttled the request)
+        
+        Raises:
+            requests.exceptions.RequestException on network/HTTP errors
+        """
+        response = self.transport.request(
+            method=method,
+            url=url,
+            headers=headers,
+            params=params,
+            data=body,
+            timeout=self.timeout
+        )
+        if response.status_code == 429:
+            return None, True
+        response.raise_for_status()
+        try:
+            result = loads(response.content)
+        except ValueError as e:
+            raise requests.exceptions.InvalidJSONError(str(e), response=response)
+        return result, result.get("code") == RATE_LIMIT_CODE
+    
+    # ==================== Pre-signed Requests ====================
+    
+    def prepare(self, method: str, endpoint: str, params: Optional[Dict] = None,
+                data: Optional[Any] = None) -> Dict:
+        """
+        Build and sign a request without sending it
+        
+        The signature timestamp is taken now; OKX accepts it for 30 seconds.
+        
+        Returns:
+            Prepared request for send_prepared()
+        """
+        url, headers, body = self._prepare_request(method, endpoint, params, data)
+        return {
+            "method": method,
+            "endpoint": endpoint,
+            "params": params,
+            "data": data,
+            "url": url,
+            "headers": headers,
+            "body": body
+        }
+    
+    def acquire_budget(self, endpoint: str, data: Optional[Any] = None) -> bool:
+        """
+        Take rate-limit budget and a scheduler slot ahead of send_prepared()
+        
+        Blocks until the request may go out; the budget wait happens before
+        the slot is taken. Call release_budget() afterwards.
+        
+        Returns:
+            False if the scheduler dropped the request (no slot is held)
+        """
+        priority = priority_for(endpoint)
+        self._wait_budget(endpoint, self.limiter.request_cost(endpoint, data))
+        if not self.scheduler.acquire(self.name, priority):
+            record_dropped(self.name, priority.name.lower())
+            return False
+        return True
+    
+    def release_budget(self):
+        """Release the scheduler slot taken by acquire_budget()"""
+        self.scheduler.release(self.name)
+    
+    def send_prepared(self, prepared: Dict) -> Dict:
+        """
+        Send a pre-signed request immediately
+        
+        The caller must hold budget from acquire_budget(). If OKX throttles the
+        request it is re-signed and retried through the normal rate-limited path.
+        
+        Args:
+            prepared: Request built by prepare()
+        
+        Returns:
+            API response as dictionary
+        """
+        start = time.perf_counter()
+        try:
+            result, throttled = self._transmit(
+                prepared["method"], prepared["url"], prepared["headers"],
+                prepared["params"], prepared["body"]
             )
-            response.raise_for_status()
-            return response.json()
         except requests.exceptions.RequestException as e:
+            record_okx_call(self.name, prepared["endpoint"], "rest", time.perf_counter() - start, None)
             return {
                 "code": "-1",
                 "msg": f"Request failed: {str(e)}",
                 "data": []
             }
+        finally:
+            if prepared["method"] == "POST":
+                self.state_changed()
+        record_okx_call(self.name, prepared["endpoint"], "rest", time.perf_counter() - start, result, throttled)
+        self.limiter.record(self.name, prepared["endpoint"], throttled)
+        if throttled:
+            record_retry(self.name, prepared["endpoint"], "throttled")
+            return self._send(prepared["method"], prepared["endpoint"], prepared["params"], prepared["data"],
+                              slot_held=True)
+        return result
     
     # ==================== Account APIs ====================
     
@@ -135,7 +389,7 @@ class OKXClient:
     
     def place_order(self, inst_id: str, td_mode: str, side: str, ord_type: str,
                    sz: str, px: Optional[str] = None, pos_side: Optional[str] = None,
-                   reduce_only: bool = False, **kwargs) -> Dict:
+                   reduce_only: bool = False, channel: str = "rest", **kwargs) -> Dict:
         """
         Place order
         
@@ -148,12 +402,81 @@ class OKXClient:
             px: Order price (required for limit orders)
             pos_side: Position side ('long' or 'short' for hedge mode)
             reduce_only: Whether to reduce position only
+            channel: 'rest' or 'ws' (private WebSocket, REST when it is not connected)
             **kwargs: Additional parameters (sl_trigger_px, tp_trigger_px, etc.)
         
         Returns:
             API response
         """
         endpoint = "/api/v5/trade/order"
+        data = self.build_order_data(inst_id, td_mode, side, ord_type, sz,
+                                     px=px, pos_side=pos_side, reduce_only=reduce_only, **kwargs)
+        return self._trade_request(endpoint, data, channel)
+    
+    def _trade_request(self, endpoint: str, data: Any, channel: str = "rest") -> Dict:
+        """
+        Send an order-entry request over REST or the order WebSocket and record its latency
+        
+        Both channels share the account's rate-limit budget and priority
+        scheduler; the WebSocket is only used when requested and connected,
+        otherwise the request goes over REST.
+        Order bodies are normalized first; orders the validator rejects are
+        answered locally and never sent.
+        """
+        data, rejects = self.validator.check(endpoint, data)
+        if rejects and not data:
+            return self.validator.rejection_response(data, rejects)
+        start = time.perf_counter()
+        if channel == "ws" and self.ws_orders is not None and self.ws_orders.connected:
+            result = self._send_ws(endpoint, data)
+            used = "ws"
+        else:
+            result = self._request("POST", endpoint, data=data)
+            used = "rest"
+        order_latency.record(used, endpoint.rsplit("/", 1)[-1], time.perf_counter() - start)
+        if rejects:
+            result = self.validator.merge_batch_response(result, rejects, len(data) + len(rejects))
+        return result
+    
+    def _send_ws(self, endpoint: str, data: Any) -> Dict:
+        """Send an order-entry request over the order WebSocket (budget, then scheduler slot)"""
+        priority = priority_for(endpoint)
+        self._wait_budget(endpoint, self.limiter.request_cost(endpoint, data))
+        if not self.scheduler.acquire(self.name, priority):
+            record_dropped(self.name, priority.name.lower())
+            return self._dropped_response(priority)
+        sent = time.perf_counter()
+        try:
+            result = self.ws_orders.request(endpoint, data)
+        finally:
+            self.scheduler.release(self.name)
+            self.state_changed()
+        throttled = result.get("code") == RATE_LIMIT_CODE
+        record_okx_call(self.name, endpoint, "ws", time.perf_counter() - sent, result, throttled)
+        self.limiter.record(self.name, endpoint, throttled)
+        return result
+    
+    def prepare_order(self, inst_id: str, td_mode: str, side: str, ord_type: str,
+                      sz: str, **kwargs) -> Dict:
+        """
+        Build and sign a place-order request without sending it
+        
+        Takes the same arguments as place_order(); send with send_prepared().
+        Orders rejected by the validator come back as {"endpoint", "rejection"}.
+        """
+        endpoint = "/api/v5/trade/order"
+        data, rejects = self.validator.check(
+            endpoint, self.build_order_data(inst_id, td_mode, side, ord_type, sz, **kwargs)
+        )
+        if rejects:
+            return {"endpoint": endpoint, "rejection": rejects[0]}
+        return self.prepare("POST", endpoint, data=data)
+    
+    @staticmethod
+    def build_order_data(inst_id: str, td_mode: str, side: str, ord_type: str,
+                         sz: str, px: Optional[str] = None, pos_side: Optional[str] = None,
+                         reduce_only: bool = False, **kwargs) -> Dict:
+        """Build the request body of /api/v5/trade/order (see place_order)"""
         data = {
             "instId": inst_id,
             "tdMode": td_mode,
@@ -171,9 +494,92 @@ class OKXClient:
         
         # Add additional parameters (stop loss, take profit, etc.)
         data.update(kwargs)
+        return data
+    
+    def close_position(self, inst_id: str, mgn_mode: str = "cross",
+                       pos_side: Optional[str] = None, ccy: Optional[str] = None,
+                       auto_cxl: bool = False) -> Dict:
+        """
+        Close a whole position at market price
+        
+        Args:
+            inst_id: Instrument ID
+            mgn_mode: Margin mode ('cross' or 'isolated')
+            pos_side: Position side ('long' or 'short' in hedge mode, None in net mode)
+            ccy: Margin currency (cross MARGIN positions only)
+            auto_cxl: Cancel pending close orders that would block the close
         
+        Returns:
+            API response
+        """
+        endpoint = "/api/v5/trade/close-position"
+        data = {
+            "instId": inst_id,
+            "mgnMode": mgn_mode
+        }
+        if pos_side:
+            data["posSide"] = pos_side
+        if ccy:
+            data["ccy"] = ccy
+        if auto_cxl:
+            data["autoCxl"] = True
         return self._request("POST", endpoint, data=data)
     
+    def place_batch_orders(self, orders: List[Dict], channel: str = "rest") -> Dict:
+        """
+        Place up to 20 orders in one request
+        
+        Args:
+            orders: Order bodies as built by build_order_data()
+                    [{"instId": "BTC-USDT-SWAP", "tdMode": "cross", "side": "buy",
+                      "ordType": "market", "sz": "1"}, ...]
+            channel: 'rest' or 'ws'
+        
+        Returns:
+            API response; `data` holds one entry (sCode/sMsg/ordId) per order in input order
+        """
+        if len(orders) > self.BATCH_ORDER_MAX_SIZE:
+            return self._batch_too_large()
+        endpoint = "/api/v5/trade/batch-orders"
+        return self._trade_request(endpoint, orders, channel)
+    
+    def _batch_too_large(self) -> Dict:
+        """Response for a batch above BATCH_ORDER_MAX_SIZE (never sent)"""
+        return {
+            "code": "-1",
+            "msg": f"At most {self.BATCH_ORDER_MAX_SIZE} orders per batch",
+            "data": []
+        }
+    
+    @staticmethod
+    def split_batch_response(response: Dict, count: int) -> List[Dict]:
+        """
+        Split a batch response into one result per order
+        
+        Args:
+            response: Response of a batch endpoint
+            count: Number of orders in the request
+        
+        Returns:
+            List of {"code", "msg", "ordId", "clOrdId"} aligned with the request
+        """
+        data = response.get("data") or []
+        if len(data) != count:
+            # Whole request failed (network error, auth, ...) - every order shares the error
+            return [
+                {"code": response.get("code", "-1"), "msg": response.get("msg", ""), "ordId": None, "clOrdId": None}
+                for _ in range(count)
+            ]
+        return [
+            {
+                "code": item.get("sCode", response.get("code")),
+                "msg": item.get("sMsg", ""),
+                "ordId": item.get("ordId"),
+                "clOrdId": item.get("clOrdId")
+            }
+            for item in data
+        ]
+    
     def place_algo_order(self, inst_id: str, td_mode: str, side: str, ord_type: str,
                         sz: str, **kwargs) -> Dict:
         """
@@ -199,10 +605,10 @@ class OKXClient:
             "sz": sz
         }
         data.update(kwargs)
-        return self._request("POST", endpoint, data=data)
+        return self._trade_request(endpoint, data)
     
     def cancel_order(self, inst_id: str, ord_id: Optional[str] = None, 
-                     cl_ord_id: Optional[str] = None) -> Dict:
+                     cl_ord_id: Optional[str] = None, channel: str = "rest") -> Dict:
         """
         Cancel order
         
@@ -210,6 +616,7 @@ class OKXClient:
             inst_id: Instrument ID
             ord_id: Order ID
             cl_ord_id: Client order ID
+            channel: 'rest' or 'ws'
         
         Returns:
             API response
@@ -220,7 +627,7 @@ class OKXClient:
             data["ordId"] = ord_id
         if cl_ord_id:
             data["clOrdId"] = cl_ord_id
-        return self._request("POST", endpoint, data=data)
+        return self._trade_request(endpoint, data, channel)
     
     def cancel_algo_order(self, algo_ids: List[Dict[str, str]]) -> Dict:
         """
@@ -237,45 +644,141 @@ class OKXClient:
         data = algo_ids
         return self._request("POST", endpoint, data=data)
     
+    def cancel_batch_orders(self, orders: List[Dict[str, str]]) -> Dict:
+        """
+        Cancel up to 20 orders in one request
+        
+        Args:
+            orders: Order identifiers
+                    [{"instId": "BTC-USDT-SWAP", "ordId": "xxx"}, ...]
+        
+        Returns:
+            API response; `data` holds one entry (sCode/sMsg) per order in input order
+        """
+        if len(orders) > self.BATCH_ORDER_MAX_SIZE:
+            return self._batch_too_large()
+        endpoint = "/api/v5/trade/cancel-batch-orders"
+        return self._request("POST", endpoint, data=orders)
+    
     def cancel_all_orders(self, inst_id: Optional[str] = None, 
                          inst_type: str = "SWAP") -> Dict:
         """
         Cancel all pending orders
         
+        Regular orders and algo orders of every ordType are listed in parallel,
+        then cancelled through cancel-batch-orders (20 per request) and
+        cancel-algos (10 per request) with all chunks sent concurrently.
+        
         Args:
             inst_id: Instrument ID (optional)
             inst_type: Instrument type
         
         Returns:
-            Combined response from canceling all orders
+            Combined response from canceling all orders, with counts and elapsed_ms;
+            code is "1" and `errors` lists the failed stages when any listing or
+            cancel failed (orders may still be resting)
         """
-        results = {
-            "regular_orders": [],
-            "algo_orders": []
-        }
-        
-        # Cancel regular orders
-        pending_orders = self.get_pending_orders(inst_id=inst_id, inst_type=inst_type)
-        if pending_orders.get("code") == "0" and pending_orders.get("data"):
-            for order in pending_orders["data"]:
-                result = self.cancel_order(
-                    inst_id=order["instId"],
-                    ord_id=order["ordId"]
-                )
-                results["regular_orders"].append(result)
-        
-        # Cancel algo orders
-        algo_orders = self.get_algo_orders(inst_id=inst_id, inst_type=inst_type)
-        if algo_orders.get("code") == "0" and algo_orders.get("data"):
+        start = time.perf_counter()
+        
+        # List regular orders and each algo order type at the same time
+        listings = run_parallel(
+            [self._guarded(lambda: self.get_pending_orders(inst_id=inst_id, inst_type=inst_type))] +
+            [self._guarded(lambda ord_type=ord_type: self.get_algo_orders(ord_type=ord_type, inst_id=inst_id,
+                                                                          inst_type=inst_type))
+             for ord_type in self.ALGO_ORDER_TYPES]
+        )
+        pending_orders = listings[0]
+        algo_orders = self.merge_algo_orders(listings[1:])
+        
+        order_ids, algo_ids = self._cancel_targets(pending_orders, algo_orders)
+        regular_chunks = self._chunk(order_ids, self.BATCH_ORDER_MAX_SIZE)
+        algo_chunks = self._chunk(algo_ids, self.CANCEL_ALGO_MAX_SIZE)
+        
+        responses = run_parallel(
+            [self._guarded(lambda chunk=chunk: self.cancel_batch_orders(chunk)) for chunk in regular_chunks] +
+            [self._guarded(lambda chunk=chunk: self.cancel_algo_order(chunk)) for chunk in algo_chunks]
+        )
+        
+        return self._cancel_summary(
+            responses[:len(regular_chunks)], regular_chunks,
+            responses[len(regular_chunks):], algo_chunks,
+            start, self._listing_errors(listings)
+        )
+    
+    @staticmethod
+    def _guarded(call: Callable[[], Dict]) -> Callable[[], Dict]:
+        """Wrap a request so an exception becomes an error response instead of escaping run_parallel"""
+        def _call() -> Dict:
+            try:
+                return call()
+            except Exception as e:
+                return {"code": "-1", "msg": f"Request failed: {str(e)}", "data": []}
+        return _call
+    
+    @classmethod
+    def _listing_errors(cls, listings: List[Dict]) -> List[Dict]:
+        """Failed listings of cancel_all_orders (pending orders first, then one per algo ordType)"""
+        stages = [("list_orders", None)] + [("list_algo", ord_type) for ord_type in cls.ALGO_ORDER_TYPES]
+        errors = []
+        for (stage, ord_type), response in zip(stages, listings):
+            if response.get("code") != "0":
+                error = {"stage": stage, "code": response.get("code"), "msg": response.get("msg", "")}
+                if ord_type:
+                    error["ordType"] = ord_type
+                errors.append(error)
+        return errors
+    
+    @staticmethod
+    def _chunk(items: List[Any], size: int) -> List[List[Any]]:
+        """Split items into lists of at most size elements"""
+        return [items[i:i + size] for i in range(0, len(items), size)]
+    
+    @staticmethod
+    def _cancel_targets(pending_orders: Dict, algo_orders: Dict) -> Tuple[List[Dict], List[Dict]]:
+        """Identifiers of the regular and algo orders to cancel"""
+        order_ids = [
+            {"instId": order.inst_id, "ordId": order.ord_id}
+            for order in Order.from_response(pending_orders)
+        ]
+        algo_ids = []
+        if algo_orders.get("code") == "0":
             algo_ids = [
                 {"algoId": order["algoId"], "instId": order["instId"]}
-                for order in algo_orders["data"]
+                for order in algo_orders.get("data") or []
             ]
-            if algo_ids:
-                result = self.cancel_algo_order(algo_ids)
-                results["algo_orders"].append(result)
-        
-        return results
+        return order_ids, algo_ids
+    
+    def _cancel_summary(self, regular_responses: List[Dict], regular_chunks: List[List[Dict]],
+                        algo_responses: List[Dict], algo_chunks: List[List[Dict]],
+                        start: float, errors: Optional[List[Dict]] = None) -> Dict:
+        """Combine chunked cancel responses and listing errors into one result"""
+        errors = list(errors or [])
+        cancelled = 0
+        failed = 0
+        for responses, chunks in ((regular_responses, regular_chunks), (algo_responses, algo_chunks)):
+            for response, chunk in zip(responses, chunks):
+                for item in self.split_batch_response(response, len(chunk)):
+                    if item["code"] == "0":
+                        cancelled += 1
+                    else:
+                        failed += 1
+        
+        if errors:
+            msg = "Could not list all pending orders; some orders may still be open"
+        elif failed:
+            msg = f"Failed to cancel {failed} orders"
+        else:
+            msg = ""
+        return {
+            "code": "1" if errors or failed else "0",
+            "msg": msg,
+            "errors": errors,
+            "regular_orders": regular_responses,
+            "algo_orders": algo_responses,
+            "cancelled": cancelled,
+            "failed": failed,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 3)
+        }
     
     # ==================== Query APIs ====================
     
@@ -300,6 +803,32 @@ class OKXClient:
             params["instId"] = inst_id
         return self._request("GET", endpoint, params=params)
     
+    def get_all_algo_orders(self, inst_type: str = "SWAP",
+                            inst_id: Optional[str] = None) -> Dict:
+        """Get pending algo orders of every order type (queried in parallel)"""
+        return self.merge_algo_orders(run_parallel([
+            lambda ord_type=ord_type: self.get_algo_orders(ord_type=ord_type, inst_id=inst_id,
+                                                           inst_type=inst_type)
+            for ord_type in self.ALGO_ORDER_TYPES
+        ]))
+    
+    @staticmethod
+    def merge_algo_orders(responses: List[Dict]) -> Dict:
+        """Merge orders-algo-pending responses of several order types into one response"""
+        return OKXClient.merge_responses(responses)
+    
+    @staticmethod
+    def merge_responses(responses: List[Dict]) -> Dict:
+        """Concatenate the data of several list responses (first error if none succeeded)"""
+        succeeded = [response for response in responses if response.get("code") == "0"]
+        if not succeeded and responses:
+            return responses[0]
+        return {
+            "code": "0",
+            "msg": "",
+            "data": [order for response in succeeded for order in response.get("data") or []]
+        }
+    
     def get_order_history(self, inst_type: str = "SWAP", 
                          inst_id: Optional[str] = None,
                          begin: Optional[str] = None,
@@ -416,6 +945,12 @@ class OKXClient:
         params = {"instId": inst_id}
         return self._request("GET", endpoint, params=params)
     
+    def get_order_book(self, inst_id: str, sz: int = 20) -> Dict:
+        """Get order book depth (sz levels per side, max 400)"""
+        endpoint = "/api/v5/market/books"
+        params = {"instId": inst_id, "sz": sz}
+        return self._request("GET", endpoint, params=params)
+    
     def get_instruments(self, inst_type: str = "SWAP") -> Dict:
         """Get available instruments"""
         endpoint = "/api/v5/public/instruments"
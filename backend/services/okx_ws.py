@@ -0,0 +1,232 @@
+"""
+OKX WebSocket Connection - shared reconnecting connection for public and private feeds
+"""
+import asyncio
+import random
+import time
+from typing import Dict, Iterable, Optional
+
+import aiohttp
+
+from backend.config.config import config
+from backend.services.async_okx_client import get_shared_session
+from backend.utils.json_codec import dumps, loads
+
+
+class OKXWebSocket:
+    """
+    Long-lived OKX WebSocket connection
+
+    Runs as a task on the application event loop and reconnects with
+    jittered exponential backoff whenever the connection drops; heartbeats
+    are driven by the WebSocket supervisor. Subclasses implement on_connect()
+    (login / subscribe), gap_fill() (REST snapshot after every connect),
+    handle_message() and on_disconnect().
+    """
+
+    def __init__(self, url: str, name: str):
+        self.url = url
+        self.name = name
+        self.connected = False
+        self.connected_since: Optional[float] = None
+        self.last_received: Optional[float] = None
+        self.ping_sent_at: Optional[float] = None
+        self.reconnects = 0
+        self.messages = 0
+        self.gap_fills = 0
+        # Whether the current connection has delivered a data message
+        self.data_received = False
+        self.last_gap_fill_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._task: Optional[asyncio.Task] = None
+        self._gap_task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the connection task on the running loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the task and close the connection"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.connected = False
+
+    async def send(self, message: Dict):
+        """Send a JSON message if the connection is open"""
+        if self._ws is not None and not self._ws.closed:
+            await self._ws.send_str(dumps(message))
+
+    async def subscribe(self, args: Iterable[Dict]):
+        """Subscribe to channels ({"channel": ..., "instId"/"instType": ...} entries)"""
+        args = list(args)
+        if args:
+            await self.send({"op": "subscribe", "args": args})
+
+    async def unsubscribe(self, args: Iterable[Dict]):
+        """Unsubscribe from channels (same entries as subscribe())"""
+        args = list(args)
+        if args:
+            await self.send({"op": "unsubscribe", "args": args})
+
+    async def ping(self):
+        """Send an OKX text ping; the supervisor expects a "pong" within its timeout"""
+        if self._ws is not None and not self._ws.closed:
+            self.ping_sent_at = time.monotonic()
+            await self._ws.send_str("ping")
+
+    async def close(self, reason: str):
+        """Drop the connection so it reconnects (used by the supervisor)"""
+        self.last_error = reason
+        print(f"{self.name} closing: {reason}")
+        if self._ws is not None and not self._ws.closed:
+            await self._ws.close()
+
+    def silence(self) -> float:
+        """Seconds since anything (data, event or pong) was received"""
+        return time.monotonic() - self.last_received if self.last_received else 0.0
+
+    async def receive_json(self) -> Optional[Dict]:
+        """Read the next JSON message, None when the connection closed"""
+        while True:
+            msg = await self._ws.receive()
+            self.last_received = time.monotonic()
+            if msg.type == aiohttp.WSMsgType.TEXT:
+                if msg.data == "pong":
+                    self.ping_sent_at = None
+                    continue
+                return loads(msg.data)
+            if msg.type in (aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSED,
+                            aiohttp.WSMsgType.CLOSING, aiohttp.WSMsgType.ERROR):
+                return None
+
+    async def on_connect(self):
+        """Called after every (re)connect, before messages are dispatched"""
+
+    async def gap_fill(self) -> bool:
+        """REST snapshot covering whatever was missed while disconnected (False = nothing to fill)"""
+        return False
+
+    def handle_message(self, message: Dict):
+        """Called for every JSON message"""
+
+    def on_disconnect(self):
+        """Called after the connection is lost"""
+
+    def get_stats(self) -> Dict:
+        return {
+            "url": self.url,
+            "connected": self.connected,
+            "uptime_s": round(time.monotonic() - self.connected_since, 3) if self.connected else 0.0,
+            "reconnects": self.reconnects,
+            "messages": self.messages,
+            "silence_s": round(self.silence(), 3),
+            "gap_fills": self.gap_fills,
+            "last_gap_fill_ms": self.last_gap_fill_ms,
+            "last_error": self.last_error
+        }
+
+    async def _run_gap_fill(self):
+        start = time.perf_counter()
+        try:
+            if not await self.gap_fill():
+                return
+        except Exception as e:
+            print(f"{self.name} gap fill failed: {e}")
+            return
+        self.gap_fills += 1
+        self.last_gap_fill_ms = round((time.perf_counter() - start) * 1000, 3)
+
+    async def _listen(self):
+        """Serve one connection until it closes"""
+        async with get_shared_session().ws_connect(self.url, autoping=True) as ws:
+            self._ws = ws
+            self.last_received = time.monotonic()
+            self.ping_sent_at = None
+            await self.on_connect()
+            self.connected = True
+            self.connected_since = time.monotonic()
+            print(f"{self.name} connected: {self.url}")
+            self._gap_task = asyncio.get_running_loop().create_task(self._run_gap_fill())
+
+            while True:
+                message = await self.receive_json()
+                if message is None:
+                    return
+                if message.get("event") == "error":
+                    self.last_error = f"{message.get('code')}: {message.get('msg')}"
+                    print(f"{self.name} error: {self.last_error}")
+                    continue
+                if "data" in message:
+                    self.messages += 1
+                    self.data_received = True
+                self.handle_message(message)
+
+    def _was_stable(self) -> bool:
+        """Whether the connection that just ended proved healthy (received data or stayed up long enough)"""
+        if self.connected_since is None:
+            return False
+        return self.data_received or time.monotonic() - self.connected_since >= config.WS_RECONNECT_RESET_AFTER
+
+    async def _run(self):
+        delay = config.WS_RECONNECT_MIN_DELAY
+        while True:
+            self.connected_since = None
+            self.data_received = False
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = str(e) or type(e).__name__
+                print(f"{self.name} disconnected: {self.last_error}")
+            finally:
+                self.connected = False
+                self._ws = None
+                if self._gap_task is not None:
+                    self._gap_task.cancel()
+                    self._gap_task = None
+                self.on_disconnect()
+            # A server that accepts and immediately closes keeps backing off
+            if self._was_stable():
+                delay = config.WS_RECONNECT_MIN_DELAY
+            self.reconnects += 1
+            # Equal jitter: spread reconnects of many connections after a shared outage
+            await asyncio.sleep(delay / 2 + random.uniform(0, delay / 2))
+            delay = min(delay * 2, config.WS_RECONNECT_MAX_DELAY)
+
+
+class PrivateOKXWebSocket(OKXWebSocket):
+    """OKX WebSocket that logs in with an account's API key on every (re)connect"""
+
+    LOGIN_TIMEOUT = 10
+
+    def __init__(self, client, name: str):
+        url = config.OKX_WS_PRIVATE_DEMO_URL if client.simulated else config.OKX_WS_PRIVATE_URL
+        super().__init__(url, name)
+        self.client = client
+
+    def login_message(self) -> Dict:
+        """Signed login request (signature over timestamp + GET + /users/self/verify)"""
+        timestamp = str(int(self.client.auth.clock.now()))
+        return {
+            "op": "login",
+            "args": [{
+                "apiKey": self.client.api_key,
+                "passphrase": self.client.passphrase,
+                "timestamp": timestamp,
+                "sign": self.client.auth.sign(timestamp, "GET", "/users/self/verify")
+            }]
+        }
+
+    async def on_connect(self):
+        await self.send(self.login_message())
+        message = await asyncio.wait_for(self.receive_json(), self.LOGIN_TIMEOUT)
+        if not message or message.get("event") != "login" or message.get("code") != "0":
+            raise ConnectionError(f"Login failed: {message}")
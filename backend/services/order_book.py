@@ -0,0 +1,263 @@
+"""
+Order Book Service - local L2 books maintained from the OKX books channels
+"""
+import asyncio
+import bisect
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+from backend.config.config import config
+from backend.services.instrument_registry import instrument_registry
+from backend.services.okx_ws import OKXWebSocket
+
+
+# Levels per side covered by the OKX checksum
+CHECKSUM_DEPTH = 25
+
+
+class BookSide:
+    """
+    One side of a book: sorted price keys plus the raw level per key
+
+    Keys are ascending floats (bid prices are negated so the best level is
+    always at index 0). Levels keep OKX's own [px, sz, liq, orders] lists,
+    so neither the checksum nor /market/depth re-format any numbers.
+    """
+
+    __slots__ = ("is_bid", "keys", "levels")
+
+    def __init__(self, is_bid: bool):
+        self.is_bid = is_bid
+        self.keys: List[float] = []
+        self.levels: Dict[float, list] = {}
+
+    def clear(self):
+        self.keys.clear()
+        self.levels.clear()
+
+    def apply(self, entries: Iterable[list]):
+        """Insert, replace or (size "0") delete levels"""
+        keys = self.keys
+        levels = self.levels
+        for entry in entries:
+            key = -float(entry[0]) if self.is_bid else float(entry[0])
+            if float(entry[1]) == 0:
+                if levels.pop(key, None) is not None:
+                    del keys[bisect.bisect_left(keys, key)]
+            else:
+                if key not in levels:
+                    bisect.insort(keys, key)
+                levels[key] = entry
+
+    def top(self, depth: int) -> List[list]:
+        levels = self.levels
+        return [levels[key] for key in self.keys[:depth]]
+
+    def best(self) -> Optional[list]:
+        return self.levels[self.keys[0]] if self.keys else None
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+class OrderBook:
+    """L2 book of one instrument"""
+
+    __slots__ = ("inst_id", "bids", "asks", "seq_id", "ts", "received", "valid", "updates", "resyncs")
+
+    def __init__(self, inst_id: str):
+        self.inst_id = inst_id
+        self.bids = BookSide(is_bid=True)
+        self.asks = BookSide(is_bid=False)
+        self.seq_id: Optional[int] = None
+        self.ts: Optional[str] = None
+        self.received = 0.0
+        self.valid = False
+        self.updates = 0
+        self.resyncs = 0
+
+    def apply(self, action: str, data: Dict) -> bool:
+        """
+        Apply a snapshot or incremental update
+
+        Returns:
+            False when the book is out of sync (sequence gap or checksum mismatch)
+        """
+        if action == "snapshot":
+            self.bids.clear()
+            self.asks.clear()
+        elif not self.valid:
+            return False
+        elif data.get("prevSeqId") is not None and self.seq_id is not None \
+                and int(data["prevSeqId"]) != self.seq_id:
+            return self.invalidate()
+
+        self.bids.apply(data.get("bids") or ())
+        self.asks.apply(data.get("asks") or ())
+        if data.get("seqId") is not None:
+            self.seq_id = int(data["seqId"])
+        self.ts = data.get("ts")
+        self.received = time.monotonic()
+        self.updates += 1
+
+        if data.get("checksum") is not None and self.checksum() != int(data["checksum"]):
+            return self.invalidate()
+        self.valid = True
+        return True
+
+    def invalidate(self) -> bool:
+        self.valid = False
+        self.resyncs += 1
+        return False
+
+    def checksum(self) -> int:
+        """OKX book checksum: CRC32 (signed) of bid:ask-interleaved px:sz of the top 25 levels"""
+        bids = self.bids.top(CHECKSUM_DEPTH)
+        asks = self.asks.top(CHECKSUM_DEPTH)
+        parts = []
+        for i in range(max(len(bids), len(asks))):
+            if i < len(bids):
+                parts.append(bids[i][0])
+                parts.append(bids[i][1])
+            if i < len(asks):
+                parts.append(asks[i][0])
+                parts.append(asks[i][1])
+        crc = zlib.crc32(":".join(parts).encode())
+        return crc - (1 << 32) if crc >= (1 << 31) else crc
+
+    def depth(self, levels: int) -> Dict:
+        """Top levels in the /api/v5/market/books response format"""
+        return {
+            "code": "0",
+            "msg": "",
+            "data": [{
+                "asks": self.asks.top(levels),
+                "bids": self.bids.top(levels),
+                "ts": self.ts
+            }],
+            "source": "ws",
+            "age_ms": round((time.monotonic() - self.received) * 1000, 3)
+        }
+
+
+class OrderBookFeed(OKXWebSocket):
+    """
+    Public WebSocket maintaining local books for tracked instruments
+
+    Books arrive on their own connection so heavy depth traffic never delays
+    tickers. A book failing its sequence or checksum check is resubscribed,
+    which makes OKX send a fresh snapshot.
+
+    Books requested at runtime are limited to instruments known to the
+    instrument registry and to `max_tracked` of them; the least recently
+    requested book is unsubscribed and dropped to make room. Configured
+    instruments are never dropped.
+    """
+
+    def __init__(self, url: str = None, instruments: Iterable[str] = (), channel: str = None,
+                 max_tracked: int = None):
+        super().__init__(url or config.OKX_WS_URL, "Order book feed")
+        self.channel = channel or config.ORDER_BOOK_CHANNEL
+        self.instruments = set(instruments)
+        self.books: Dict[str, OrderBook] = {}
+        self.max_tracked = config.ORDER_BOOK_MAX_TRACKED if max_tracked is None else max_tracked
+        # Instruments added by track(), least recently requested first
+        self._tracked: OrderedDict = OrderedDict()
+
+    async def track(self, inst_id: str) -> bool:
+        """
+        Start maintaining the book of an instrument
+
+        Returns:
+            Whether the book is maintained (False for unknown instruments)
+        """
+        if inst_id in self.instruments:
+            self._touch(inst_id)
+            return True
+        if self.max_tracked <= 0 or instrument_registry.lookup(inst_id) is None:
+            return False
+        self.instruments.add(inst_id)
+        self._tracked[inst_id] = None
+        evicted = []
+        while len(self._tracked) > self.max_tracked:
+            old, _ = self._tracked.popitem(last=False)
+            self.instruments.discard(old)
+            self.books.pop(old, None)
+            evicted.append({"channel": self.channel, "instId": old})
+        if self.connected:
+            await self.unsubscribe(evicted)
+            await self.subscribe([{"channel": self.channel, "instId": inst_id}])
+        return True
+
+    def _touch(self, inst_id: str):
+        if inst_id in self._tracked:
+            self._tracked.move_to_end(inst_id)
+
+    def get_depth(self, inst_id: str, levels: int) -> Optional[Dict]:
+        """Top `levels` of a live, in-sync book, or None when the feed cannot answer"""
+        book = self.books.get(inst_id)
+        if not self.connected or book is None or not book.valid:
+            return None
+        self._touch(inst_id)
+        return book.depth(levels)
+
+    async def resync(self, inst_id: str):
+        """Resubscribe one instrument to get a fresh snapshot"""
+        if inst_id not in self.instruments:
+            return
+        arg = [{"channel": self.channel, "instId": inst_id}]
+        await self.send({"op": "unsubscribe", "args": arg})
+        await self.subscribe(arg)
+
+    async def on_connect(self):
+        await self.subscribe([
+            {"channel": self.channel, "instId": inst_id}
+            for inst_id in sorted(self.instruments)
+        ])
+
+    def handle_message(self, message: Dict):
+        arg = message.get("arg") or {}
+        if arg.get("channel") != self.channel or "data" not in message:
+            return
+        inst_id = arg.get("instId")
+        if inst_id not in self.instruments:
+            # Pushes still in flight for a dropped book are ignored
+            return
+        book = self.books.get(inst_id)
+        if book is None:
+            book = self.books[inst_id] = OrderBook(inst_id)
+        # books5 / bbo-tbt push full snapshots without an action
+        action = message.get("action", "snapshot")
+        if action != "snapshot" and not book.valid:
+            # Waiting for the snapshot of a resync
+            return
+        for data in message["data"]:
+            if not book.apply(action, data):
+                print(f"Order book {inst_id} out of sync, resubscribing")
+                asyncio.get_running_loop().create_task(self.resync(inst_id))
+                return
+
+    def on_disconnect(self):
+        for book in self.books.values():
+            book.valid = False
+
+    def get_stats(self) -> Dict:
+        stats = super().get_stats()
+        stats["channel"] = self.channel
+        stats["books"] = {
+            inst_id: {
+                "valid": book.valid,
+                "bids": len(book.bids),
+                "asks": len(book.asks),
+                "updates": book.updates,
+                "resyncs": book.resyncs
+            }
+            for inst_id, book in sorted(self.books.items())
+        }
+        return stats
+
+
+# Global book feed (run by the WebSocket supervisor)
+order_book_feed = OrderBookFeed(instruments=config.ORDER_BOOK_INSTRUMENTS)
@@ -0,0 +1,276 @@
+"""
+Order Validator - local pre-trade normalization and rejection of order requests
+"""
+import threading
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation, ROUND_CEILING, ROUND_FLOOR
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.config.config import config
+from backend.services.instrument_registry import Instrument, InstrumentRegistry, instrument_registry
+
+
+# Endpoints whose request bodies are validated
+ORDER_ENDPOINT = "/api/v5/trade/order"
+BATCH_ORDER_ENDPOINT = "/api/v5/trade/batch-orders"
+ALGO_ORDER_ENDPOINT = "/api/v5/trade/order-algo"
+
+# Order types that must carry a limit price
+PRICED_ORDER_TYPES = {"limit", "post_only", "fok", "ioc", "mmp", "mmp_and_post_only"}
+
+# Trigger / attached-order prices rounded to the nearest tick ("-1" = market price, kept as is)
+TRIGGER_PRICE_FIELDS = ("slTriggerPx", "slOrdPx", "tpTriggerPx", "tpOrdPx", "triggerPx", "orderPx")
+
+
+class OrderRejected(Exception):
+    """Raised inside the validator for an order that cannot be sent"""
+
+    def __init__(self, reason: str, msg: str):
+        super().__init__(msg)
+        self.reason = reason
+        self.msg = msg
+
+
+class OrderValidator:
+    """
+    Normalizes order bodies to valid increments and rejects doomed orders locally
+
+    Prices are rounded to tickSz (limit prices never towards a worse fill:
+    buys down, sells up), sizes down to lotSz. Orders that would still be
+    refused by OKX (unknown instrument, size below minSz, limit order without
+    price, ...) are answered locally without a round trip and counted per
+    reason. Only cached instrument rules are used; while a type has not been
+    loaded its orders get the structural checks only.
+    """
+
+    def __init__(self, registry: Optional[InstrumentRegistry] = None, enabled: Optional[bool] = None):
+        self.registry = registry or instrument_registry
+        self.enabled = config.PRETRADE_VALIDATION_ENABLED if enabled is None else enabled
+        self._lock = threading.Lock()
+        self._checked = 0
+        self._normalized = 0
+        self._rejected: Dict[str, int] = defaultdict(int)
+
+    # ==================== Checks ====================
+
+    def check(self, endpoint: str, data: Any) -> Tuple[Any, Dict[int, Dict]]:
+        """
+        Validate the body of an order-entry request
+
+        Args:
+            endpoint: Request endpoint (bodies of other endpoints pass through)
+            data: Request body (dict, or list of dicts for batch-orders)
+
+        Returns:
+            Tuple of (body to send, {index: rejection response}); for single
+            orders a rejection is keyed 0 and the body is None
+        """
+        if not self.enabled:
+            return data, {}
+        if endpoint == BATCH_ORDER_ENDPOINT:
+            valid, rejects = [], {}
+            for index, order in enumerate(data):
+                order, rejection = self.validate_order(order)
+                if rejection is None:
+                    valid.append(order)
+                else:
+                    rejects[index] = rejection
+            return valid, rejects
+        if endpoint == ORDER_ENDPOINT:
+            order, rejection = self.validate_order(data)
+        elif endpoint == ALGO_ORDER_ENDPOINT:
+            order, rejection = self.validate_order(data, algo=True)
+        else:
+            return data, {}
+        return (order, {}) if rejection is None else (None, {0: rejection})
+
+    def validate_order(self, order: Dict, algo: bool = False) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """
+        Normalize one order body (build_order_data / place_algo_order format)
+
+        Returns:
+            Tuple of (normalized copy, None) or (None, rejection response)
+        """
+        if not self.enabled:
+            return order, None
+        order = dict(order)
+        try:
+            changed = self._normalize(order, algo)
+        except OrderRejected as e:
+            return None, self.reject(e.reason, e.msg)
+        with self._lock:
+            self._checked += 1
+            if changed:
+                self._normalized += 1
+        return order, None
+
+    def check_percentage(self, percentage: int) -> Optional[Dict]:
+        """Rejection response for a percentage that is not a POSITION_SIZE_PRESETS value"""
+        if percentage in config.POSITION_SIZE_PRESETS:
+            return None
+        return self.reject(
+            "invalid_percentage",
+            f"Invalid percentage {percentage}. Must be one of {config.POSITION_SIZE_PRESETS}"
+        )
+
+    def reject(self, reason: str, msg: str) -> Dict:
+        """Count a local rejection and build its response"""
+        with self._lock:
+            self._checked += 1
+            self._rejected[reason] += 1
+        return {"code": "-1", "msg": f"Rejected locally: {msg}", "data": [], "rejected_locally": True}
+
+    def _normalize(self, order: Dict, algo: bool) -> bool:
+        inst_id = order.get("instId")
+        if not inst_id:
+            raise OrderRejected("missing_instrument", "instId is required")
+        if order.get("side") not in ("buy", "sell"):
+            raise OrderRejected("invalid_side", f"side must be buy or sell, got {order.get('side')!r}")
+
+        instrument = self.registry.lookup(inst_id)
+        if instrument is None and self.registry.is_loaded(self.registry.inst_type_of(inst_id)):
+            raise OrderRejected("unknown_instrument", f"Unknown instrument {inst_id}")
+        if instrument is not None and instrument.state not in (None, "live"):
+            raise OrderRejected("instrument_not_live", f"{inst_id} is {instrument.state}")
+
+        changed = False
+        ord_type = order.get("ordType")
+        if ord_type in PRICED_ORDER_TYPES and not algo:
+            if not order.get("px"):
+                raise OrderRejected("missing_price", f"{ord_type} order on {inst_id} requires px")
+            rounding = ROUND_FLOOR if order["side"] == "buy" else ROUND_CEILING
+            changed |= self._round_price(order, "px", instrument, rounding)
+        for field in TRIGGER_PRICE_FIELDS:
+            if order.get(field) and order[field] != "-1":
+                changed |= self._round_price(order, field, instrument, None)
+        if order.get("attachAlgoOrds"):
+            # Attached TP/SL legs: copied so the caller's list is left untouched
+            order["attachAlgoOrds"] = [dict(attached) for attached in order["attachAlgoOrds"]]
+            for attached in order["attachAlgoOrds"]:
+                for field in TRIGGER_PRICE_FIELDS:
+                    if attached.get(field) and attached[field] != "-1":
+                        changed |= self._round_price(attached, field, instrument, None)
+                if order.get("px"):
+                    self._check_attached_side(order, attached)
+
+        if (order.get("sz") or not algo) and not self._quote_sized(order, instrument):
+            changed |= self._round_size(order, instrument)
+        return changed
+
+    @staticmethod
+    def _check_attached_side(order: Dict, attached: Dict):
+        """A limit entry's stop loss must trigger on the losing side of px, its take profit on the winning side"""
+        px = Decimal(order["px"])
+        sign = 1 if order["side"] == "buy" else -1
+        for field, expected in (("slTriggerPx", -1), ("tpTriggerPx", 1)):
+            if attached.get(field) and (Decimal(attached[field]) - px) * sign * expected <= 0:
+                raise OrderRejected(
+                    "invalid_attached_price",
+                    f"{field} {attached[field]} is on the wrong side of px {order['px']} for a {order['side']} order"
+                )
+
+    @staticmethod
+    def _decimal(order: Dict, field: str, reason: str) -> Decimal:
+        try:
+            value = Decimal(str(order.get(field)))
+        except InvalidOperation:
+            raise OrderRejected(reason, f"{field} {order.get(field)!r} is not a number")
+        if not value.is_finite() or value <= 0:
+            raise OrderRejected(reason, f"{field} must be positive, got {order[field]}")
+        return value
+
+    def _round_price(self, order: Dict, field: str, instrument: Optional[Instrument],
+                     rounding: Optional[str]) -> bool:
+        price = self._decimal(order, field, "invalid_price")
+        if instrument is None:
+            return False
+        rounded = instrument.round_price(price, rounding) if rounding else instrument.round_price(price)
+        if rounded <= 0:
+            raise OrderRejected("invalid_price", f"{field} {order[field]} rounds to zero (tickSz {instrument.tick_sz})")
+        if rounded == price:
+            return False
+        order[field] = format(rounded.normalize(), "f")
+        return True
+
+    def _round_size(self, order: Dict, instrument: Optional[Instrument]) -> bool:
+        size = self._decimal(order, "sz", "invalid_size")
+        if instrument is None:
+            return False
+        rounded = instrument.round_size(size)
+        if rounded <= 0 or rounded < instrument.min_sz:
+            raise OrderRejected(
+                "size_below_min",
+                f"Size {order['sz']} below minSz {instrument.min_sz} (lotSz {instrument.lot_sz}) for {instrument.inst_id}"
+            )
+        if rounded == size:
+            return False
+        order["sz"] = format(rounded.normalize(), "f")
+        return True
+
+    @staticmethod
+    def _quote_sized(order: Dict, instrument: Optional[Instrument]) -> bool:
+        """True when sz is an amount of currency rather than contracts / base units"""
+        if order.get("tgtCcy") == "quote_ccy":
+            return True
+        inst_type = instrument.inst_type if instrument else InstrumentRegistry.inst_type_of(order["instId"])
+        # Spot market buys are sized in the quote currency unless tgtCcy says otherwise
+        return inst_type == "SPOT" and order.get("ordType") == "market" \
+            and order.get("side") == "buy" and order.get("tgtCcy") != "base_ccy"
+
+    # ==================== Responses ====================
+
+    def rejection_response(self, data: Any, rejects: Dict[int, Dict]) -> Dict:
+        """Response for a request with nothing left to send (single order or fully rejected batch)"""
+        if data is None:
+            return rejects[0]
+        return self.merge_batch_response(None, rejects, len(rejects))
+
+    @staticmethod
+    def merge_batch_response(response: Optional[Dict], rejects: Dict[int, Dict], count: int) -> Dict:
+        """
+        Splice local rejections into a batch-orders response
+
+        Args:
+            response: Response for the orders that were sent (None if none were)
+            rejects: Index in the original request to rejection response
+            count: Number of orders in the original request
+
+        Returns:
+            Batch response with one data entry per original order, in input order
+        """
+        sent = (response or {}).get("data") or []
+        if response is not None and len(sent) != count - len(rejects):
+            # Whole request failed - every sent order shares the error
+            sent = [{"sCode": response.get("code", "-1"), "sMsg": response.get("msg", ""), "ordId": "", "clOrdId": ""}
+                    for _ in range(count - len(rejects))]
+        data: List[Dict] = []
+        remaining = iter(sent)
+        for index in range(count):
+            if index in rejects:
+                data.append({"sCode": "-1", "sMsg": rejects[index]["msg"], "ordId": "", "clOrdId": ""})
+            else:
+                data.append(next(remaining))
+        failed = sum(1 for item in data if item.get("sCode") != "0")
+        return {
+            "code": "0" if failed == 0 else "1" if failed == count else "2",
+            "msg": "" if failed == 0 else (response or {}).get("msg") or
+                   ("All orders were rejected locally" if response is None else "Some orders were rejected locally"),
+            "data": data,
+            "rejected_locally": len(rejects)
+        }
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            rejected = dict(self._rejected)
+            return {
+                "enabled": self.enabled,
+                "checked": self._checked,
+                "normalized": self._normalized,
+                "rejected": sum(rejected.values()),
+                "rejected_by_reason": dict(sorted(rejected.items())),
+                "instrument_types": self.registry.loaded_types()
+            }
+
+
+# Global validator (used by every OKX client)
+order_validator = OrderValidator()
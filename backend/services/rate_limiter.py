@@ -0,0 +1,187 @@
+"""
+OKX Rate Limiter - token buckets per account and endpoint group
+"""
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.config.config import config
+
+
+# Published OKX REST limits: endpoint -> (requests, window seconds, scope)
+# scope "account" is limited per User ID, "ip" per source IP (public data)
+ENDPOINT_LIMITS: Dict[str, Tuple[int, float, str]] = {
+    # Trade
+    "/api/v5/trade/order": (60, 2, "account"),
+    "/api/v5/trade/batch-orders": (300, 2, "account"),
+    "/api/v5/trade/cancel-order": (60, 2, "account"),
+    "/api/v5/trade/cancel-batch-orders": (300, 2, "account"),
+    "/api/v5/trade/amend-order": (60, 2, "account"),
+    "/api/v5/trade/close-position": (20, 2, "account"),
+    "/api/v5/trade/order-algo": (20, 2, "account"),
+    "/api/v5/trade/cancel-algos": (20, 2, "account"),
+    "/api/v5/trade/orders-pending": (60, 2, "account"),
+    "/api/v5/trade/orders-algo-pending": (20, 2, "account"),
+    "/api/v5/trade/orders-history": (40, 2, "account"),
+    "/api/v5/trade/fills-history": (10, 2, "account"),
+    # Account
+    "/api/v5/account/balance": (10, 2, "account"),
+    "/api/v5/account/positions": (10, 2, "account"),
+    "/api/v5/account/config": (5, 2, "account"),
+    "/api/v5/account/set-leverage": (20, 2, "account"),
+    "/api/v5/account/bills": (5, 1, "account"),
+    # Market / public data
+    "/api/v5/market/ticker": (20, 2, "ip"),
+    "/api/v5/market/tickers": (20, 2, "ip"),
+    "/api/v5/market/books": (40, 2, "ip"),
+    "/api/v5/public/instruments": (20, 2, "ip"),
+    "/api/v5/public/mark-price": (10, 2, "ip"),
+    "/api/v5/public/time": (10, 2, "ip"),
+}
+
+# Fallback for endpoints not listed above
+DEFAULT_LIMIT: Tuple[int, float, str] = (10, 2, "account")
+
+# Batch endpoints are limited by number of orders rather than number of requests
+PER_ITEM_ENDPOINTS = {
+    "/api/v5/trade/batch-orders",
+    "/api/v5/trade/cancel-batch-orders",
+}
+
+# OKX "Too Many Requests" error code (also returned with HTTP 429)
+RATE_LIMIT_CODE = "50011"
+
+IP_SCOPE_KEY = "__ip__"
+
+
+def endpoint_group(endpoint: str) -> str:
+    """Endpoint group name used as bucket key (e.g. 'trade/order')"""
+    return endpoint.split("?", 1)[0].replace("/api/v5/", "", 1)
+
+
+class TokenBucket:
+    """Token bucket with adaptive refill rate"""
+
+    __slots__ = ("capacity", "base_rate", "rate", "tokens", "updated", "throttled", "granted")
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.base_rate = rate
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.throttled = 0
+        self.granted = 0
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def reserve(self, cost: float = 1) -> float:
+        """
+        Take `cost` tokens, going into debt if the bucket is short
+
+        Returns:
+            Seconds the caller must wait before sending (0 if tokens were available)
+        """
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens -= cost
+        self.granted += 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+    def penalize(self):
+        """Halve the refill rate and empty the bucket after an OKX rate-limit rejection"""
+        self._refill(time.monotonic())
+        self.rate = max(self.rate * 0.5, self.base_rate * config.RATE_LIMIT_MIN_RATE_FRACTION)
+        self.tokens = min(self.tokens, 0)
+        self.throttled += 1
+
+    def reward(self):
+        """Recover the refill rate gradually after successful requests"""
+        if self.rate < self.base_rate:
+            self.rate = min(self.base_rate, self.rate + self.base_rate * config.RATE_LIMIT_RECOVERY_STEP)
+
+    def snapshot(self) -> Dict:
+        self._refill(time.monotonic())
+        return {
+            "tokens": round(self.tokens, 3),
+            "capacity": self.capacity,
+            "fill": round(max(self.tokens, 0) / self.capacity, 4),
+            "rate_per_sec": round(self.rate, 3),
+            "base_rate_per_sec": round(self.base_rate, 3),
+            "granted": self.granted,
+            "throttled": self.throttled
+        }
+
+
+class RateLimiter:
+    """Token buckets keyed by (account, endpoint group) sized to OKX's published limits"""
+
+    def __init__(self, enabled: bool = None, headroom: float = None):
+        self.enabled = config.RATE_LIMIT_ENABLED if enabled is None else enabled
+        self.headroom = headroom or config.RATE_LIMIT_HEADROOM
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, account: str, endpoint: str) -> TokenBucket:
+        limit, window, scope = ENDPOINT_LIMITS.get(endpoint, DEFAULT_LIMIT)
+        key = (IP_SCOPE_KEY if scope == "ip" else account, endpoint_group(endpoint))
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            capacity = max(limit * self.headroom, 1)
+            bucket = TokenBucket(capacity, capacity / window)
+            self._buckets[key] = bucket
+        return bucket
+
+    @staticmethod
+    def request_cost(endpoint: str, data: Optional[Any] = None) -> int:
+        """Tokens a request consumes (number of orders for batch endpoints)"""
+        if endpoint in PER_ITEM_ENDPOINTS and isinstance(data, list):
+            return max(len(data), 1)
+        return 1
+
+    def reserve(self, account: str, endpoint: str, cost: int = 1) -> float:
+        """
+        Reserve budget for a request
+
+        Args:
+            account: Account identifier
+            endpoint: API endpoint
+            cost: Tokens to take
+
+        Returns:
+            Seconds to wait before sending the request
+        """
+        if not self.enabled:
+            return 0.0
+        with self._lock:
+            bucket = self._bucket(account, endpoint)
+            return bucket.reserve(min(cost, bucket.capacity))
+
+    def record(self, account: str, endpoint: str, throttled: bool):
+        """Adapt the bucket to the exchange's answer (throttled = 50011 / HTTP 429)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            bucket = self._bucket(account, endpoint)
+            if throttled:
+                bucket.penalize()
+            else:
+                bucket.reward()
+
+    def snapshot(self) -> List[Dict]:
+        """Current fill level of every bucket"""
+        with self._lock:
+            return [
+                {"account": account, "group": group, **bucket.snapshot()}
+                for (account, group), bucket in sorted(self._buckets.items())
+            ]
+
+
+# Global rate limiter shared by all OKX clients
+rate_limiter = RateLimiter()
@@ -0,0 +1,278 @@
+"""
+Request Scheduler - per-account priority admission in front of OKXClient
+"""
+import asyncio
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Dict, Optional
+
+from backend.config.config import config
+
+
+class Priority(IntEnum):
+    """Request classes, lower value is served first"""
+    KILL_SWITCH = 0
+    TRADE = 1
+    ACCOUNT = 2
+    HISTORY = 3
+    MARKET = 4
+
+
+# Default class of each endpoint; anything under /trade/ not listed is TRADE
+ENDPOINT_PRIORITIES: Dict[str, Priority] = {
+    "/api/v5/account/balance": Priority.ACCOUNT,
+    "/api/v5/account/positions": Priority.ACCOUNT,
+    "/api/v5/account/config": Priority.ACCOUNT,
+    "/api/v5/account/set-leverage": Priority.TRADE,
+    "/api/v5/trade/orders-pending": Priority.ACCOUNT,
+    "/api/v5/trade/orders-algo-pending": Priority.ACCOUNT,
+    "/api/v5/trade/orders-history": Priority.HISTORY,
+    "/api/v5/trade/fills-history": Priority.HISTORY,
+    "/api/v5/account/bills": Priority.HISTORY,
+}
+
+# Seconds a queued request may wait before it is dropped (None = never dropped)
+DROP_AFTER: Dict[Priority, Optional[float]] = {
+    Priority.KILL_SWITCH: None,
+    Priority.TRADE: None,
+    Priority.ACCOUNT: None,
+    Priority.HISTORY: config.SCHEDULER_DROP_AFTER_HISTORY,
+    Priority.MARKET: config.SCHEDULER_DROP_AFTER_MARKET,
+}
+
+# Overrides the endpoint default for everything issued in the current context
+_priority_override: contextvars.ContextVar = contextvars.ContextVar("okx_request_priority", default=None)
+
+
+@contextmanager
+def request_priority(priority: Priority):
+    """
+    Run the enclosed OKX calls with the given priority class
+
+    Example:
+        with request_priority(Priority.KILL_SWITCH):
+            client.cancel_all_orders()
+    """
+    token = _priority_override.set(priority)
+    try:
+        yield
+    finally:
+        _priority_override.reset(token)
+
+
+def priority_for(endpoint: str) -> Priority:
+    """Priority class of a request to `endpoint` in the current context"""
+    override = _priority_override.get()
+    if override is not None:
+        return override
+    priority = ENDPOINT_PRIORITIES.get(endpoint)
+    if priority is not None:
+        return priority
+    if endpoint.startswith("/api/v5/trade/"):
+        return Priority.TRADE
+    return Priority.MARKET
+
+
+class _Waiter:
+    """Queued request waiting for an in-flight slot"""
+
+    __slots__ = ("priority", "granted", "cancelled", "_event", "_loop", "_future")
+
+    def __init__(self, priority: Priority, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.priority = priority
+        self.granted = False
+        self.cancelled = False
+        self._loop = loop
+        self._event = None if loop else threading.Event()
+        self._future = loop.create_future() if loop else None
+
+    def grant(self):
+        self.granted = True
+        if self._loop is None:
+            self._event.set()
+        else:
+            self._loop.call_soon_threadsafe(self._resolve)
+
+    def _resolve(self):
+        if not self._future.done():
+            self._future.set_result(True)
+
+    def wait(self, timeout: Optional[float]):
+        self._event.wait(timeout)
+
+    async def wait_async(self, timeout: Optional[float]):
+        try:
+            await asyncio.wait_for(asyncio.shield(self._future), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+class _ClassStats:
+    """Queue-wait statistics for one priority class"""
+
+    __slots__ = ("admitted", "queued", "dropped", "wait_total", "wait_max")
+
+    def __init__(self):
+        self.admitted = 0
+        self.queued = 0
+        self.dropped = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def snapshot(self) -> Dict:
+        return {
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "dropped": self.dropped,
+            "avg_wait_ms": round(self.wait_total / self.admitted * 1000, 3) if self.admitted else 0.0,
+            "max_wait_ms": round(self.wait_max * 1000, 3)
+        }
+
+
+class AccountScheduler:
+    """In-flight slots of one account, handed out in priority order"""
+
+    def __init__(self, max_inflight: int):
+        self.max_inflight = max_inflight
+        self.inflight = 0
+        self._queue = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self.stats = {priority: _ClassStats() for priority in Priority}
+
+    def _try_admit(self, priority: Priority) -> bool:
+        # Kill-switch traffic is never queued; others only jump in if nobody is waiting
+        if priority == Priority.KILL_SWITCH or (not self._queue and self.inflight < self.max_inflight):
+            self.inflight += 1
+            self.stats[priority].admitted += 1
+            return True
+        return False
+
+    def _enqueue(self, waiter: _Waiter):
+        heapq.heappush(self._queue, (waiter.priority, next(self._seq), waiter))
+        self.stats[waiter.priority].queued += 1
+
+    def _finish_wait(self, waiter: _Waiter, waited: float) -> bool:
+        with self._lock:
+            stats = self.stats[waiter.priority]
+            if not waiter.granted:
+                # Timed out in the queue: drop it; release() skips cancelled waiters
+                waiter.cancelled = True
+                stats.dropped += 1
+                return False
+            stats.admitted += 1
+            stats.wait_total += waited
+            stats.wait_max = max(stats.wait_max, waited)
+            return True
+
+    def acquire(self, priority: Priority) -> bool:
+        """
+        Wait for an in-flight slot
+
+        Returns:
+            True when admitted, False when the request was dropped
+        """
+        with self._lock:
+            if self._try_admit(priority):
+                return True
+            waiter = _Waiter(priority)
+            self._enqueue(waiter)
+        start = time.monotonic()
+        waiter.wait(DROP_AFTER[priority])
+        return self._finish_wait(waiter, time.monotonic() - start)
+
+    async def acquire_async(self, priority: Priority) -> bool:
+        """Asyncio version of acquire()"""
+        with self._lock:
+            if self._try_admit(priority):
+                return True
+            waiter = _Waiter(priority, asyncio.get_running_loop())
+            self._enqueue(waiter)
+        start = time.monotonic()
+        try:
+            await waiter.wait_async(DROP_AFTER[priority])
+        except asyncio.CancelledError:
+            # Caller went away (client disconnect, cancelled gather): never leak the slot
+            self._abandon(waiter)
+            raise
+        return self._finish_wait(waiter, time.monotonic() - start)
+
+    def _abandon(self, waiter: _Waiter):
+        """Withdraw a cancelled waiter: dequeue it, or free the slot it was already granted"""
+        with self._lock:
+            granted = waiter.granted
+            if not granted:
+                waiter.cancelled = True
+                self._queue = [entry for entry in self._queue if entry[2] is not waiter]
+                heapq.heapify(self._queue)
+        if granted:
+            self.release()
+
+    def release(self):
+        """Free a slot and hand it to the highest-priority waiter"""
+        with self._lock:
+            self.inflight -= 1
+            while self._queue and self.inflight < self.max_inflight:
+                _, _, waiter = heapq.heappop(self._queue)
+                if waiter.cancelled:
+                    continue
+                self.inflight += 1
+                waiter.grant()
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "inflight": self.inflight,
+                "max_inflight": self.max_inflight,
+                "queue_depth": sum(1 for _, _, waiter in self._queue if not waiter.cancelled),
+                "classes": {priority.name.lower(): stats.snapshot() for priority, stats in self.stats.items()}
+            }
+
+
+class RequestScheduler:
+    """Priority schedulers keyed by account"""
+
+    def __init__(self, enabled: bool = None, max_inflight: int = None):
+        self.enabled = config.SCHEDULER_ENABLED if enabled is None else enabled
+        self.max_inflight = max_inflight or config.SCHEDULER_MAX_INFLIGHT_PER_ACCOUNT
+        self._accounts: Dict[str, AccountScheduler] = {}
+        self._lock = threading.Lock()
+
+    def _account(self, account: str) -> AccountScheduler:
+        scheduler = self._accounts.get(account)
+        if scheduler is None:
+            with self._lock:
+                scheduler = self._accounts.setdefault(account, AccountScheduler(self.max_inflight))
+        return scheduler
+
+    def acquire(self, account: str, priority: Priority) -> bool:
+        """Block until the account admits a request of this class (False = dropped)"""
+        if not self.enabled:
+            return True
+        return self._account(account).acquire(priority)
+
+    async def acquire_async(self, account: str, priority: Priority) -> bool:
+        """Asyncio version of acquire()"""
+        if not self.enabled:
+            return True
+        return await self._account(account).acquire_async(priority)
+
+    def release(self, account: str):
+        """Release a slot taken by acquire()"""
+        if self.enabled:
+            self._account(account).release()
+
+    def snapshot(self) -> Dict:
+        """Queue depth and per-class queue-wait metrics of every account"""
+        with self._lock:
+            accounts = dict(self._accounts)
+        return {account: scheduler.snapshot() for account, scheduler in sorted(accounts.items())}
+
+
+# Global scheduler shared by all OKX clients
+request_scheduler = RequestScheduler()
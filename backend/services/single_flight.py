@@ -0,0 +1,136 @@
+"""
+Single-Flight Coalescing - identical concurrent reads share one upstream request
+"""
+import asyncio
+import threading
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, Hashable, Tuple
+
+from backend.config.config import config
+
+
+class _Call:
+    """One in-flight upstream request and the callers waiting for it"""
+
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces identical in-flight calls, keyed by (account, method, endpoint, params)
+
+    The first caller of a key (the leader) makes the request; callers arriving
+    while it is in flight wait for it and receive a copy of its response
+    instead of spending a scheduler slot and rate-limit budget of their own.
+    Thread callers and event-loop callers are tracked separately.
+    """
+
+    def __init__(self, enabled: bool = None):
+        self.enabled = config.REQUEST_COALESCING_ENABLED if enabled is None else enabled
+        self._calls: Dict[Hashable, _Call] = {}
+        self._async_calls: Dict[Hashable, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        # endpoint -> [upstream requests, coalesced callers]
+        self._counts: Dict[str, list] = defaultdict(lambda: [0, 0])
+
+    @staticmethod
+    def key(account_name: str, method: str, endpoint: str, params: Dict = None) -> Tuple:
+        return account_name, method, endpoint, tuple(sorted(params.items())) if params else ()
+
+    def do(self, key: Tuple, func: Callable[[], Dict]) -> Dict:
+        """Run func() once for all concurrent callers of key (blocking callers)"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._counts[key[2]][0] += 1
+            else:
+                self._counts[key[2]][1] += 1
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return dict(call.result)
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.event.set()
+
+    async def do_async(self, key: Tuple, func: Callable[[], Awaitable[Dict]]) -> Dict:
+        """
+        Await func() once for all concurrent callers of key (event-loop callers)
+
+        The shared call runs as its own task, so a caller that is cancelled
+        (a client disconnect) stops waiting without cancelling the request
+        every other caller of the key is waiting for.
+        """
+        with self._lock:
+            task = self._async_calls.get(key)
+            leader = task is None
+            if leader:
+                task = self._async_calls[key] = asyncio.ensure_future(func())
+                task.add_done_callback(lambda done: self._finish_async(key, done))
+                self._counts[key[2]][0] += 1
+            else:
+                self._counts[key[2]][1] += 1
+        result = await asyncio.shield(task)
+        return result if leader else dict(result)
+
+    def _finish_async(self, key: Tuple, task: asyncio.Future):
+        with self._lock:
+            if self._async_calls.get(key) is task:
+                del self._async_calls[key]
+        if not task.cancelled():
+            # Mark retrieved so an exception nobody waited for is not logged
+            task.exception()
+
+    def forget(self, account_name: str):
+        """
+        Stop handing an account's in-flight reads to new callers
+
+        Called after a state-changing request: callers arriving later start a
+        fresh request instead of joining one that began before the change.
+        """
+        with self._lock:
+            for calls in (self._calls, self._async_calls):
+                for key in [key for key in calls if key[0] == account_name]:
+                    del calls[key]
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            counts = {endpoint: list(values) for endpoint, values in self._counts.items()}
+            in_flight = len(self._calls) + len(self._async_calls)
+        upstream = sum(values[0] for values in counts.values())
+        coalesced = sum(values[1] for values in counts.values())
+        return {
+            "enabled": self.enabled,
+            "upstream_requests": upstream,
+            "coalesced_requests": coalesced,
+            "hit_rate": round(coalesced / (upstream + coalesced), 4) if upstream + coalesced else 0.0,
+            "in_flight": in_flight,
+            "endpoints": {
+                endpoint: {
+                    "upstream_requests": values[0],
+                    "coalesced_requests": values[1],
+                    "hit_rate": round(values[1] / (values[0] + values[1]), 4)
+                }
+                for endpoint, values in sorted(counts.items())
+            }
+        }
+
+
+# Global coalescer (shared by every OKX client)
+request_coalescer = SingleFlight()
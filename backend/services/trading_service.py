@@ -1,18 +1,26 @@
 """
 Trading Service - High-level trading operations
 """
-from typing import Dict, List, Optional
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
+from backend.models.records import Bill, BalanceDetail, ZERO, format_number
+from backend.services.account_stream import account_streams
+from backend.services.balance_cache import balance_cache
+from backend.services.instrument_registry import instrument_registry
 from backend.services.okx_client import OKXClient
+from backend.services.order_validator import order_validator
 from backend.config.config import config
 
 
 class TradingService:
     """High-level trading operations with stop loss and take profit"""
     
-    def __init__(self, client: OKXClient):
+    def __init__(self, client: OKXClient, channel: str = "rest"):
         self.client = client
+        # Order entry channel: "rest" or "ws" (private WebSocket)
+        self.channel = channel
     
-    def calculate_position_size(self, balance: float, percentage: int) -> float:
+    def calculate_position_size(self, balance: Decimal, percentage: int) -> Decimal:
         """
         Calculate position size based on percentage of balance
         
@@ -26,7 +34,99 @@ class TradingService:
         if percentage not in config.POSITION_SIZE_PRESETS:
             raise ValueError(f"Invalid percentage. Must be one of {config.POSITION_SIZE_PRESETS}")
         
-        return balance * (percentage / 100.0)
+        return balance * percentage / 100
+    
+    def available_balance(self, ccy: str = "USDT") -> Tuple[Optional[Decimal], Optional[Dict]]:
+        """
+        Available balance of the account without a round trip when possible
+        
+        Served from the live account stream when there is one, otherwise from
+        the balance cache (which fetches only when its entry is stale).
+        
+        Returns:
+            Tuple of (available balance, None) or (None, error response)
+        """
+        state = account_streams.live_state(self.client.name, "account") if config.ACCOUNT_WS_ENABLED else None
+        if state is not None:
+            return BalanceDetail.from_okx(state.balance_details.get(ccy) or {}).avail_bal, None
+        return balance_cache.get_available(self.client, ccy)
+    
+    @staticmethod
+    def build_entry_order(inst_id: str, side: str, size: str,
+                          ord_type: str = "market", px: Optional[str] = None,
+                          td_mode: str = "cross", pos_side: Optional[str] = None,
+                          sl_trigger_px: Optional[str] = None,
+                          sl_ord_px: Optional[str] = None,
+                          tp_trigger_px: Optional[str] = None,
+                          tp_ord_px: Optional[str] = None) -> Dict:
+        """
+        Build OKXClient.place_order arguments for an entry order with attached SL/TP
+        
+        Takes the same arguments as open_position_with_sl_tp(). Stop loss and
+        take profit go into `attachAlgoOrds`, so OKX creates them together with
+        the entry order and sizes them to its fills.
+        
+        Returns:
+            Keyword arguments for place_order() / prepare_order()
+        """
+        order_kwargs = {
+            "inst_id": inst_id,
+            "td_mode": td_mode,
+            "side": side,
+            "ord_type": ord_type,
+            "sz": size
+        }
+        
+        if px:
+            order_kwargs["px"] = px
+        if pos_side:
+            order_kwargs["pos_side"] = pos_side
+        
+        # Attach stop loss and take profit if provided ('-1' order price = market)
+        attached = {}
+        if sl_trigger_px:
+            attached["slTriggerPx"] = sl_trigger_px
+            attached["slOrdPx"] = sl_ord_px or "-1"
+        
+        if tp_trigger_px:
+            attached["tpTriggerPx"] = tp_trigger_px
+            attached["tpOrdPx"] = tp_ord_px or "-1"
+        
+        if attached:
+            order_kwargs["attachAlgoOrds"] = [attached]
+        
+        return order_kwargs
+    
+    @staticmethod
+    def entry_result(main_order: Dict, order_kwargs: Dict) -> Dict:
+        """
+        Combine an entry order response with the SL/TP attached to it
+        
+        Args:
+            main_order: Response of place_order()
+            order_kwargs: Arguments built by build_entry_order()
+        
+        Returns:
+            {"main_order", "stop_loss", "take_profit"}; the SL/TP entries describe
+            the attached legs, which exist only if the main order was accepted
+        """
+        attached = (order_kwargs.get("attachAlgoOrds") or [{}])[0]
+        accepted = main_order.get("code") == "0"
+        
+        def _leg(prefix: str) -> Optional[Dict]:
+            if not attached.get(f"{prefix}TriggerPx"):
+                return None
+            return {
+                "attached": accepted,
+                "triggerPx": attached[f"{prefix}TriggerPx"],
+                "orderPx": attached[f"{prefix}OrdPx"]
+            }
+        
+        return {
+            "main_order": main_order,
+            "stop_loss": _leg("sl"),
+            "take_profit": _leg("tp")
+        }
     
     def open_position_with_sl_tp(self, inst_id: str, side: str, size: str,
                                  ord_type: str = "market", px: Optional[str] = None,
@@ -36,7 +136,11 @@ class TradingService:
                                  tp_trigger_px: Optional[str] = None,
                                  tp_ord_px: Optional[str] = None) -> Dict:
         """
-        Open position with stop loss and take profit
+        Open position with stop loss and take profit in a single request
+        
+        The SL/TP are sent as attachAlgoOrds of the entry order, so the entry
+        and its protection are accepted or rejected together and the position
+        is never open without them.
         
         Args:
             inst_id: Instrument ID (e.g., 'BTC-USDT-SWAP')
@@ -52,84 +156,23 @@ class TradingService:
             tp_ord_px: Take profit order price (use '-1' for market)
         
         Returns:
-            Combined result of main order and SL/TP orders
+            Combined result of main order and attached SL/TP (see entry_result)
         """
-        result = {
-            "main_order": None,
-            "stop_loss": None,
-            "take_profit": None
-        }
-        
-        # Place main order
-        # Build kwargs for additional parameters
-        order_kwargs = {}
-        
-        if px:
-            order_kwargs["px"] = px
-        if pos_side:
-            order_kwargs["pos_side"] = pos_side
-        
-        # Add inline stop loss and take profit if provided
-        if sl_trigger_px:
-            order_kwargs["slTriggerPx"] = sl_trigger_px
-            if sl_ord_px:
-                order_kwargs["slOrdPx"] = sl_ord_px
-        
-        if tp_trigger_px:
-            order_kwargs["tpTriggerPx"] = tp_trigger_px
-            if tp_ord_px:
-                order_kwargs["tpOrdPx"] = tp_ord_px
-        
-        # Call place_order with positional arguments
-        main_order = self.client.place_order(
+        order_kwargs = self.build_entry_order(
             inst_id=inst_id,
-            td_mode=td_mode,
             side=side,
+            size=size,
             ord_type=ord_type,
-            sz=size,
-            **order_kwargs
+            px=px,
+            td_mode=td_mode,
+            pos_side=pos_side,
+            sl_trigger_px=sl_trigger_px,
+            sl_ord_px=sl_ord_px,
+            tp_trigger_px=tp_trigger_px,
+            tp_ord_px=tp_ord_px
         )
-        result["main_order"] = main_order
-        
-        # If main order succeeded and SL/TP not included inline, place algo orders
-        if main_order.get("code") == "0" and not (sl_trigger_px or tp_trigger_px):
-            close_side = "sell" if side == "buy" else "buy"
-            
-            # Place stop loss algo order
-            if sl_trigger_px:
-                sl_params = {
-                    "instId": inst_id,
-                    "tdMode": td_mode,
-                    "side": close_side,
-                    "ordType": "conditional",
-                    "sz": size,
-                    "triggerPx": sl_trigger_px,
-                    "orderPx": sl_ord_px or "-1"
-                }
-                if pos_side:
-                    sl_params["posSide"] = pos_side
-                
-                stop_loss = self.client.place_algo_order(**sl_params)
-                result["stop_loss"] = stop_loss
-            
-            # Place take profit algo order
-            if tp_trigger_px:
-                tp_params = {
-                    "instId": inst_id,
-                    "tdMode": td_mode,
-                    "side": close_side,
-                    "ordType": "conditional",
-                    "sz": size,
-                    "triggerPx": tp_trigger_px,
-                    "orderPx": tp_ord_px or "-1"
-                }
-                if pos_side:
-                    tp_params["posSide"] = pos_side
-                
-                take_profit = self.client.place_algo_order(**tp_params)
-                result["take_profit"] = take_profit
-        
-        return result
+        main_order = self.client.place_order(channel=self.channel, **order_kwargs)
+        return self.entry_result(main_order, order_kwargs)
     
     def open_position_by_percentage(self, inst_id: str, side: str, percentage: int,
                                    current_price: float, ord_type: str = "market",
@@ -151,18 +194,15 @@ class TradingService:
         Returns:
             Order result
         """
-        # Get available balance
-        balance_data = self.client.get_balance()
-        if balance_data.get("code") != "0":
-            return balance_data
-        
-        # Extract USDT balance (assuming USDT as base currency)
-        available_balance = 0
-        for detail in balance_data.get("data", []):
-            for currency in detail.get("details", []):
-                if currency.get("ccy") == "USDT":
-                    available_balance = float(currency.get("availBal", 0))
-                    break
+        # Reject bad requests before spending a balance round trip
+        rejection = order_validator.check_percentage(percentage)
+        if rejection is not None:
+            return rejection
+        
+        # Available balance from the account stream, else the short-lived balance cache
+        available_balance, error = self.available_balance("USDT")
+        if error is not None:
+            return error
         
         if available_balance == 0:
             return {
@@ -171,14 +211,25 @@ class TradingService:
                 "data": []
             }
         
+        instrument = instrument_registry.get(inst_id)
+        if instrument is None:
+            return order_validator.reject("unknown_instrument", f"Unknown instrument {inst_id}")
+        
         # Calculate position size
         position_value = self.calculate_position_size(available_balance, percentage)
         position_value_with_leverage = position_value * leverage
         
-        # Calculate contracts (for SWAP, size is in contracts)
-        # Assuming each contract value is based on the instrument
-        # For BTC-USDT-SWAP, 1 contract = 1 USD
-        size = str(int(position_value_with_leverage / current_price))
+        # Convert notional to contracts using the contract value, rounded down to lotSz
+        contracts = instrument.contracts_for_notional(
+            position_value_with_leverage,
+            Decimal(str(current_price))
+        )
+        if contracts <= 0 or contracts < instrument.min_sz:
+            return order_validator.reject(
+                "size_below_min",
+                f"Position size {contracts} below minimum {instrument.min_sz} contracts for {inst_id}"
+            )
+        size = str(contracts)
         
         # Open position with optional SL/TP
         return self.open_position_with_sl_tp(
@@ -268,42 +319,37 @@ class TradingService:
         if bills.get("code") != "0":
             return bills
         
-        # Calculate summary from bills
-        total_pnl = 0
-        total_fee = 0
-        total_funding_fee = 0
-        balance_change = 0
+        # Calculate summary from bills (exact decimals, floats only in the response)
+        total_pnl = ZERO
+        total_fee = ZERO
+        total_funding_fee = ZERO
+        balance_change = ZERO
         trades = []
         
-        for bill in bills.get("data", []):
-            bill_type = bill.get("type", "")
-            pnl = float(bill.get("pnl", 0) or 0)
-            fee = float(bill.get("fee", 0) or 0)
-            bal_chg = float(bill.get("balChg", 0) or 0)
-            
+        for bill in Bill.from_response(bills):
             # Type 2 = Trade
             # Type 8 = Funding fee
             # Type 7 = Interest deduction
-            if bill_type in ["2", "8", "7"]:
-                total_pnl += pnl
+            if bill.type in ["2", "8", "7"]:
+                total_pnl += bill.pnl
                 
-                if bill_type == "8":  # Funding fee
-                    total_funding_fee += bal_chg
+                if bill.type == "8":  # Funding fee
+                    total_funding_fee += bill.bal_chg
                 
                 # Fee is negative for charges, positive for rebates
-                total_fee += abs(fee)
-                balance_change += bal_chg
+                total_fee += abs(bill.fee)
+                balance_change += bill.bal_chg
                 
                 trades.append({
-                    "instId": bill.get("instId"),
-                    "type": bill_type,
-                    "subType": bill.get("subType"),
-                    "pnl": pnl,
-                    "fee": fee,
-                    "balChg": bal_chg,
-                    "ts": bill.get("ts"),
-                    "px": bill.get("px"),
-                    "sz": bill.get("sz")
+                    "instId": bill.inst_id,
+                    "type": bill.type,
+                    "subType": bill.sub_type,
+                    "pnl": float(bill.pnl),
+                    "fee": float(bill.fee),
+                    "balChg": float(bill.bal_chg),
+                    "ts": format_number(bill.ts),
+                    "px": format_number(bill.px),
+                    "sz": format_number(bill.sz)
                 })
         
         # Calculate net P&L
@@ -315,118 +361,11 @@ class TradingService:
             "code": "0",
             "msg": "Success",
             "data": {
-                "total_pnl": balance_change,  # Use balance_change as total realized P&L
-                "total_fee": total_fee,
-                "funding_fee": total_funding_fee,
-                "net_pnl": net_pnl,
+                "total_pnl": float(balance_change),  # Use balance_change as total realized P&L
+                "total_fee": float(total_fee),
+                "funding_fee": float(total_funding_fee),
+                "net_pnl": float(net_pnl),
                 "trade_count": len(trades),
                 "trades": trades
             }
         }
-    
-    def close_all_positions(self, inst_type: str = "SWAP") -> Dict:
-        """
-        Close all positions with market orders
-        
-        Args:
-            inst_type: Instrument type (default: SWAP)
-        
-        Returns:
-            Results of closing all positions
-        """
-        # Get all current positions
-        positions = self.client.get_positions(inst_type=inst_type)
-        
-        if positions.get("code") != "0":
-            return positions
-        
-        results = []
-        positions_data = positions.get("data", [])
-        
-        if not positions_data:
-            return {
-                "code": "0",
-                "msg": "No positions to close",
-                "data": {
-                    "success_count": 0,
-                    "failed_count": 0,
-                    "results": []
-                }
-            }
-        
-        success_count = 0
-        failed_count = 0
-        
-        for pos in positions_data:
-            inst_id = pos.get("instId")
-            pos_side = pos.get("posSide")
-            avail_pos = pos.get("availPos", "0")
-            
-            # Skip if no available position to close
-            if float(avail_pos) <= 0:
-                continue
-            
-            # Determine order side (opposite of position side)
-            # For long positions, we sell; for short positions, we buy
-            if pos_side == "long":
-                order_side = "sell"
-            elif pos_side == "short":
-                order_side = "buy"
-            else:
-                # For net mode (posSide is "net"), check pos sign
-                pos_amount = float(pos.get("pos", "0"))
-                if pos_amount > 0:
-                    order_side = "sell"
-                else:
-                    order_side = "buy"
-            
-            # Place market order to close position
-            try:
-                result = self.client.place_order(
-                    inst_id=inst_id,
-                    td_mode=pos.get("mgnMode", "cross"),
-                    side=order_side,
-                    ord_type="market",
-                    sz=avail_pos,
-                    reduce_only=True,
-                    pos_side=pos_side if pos_side in ["long", "short"] else None
-                )
-                
-                if result.get("code") == "0":
-                    success_count += 1
-                    results.append({
-                        "instId": inst_id,
-                        "posSide": pos_side,
-                        "size": avail_pos,
-                        "status": "success",
-                        "orderId": result.get("data", [{}])[0].get("ordId"),
-                        "message": "Position closed successfully"
-                    })
-                else:
-                    failed_count += 1
-                    results.append({
-                        "instId": inst_id,
-                        "posSide": pos_side,
-                        "size": avail_pos,
-                        "status": "failed",
-                        "message": result.get("msg", "Unknown error")
-                    })
-            except Exception as e:
-                failed_count += 1
-                results.append({
-                    "instId": inst_id,
-                    "posSide": pos_side,
-                    "size": avail_pos,
-                    "status": "failed",
-                    "message": str(e)
-                })
-        
-        return {
-            "code": "0",
-            "msg": f"Closed {success_count} positions, {failed_count} failed",
-            "data": {
-                "success_count": success_count,
-                "failed_count": failed_count,
-                "results": results
-            }
-        }
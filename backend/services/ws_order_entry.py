@@ -0,0 +1,124 @@
+"""
+WebSocket Order Entry - place and cancel orders over the OKX private WebSocket
+"""
+import asyncio
+import concurrent.futures
+import itertools
+from typing import Any, Dict, Optional
+
+from backend.services.async_okx_client import AsyncOKXClient
+from backend.services.okx_ws import PrivateOKXWebSocket
+
+
+# REST endpoint -> private WebSocket op accepting the same request body
+WS_TRADE_OPS = {
+    "/api/v5/trade/order": "order",
+    "/api/v5/trade/batch-orders": "batch-orders",
+    "/api/v5/trade/cancel-order": "cancel-order",
+    "/api/v5/trade/cancel-batch-orders": "batch-cancel-orders",
+}
+
+
+class WSOrderEntry(PrivateOKXWebSocket):
+    """
+    Dedicated logged-in private WebSocket of one account for order entry
+
+    No channels are subscribed, so op responses never queue behind pushes.
+    Requests are matched to responses by their `id`.
+    """
+
+    REQUEST_TIMEOUT = 10
+
+    def __init__(self, client: AsyncOKXClient):
+        super().__init__(client, f"Order entry {client.name}")
+        self._ids = itertools.count(1)
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+        super().start()
+
+    async def request_async(self, endpoint: str, data: Any) -> Dict:
+        """
+        Send a REST trade request body as the matching WebSocket op and wait for the response
+
+        Args:
+            endpoint: REST endpoint listed in WS_TRADE_OPS
+            data: Request body (dict or list of dicts, as sent to the REST endpoint)
+
+        Returns:
+            Response in the REST format ({"code", "msg", "data"})
+        """
+        op = WS_TRADE_OPS[endpoint]
+        if not self.connected:
+            return {"code": "-1", "msg": "Order WebSocket not connected", "data": []}
+        request_id = str(next(self._ids))
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await self.send({"id": request_id, "op": op, "args": data if isinstance(data, list) else [data]})
+            return await asyncio.wait_for(future, self.REQUEST_TIMEOUT)
+        except asyncio.TimeoutError:
+            return self._timeout_response(op)
+        finally:
+            self._pending.pop(request_id, None)
+
+    def request(self, endpoint: str, data: Any) -> Dict:
+        """Blocking request_async() for executor threads"""
+        if self._loop is None:
+            return {"code": "-1", "msg": "Order WebSocket not started", "data": []}
+        try:
+            if asyncio.get_running_loop() is self._loop:
+                return {"code": "-1", "msg": "Blocking order WebSocket call from the event loop", "data": []}
+        except RuntimeError:
+            pass
+        future = asyncio.run_coroutine_threadsafe(self.request_async(endpoint, data), self._loop)
+        try:
+            return future.result(self.REQUEST_TIMEOUT + 1)
+        except concurrent.futures.TimeoutError:
+            # Event loop stalled: give up on the request like request_async() does
+            future.cancel()
+            return self._timeout_response(WS_TRADE_OPS[endpoint])
+
+    def _timeout_response(self, op: str) -> Dict:
+        return {"code": "-1", "msg": f"No response to {op} within {self.REQUEST_TIMEOUT}s (order state unknown)", "data": []}
+
+    def handle_message(self, message: Dict):
+        future = self._pending.get(message.get("id"))
+        if future is not None and not future.done():
+            future.set_result({
+                "code": message.get("code", "-1"),
+                "msg": message.get("msg", ""),
+                "data": message.get("data") or []
+            })
+
+    def get_stats(self) -> Dict:
+        stats = super().get_stats()
+        stats["pending"] = len(self._pending)
+        return stats
+
+    def on_disconnect(self):
+        for future in self._pending.values():
+            if not future.done():
+                future.set_result({"code": "-1", "msg": "Order WebSocket disconnected (order state unknown)", "data": []})
+
+
+class WSOrderEntryManager:
+    """Order entry connections keyed by account name (run by the WebSocket supervisor)"""
+
+    def __init__(self):
+        self.connections: Dict[str, WSOrderEntry] = {}
+
+    def create(self, clients: Dict[str, AsyncOKXClient]) -> Dict[str, WSOrderEntry]:
+        """Create one connection per account"""
+        for name, client in clients.items():
+            self.connections.setdefault(name, WSOrderEntry(client))
+        return dict(self.connections)
+
+    def get_stats(self) -> Dict:
+        return {name: connection.get_stats() for name, connection in sorted(self.connections.items())}
+
+
+# Global order entry connections
+ws_order_entry = WSOrderEntryManager()
@@ -0,0 +1,98 @@
+"""
+WebSocket Supervisor - lifecycle, heartbeats and health of every OKX WebSocket
+"""
+import asyncio
+import time
+from typing import Dict, Optional
+
+from backend.config.config import config
+from backend.services.okx_ws import OKXWebSocket
+
+
+class WSSupervisor:
+    """
+    Owns the market-data, account-stream and order-entry connections
+
+    Starts and stops them together and runs a monitor task that pings idle
+    connections, closes those that miss a pong (they then reconnect with
+    jittered backoff, resubscribe and gap-fill) and samples message rates.
+    """
+
+    def __init__(self):
+        self.connections: Dict[str, OKXWebSocket] = {}
+        self.heartbeat_failures: Dict[str, int] = {}
+        self._rates: Dict[str, float] = {}
+        self._last_sample: Dict[str, tuple] = {}
+        self._monitor: Optional[asyncio.Task] = None
+
+    def add(self, key: str, connection: OKXWebSocket):
+        """Register a connection under a unique key (e.g. "account:main")"""
+        self.connections[key] = connection
+        self.heartbeat_failures.setdefault(key, 0)
+
+    def start(self):
+        """Start every connection and the monitor on the running loop"""
+        for connection in self.connections.values():
+            connection.start()
+        if self._monitor is None or self._monitor.done():
+            self._monitor = asyncio.get_running_loop().create_task(self._run_monitor())
+
+    async def stop(self):
+        """Stop the monitor and every connection"""
+        if self._monitor is not None:
+            self._monitor.cancel()
+            try:
+                await self._monitor
+            except asyncio.CancelledError:
+                pass
+            self._monitor = None
+        for connection in self.connections.values():
+            await connection.stop()
+
+    async def check(self):
+        """One monitor pass: heartbeat every connection and sample message rates"""
+        now = time.monotonic()
+        for key, connection in list(self.connections.items()):
+            previous = self._last_sample.get(key)
+            if previous is not None and now > previous[0]:
+                self._rates[key] = (connection.messages - previous[1]) / (now - previous[0])
+            self._last_sample[key] = (now, connection.messages)
+
+            if not connection.connected:
+                continue
+            if connection.ping_sent_at is not None:
+                if now - connection.ping_sent_at > config.WS_PONG_TIMEOUT:
+                    self.heartbeat_failures[key] += 1
+                    await connection.close(f"No pong within {config.WS_PONG_TIMEOUT}s")
+            elif connection.silence() >= config.WS_PING_INTERVAL:
+                await connection.ping()
+
+    async def _run_monitor(self):
+        while True:
+            await asyncio.sleep(config.WS_MONITOR_INTERVAL)
+            try:
+                await self.check()
+            except Exception as e:
+                print(f"WebSocket supervisor check failed: {e}")
+
+    def get_health(self) -> Dict:
+        """Connection health, message rates and reconnect counts of every connection"""
+        connections = {}
+        for key, connection in sorted(self.connections.items()):
+            stats = connection.get_stats()
+            stats.update(
+                healthy=connection.connected and connection.ping_sent_at is None,
+                messages_per_s=round(self._rates.get(key, 0.0), 3),
+                heartbeat_failures=self.heartbeat_failures.get(key, 0)
+            )
+            connections[key] = stats
+        return {
+            "connections": connections,
+            "total": len(connections),
+            "connected": sum(1 for stats in connections.values() if stats["connected"]),
+            "reconnects": sum(stats["reconnects"] for stats in connections.values())
+        }
+
+
+# Global supervisor (started with the application)
+ws_supervisor = WSSupervisor()
@@ -0,0 +1,73 @@
+"""
+JSON Codec - fast JSON encoding/decoding for OKX payloads and API responses
+"""
+import json
+from decimal import Decimal
+from typing import Any, Union
+
+from fastapi.responses import JSONResponse
+
+from backend.config.config import config
+
+try:
+    import orjson
+except ImportError:  # optional dependency, stdlib json is used without it
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Encode types the JSON backends do not know (Decimal keeps its exact digits)"""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+# JSON_CODEC: "auto" (orjson when installed), "orjson" or "json"
+USE_ORJSON = orjson is not None and config.JSON_CODEC in ("auto", "orjson")
+if config.JSON_CODEC == "orjson" and orjson is None:
+    print("JSON_CODEC=orjson but orjson is not installed, using stdlib json")
+BACKEND = "orjson" if USE_ORJSON else "json"
+
+if USE_ORJSON:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """Compact JSON as UTF-8 bytes"""
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+
+    def dumps(obj: Any) -> str:
+        """Compact JSON as str (request bodies are signed as sent)"""
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS).decode()
+
+    def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+        return orjson.loads(data)
+else:
+    _encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=_default)
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """Compact JSON as UTF-8 bytes"""
+        return _encoder.encode(obj).encode()
+
+    def dumps(obj: Any) -> str:
+        """Compact JSON as str (request bodies are signed as sent)"""
+        return _encoder.encode(obj)
+
+    def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        return json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with the fast codec
+
+    Used as the application's default response class. Routes with large
+    payloads return it directly, which also skips FastAPI's jsonable_encoder
+    pass over data that is already plain JSON types.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content)
@@ -4,20 +4,82 @@ OKX API Authentication Utility
 import base64
 import hmac
 import hashlib
-from datetime import datetime
+import time
+
+
+class ServerClock:
+    """
+    Local clock corrected by the measured offset to the OKX server clock
+    
+    OKX rejects requests whose timestamp is more than 30 seconds off its own
+    clock; the offset is measured against /api/v5/public/time (see
+    HTTPTransport.sync_clock) and applied to every signature timestamp.
+    """
+    
+    def __init__(self):
+        self.offset = 0.0
+        self.rtt = None
+        self.synced_at = None
+        self.syncs = 0
+        # (whole second, formatted "YYYY-MM-DDTHH:MM:SS") of the last timestamp
+        self._second = (None, "")
+    
+    def update(self, server_ms: int, sent: float, received: float):
+        """
+        Record a server time sample
+        
+        Args:
+            server_ms: Server time in milliseconds
+            sent: Local time.time() when the request was sent
+            received: Local time.time() when the response arrived
+        """
+        # The server read its clock roughly halfway through the round trip
+        self.offset = server_ms / 1000 - (sent + received) / 2
+        self.rtt = received - sent
+        self.synced_at = received
+        self.syncs += 1
+    
+    def now(self) -> float:
+        """Server time in seconds since the epoch"""
+        return time.time() + self.offset
+    
+    def timestamp(self) -> str:
+        """Server time as an ISO 8601 timestamp with milliseconds (2024-01-01T00:00:00.000Z)"""
+        now = self.now()
+        second = int(now)
+        cached = self._second
+        if cached[0] != second:
+            # strftime only runs once per second; the millisecond suffix is cheap
+            cached = self._second = (second, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second)))
+        return f"{cached[1]}.{int((now - second) * 1000):03d}Z"
+    
+    def get_stats(self) -> dict:
+        return {
+            "offset_ms": round(self.offset * 1000, 3),
+            "rtt_ms": round(self.rtt * 1000, 3) if self.rtt is not None else None,
+            "synced_age_s": round(time.time() - self.synced_at, 3) if self.synced_at else None,
+            "syncs": self.syncs
+        }
+
+
+# Shared by every account (one exchange clock)
+server_clock = ServerClock()
 
 
 class OKXAuth:
     """Handle OKX API authentication"""
     
-    def __init__(self, api_key: str, secret_key: str, passphrase: str):
+    def __init__(self, api_key: str, secret_key: str, passphrase: str, clock: ServerClock = None):
         self.api_key = api_key
         self.secret_key = secret_key
         self.passphrase = passphrase
+        self.clock = clock or server_clock
+        # Keyed HMAC prototype: copying it skips re-keying on every signature
+        self._mac = hmac.new(secret_key.encode(), digestmod=hashlib.sha256)
     
     def get_timestamp(self) -> str:
-        """Get ISO 8601 timestamp"""
-        return datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+        """Get ISO 8601 timestamp (server-clock corrected)"""
+        return self.clock.timestamp()
     
     def sign(self, timestamp: str, method: str, request_path: str, body: str = '') -> str:
         """
@@ -32,12 +94,8 @@ class OKXAuth:
         Returns:
             Base64 encoded signature
         """
-        message = timestamp + method.upper() + request_path + body
-        mac = hmac.new(
-            bytes(self.secret_key, encoding='utf8'),
-            bytes(message, encoding='utf-8'),
-            digestmod=hashlib.sha256
-        )
+        mac = self._mac.copy()
+        mac.update(f"{timestamp}{method.upper()}{request_path}{body}".encode())
         return base64.b64encode(mac.digest()).decode()
     
     def get_headers(self, method: str, request_path: str, body: str = '') -> dict:
@@ -52,12 +110,11 @@ class OKXAuth:
         Returns:
             Dictionary of headers
         """
-        timestamp = self.get_timestamp()
-        signature = self.sign(timestamp, method, request_path, body)
+        timestamp = self.clock.timestamp()
         
         return {
             'OK-ACCESS-KEY': self.api_key,
-            'OK-ACCESS-SIGN': signature,
+            'OK-ACCESS-SIGN': self.sign(timestamp, method, request_path, body),
             'OK-ACCESS-TIMESTAMP': timestamp,
             'OK-ACCESS-PASSPHRASE': self.passphrase,
             'Content-Type': 'application/json'
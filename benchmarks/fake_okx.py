@@ -0,0 +1,81 @@
+"""
+Fake OKX REST server for local load tests
+
+Answers every /api/v5 endpoint with a canned success payload after a
+configurable delay, so benchmarks can exercise the full backend stack
+without touching the real exchange.
+"""
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+
+def _payload(path: str, body: bytes = b"") -> List[Dict]:
+    """Canned `data` list for an endpoint"""
+    if path.startswith("/api/v5/account/balance"):
+        return [{"totalEq": "10000", "details": [{"ccy": "USDT", "availBal": "10000", "eq": "10000"}]}]
+    if path.startswith("/api/v5/public/instruments"):
+        return [
+            {"instId": "BTC-USDT-SWAP", "instType": "SWAP", "ctVal": "0.01", "ctValCcy": "BTC", "ctType": "linear",
+             "lotSz": "0.01", "tickSz": "0.1", "minSz": "0.01", "lever": "100", "state": "live"},
+            {"instId": "ETH-USDT-SWAP", "instType": "SWAP", "ctVal": "0.1", "ctValCcy": "ETH", "ctType": "linear",
+             "lotSz": "0.01", "tickSz": "0.01", "minSz": "0.01", "lever": "100", "state": "live"}
+        ]
+    if path.startswith("/api/v5/public/time"):
+        return [{"ts": str(int(time.time() * 1000))}]
+    if path.startswith("/api/v5/trade/batch-orders") or path.startswith("/api/v5/trade/cancel-batch-orders"):
+        ts = str(int(time.time() * 1000))
+        return [
+            {"ordId": order.get("ordId") or f"{ts}{i}", "clOrdId": order.get("clOrdId", ""),
+             "ts": ts, "sCode": "0", "sMsg": ""}
+            for i, order in enumerate(json.loads(body or b"[]"))
+        ]
+    if path.startswith("/api/v5/trade/order"):
+        ts = str(int(time.time() * 1000))
+        return [{"ordId": ts, "clOrdId": "", "tag": "", "ts": ts, "sCode": "0", "sMsg": ""}]
+    return []
+
+
+def start_fake_okx(delay: float = 0.2, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Start a fake OKX server in a background thread
+
+    Args:
+        delay: Seconds to wait before answering each request
+        host: Interface to bind
+
+    Returns:
+        Running server (url in `server.url`, requests per path in `server.requests`)
+    """
+    requests = Counter()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _respond(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            request_body = self.rfile.read(length) if length else b""
+            requests[self.path.split("?", 1)[0]] += 1
+            time.sleep(delay)
+            body = json.dumps({"code": "0", "msg": "", "data": _payload(self.path, request_body)}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        do_GET = _respond
+        do_POST = _respond
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, 0), Handler)
+    server.daemon_threads = True
+    server.requests = requests
+    server.url = f"http://{host}:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,93 @@
+"""
+JSON Codec Benchmark - stdlib json vs the configured codec on history payloads
+
+Measures the three JSON passes of a multi-account /history/fills request:
+parsing each account's OKX response, and rendering the aggregated API
+response (before: jsonable_encoder + JSONResponse, now: FastJSONResponse).
+Payloads are either a recorded /api/v5/trade/fills-history response
+(--payload, reused for every account) or generated ones with the same fields.
+
+Usage:
+    python -m benchmarks.json_codec [--accounts 20] [--fills 100] [--payload fills.json] [--iterations 50]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from backend.utils import json_codec
+
+
+def _fill(i: int) -> dict:
+    """One fills-history entry with OKX's field set"""
+    ts = str(1700000000000 + i * 1000)
+    px = f"{random.uniform(20000, 70000):.1f}"
+    return {
+        "instType": "SWAP", "instId": random.choice(["BTC-USDT-SWAP", "ETH-USDT-SWAP"]),
+        "tradeId": str(100000000 + i), "ordId": str(600000000000000000 + i), "clOrdId": "",
+        "billId": str(700000000000000000 + i), "subType": "1", "tag": "", "fillPx": px,
+        "fillSz": f"{random.randint(1, 500) / 100}", "fillIdxPx": px, "fillPnl": f"{random.uniform(-50, 50):.8f}",
+        "fillPxVol": "", "fillPxUsd": "", "fillMarkVol": "", "fillFwdPx": "", "fillMarkPx": px,
+        "side": random.choice(["buy", "sell"]), "posSide": "net", "execType": random.choice(["T", "M"]),
+        "feeCcy": "USDT", "fee": f"{-random.uniform(0, 2):.8f}", "ts": ts, "fillTime": ts
+    }
+
+
+def _responses(accounts: int, fills: int, payload_path: str = None) -> list:
+    """Raw OKX response bodies (bytes), one per account"""
+    if payload_path:
+        with open(payload_path, "rb") as f:
+            body = f.read()
+        return [body] * accounts
+    return [
+        json.dumps({"code": "0", "msg": "", "data": [_fill(a * fills + i) for i in range(fills)]}).encode()
+        for a in range(accounts)
+    ]
+
+
+def _timed(func, iterations: int) -> float:
+    """Average milliseconds per call"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--accounts", type=int, default=20)
+    parser.add_argument("--fills", type=int, default=100)
+    parser.add_argument("--payload", help="Recorded fills-history response (JSON file)")
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    bodies = _responses(args.accounts, args.fills, args.payload)
+    parsed = [json.loads(body) for body in bodies]
+    content = {"code": "0", "msg": "Success", "data": {f"account{i}": r for i, r in enumerate(parsed)}}
+    size_mb = sum(len(body) for body in bodies) / 1e6
+
+    cases = [
+        ("parse OKX responses",
+         lambda: [json.loads(body) for body in bodies],
+         lambda: [json_codec.loads(body) for body in bodies]),
+        ("render API response",
+         lambda: JSONResponse(jsonable_encoder(content)).body,
+         lambda: json_codec.FastJSONResponse(content).body),
+    ]
+    print(f"codec: {json_codec.BACKEND}, {args.accounts} accounts x {len(parsed[0]['data'])} fills, {size_mb:.2f} MB")
+    print(f"{'pass':<22}{'stdlib ms':>12}{'codec ms':>12}{'speedup':>10}{'codec MB/s':>12}")
+    for label, before, after in cases:
+        before_ms = _timed(before, args.iterations)
+        after_ms = _timed(after, args.iterations)
+        print(f"{label:<22}{before_ms:>12.3f}{after_ms:>12.3f}{before_ms / after_ms:>9.2f}x{size_mb / after_ms * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
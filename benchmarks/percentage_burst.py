@@ -0,0 +1,95 @@
+"""
+Percentage Order Burst Check - balance reads per burst of percentage orders
+
+Places percentage orders on one account against the fake OKX server and
+checks that the balance cache never sizes an order from a balance older
+than the account's last state change:
+
+- N orders one after another cost N /account/balance reads (each order
+  makes the cached balance dirty for the next one)
+- sizing reads with no order in between are served from the cache
+- N orders sized concurrently after a state change share one read
+
+Usage:
+    python -m benchmarks.percentage_burst [--orders 20] [--delay 0.05]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_okx import start_fake_okx
+
+BALANCE_PATH = "/api/v5/account/balance"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--orders", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=0.05, help="Fake OKX response delay (seconds)")
+    args = parser.parse_args()
+
+    server = start_fake_okx(delay=args.delay)
+    # The backend reads its configuration on import
+    os.environ["OKX_API_URL"] = server.url
+    os.environ["ACCOUNT_WS_ENABLED"] = "false"
+    from backend.services.balance_cache import balance_cache
+    from backend.services.instrument_registry import instrument_registry
+    from backend.services.okx_client import OKXClient
+    from backend.services.trading_service import TradingService
+
+    instrument_registry.load("SWAP")
+    client = OKXClient("key", "secret", "pass", name="burst")
+    service = TradingService(client)
+
+    def place():
+        result = service.open_position_by_percentage("BTC-USDT-SWAP", "buy", 10, current_price=65000.0)
+        return (result.get("main_order") or result).get("code") == "0"
+
+    # Sequential orders: one read per state change
+    start = time.perf_counter()
+    placed = sum(place() for _ in range(args.orders))
+    elapsed = time.perf_counter() - start
+    sequential_reads = server.requests[BALANCE_PATH]
+
+    # No state change in between: both reads are cache hits after the refetch
+    service.available_balance()
+    service.available_balance()
+    service.available_balance()
+    quiet_reads = server.requests[BALANCE_PATH] - sequential_reads
+
+    # Concurrent orders after one state change: their sizing reads share one GET
+    client.set_leverage("BTC-USDT-SWAP", 10)
+    before = server.requests[BALANCE_PATH]
+    barrier = threading.Barrier(args.orders)
+    outcomes = []
+
+    def place_together():
+        barrier.wait()
+        outcomes.append(place())
+
+    threads = [threading.Thread(target=place_together) for _ in range(args.orders)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    concurrent_reads = server.requests[BALANCE_PATH] - before
+
+    stats = balance_cache.get_stats()
+    print(f"sequential orders placed: {placed}/{args.orders} in {elapsed * 1000:.1f} ms, "
+          f"balance reads: {sequential_reads}")
+    print(f"balance reads for 3 sizings without orders: {quiet_reads}")
+    print(f"concurrent orders placed: {sum(outcomes)}/{args.orders}, balance reads: {concurrent_reads}")
+    print(f"cache hits {stats['hits']}, misses {stats['misses']}")
+    assert placed == args.orders and all(outcomes), "orders failed"
+    assert sequential_reads == args.orders, \
+        f"expected one balance read per state change ({args.orders}), got {sequential_reads}"
+    assert quiet_reads == 1, f"expected 1 read (then cache hits) without state changes, got {quiet_reads}"
+    assert concurrent_reads == 1, f"expected concurrent sizing reads to share 1 GET, got {concurrent_reads}"
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Route Latency Load Test - order latency under heavy dashboard read traffic
+
+Runs the FastAPI app against a fake OKX server and measures
+POST /api/v1/order/place latency twice: on an idle server, then while
+concurrent clients keep polling GET /api/v1/balance across all accounts.
+With exchange I/O off the event loop both runs should report similar numbers.
+
+Usage:
+    python -m benchmarks.route_latency [--accounts 20] [--readers 20] [--orders 30] [--delay 0.2]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_okx import start_fake_okx
+
+
+def _configure_env(url: str, accounts: int):
+    """Point the backend at the fake server and register benchmark accounts"""
+    os.environ["OKX_API_URL"] = url
+    os.environ["HTTP_POOL_WARM_CONNECTIONS"] = "1"
+    for i in range(accounts):
+        os.environ[f"BENCH{i:02d}_API_KEY"] = f"key-{i}"
+        os.environ[f"BENCH{i:02d}_SECRET_KEY"] = f"secret-{i}"
+        os.environ[f"BENCH{i:02d}_PASSPHRASE"] = f"pass-{i}"
+
+
+def _start_app(port: int):
+    """Start uvicorn in a background thread and wait until it is serving"""
+    import uvicorn
+    from backend.main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def _measure_orders(session, base: str, count: int):
+    """Place `count` sequential single-account orders and return latencies (ms)"""
+    latencies = []
+    payload = {
+        "account_names": ["BENCH00"],
+        "inst_id": "BTC-USDT-SWAP",
+        "side": "buy",
+        "ord_type": "market",
+        "sz": "1"
+    }
+    for _ in range(count):
+        start = time.perf_counter()
+        async with session.post(f"{base}/order/place", json=payload) as response:
+            await response.read()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+async def _reader(session, base: str, stop: asyncio.Event, counter: list):
+    """Poll /balance for every account until stopped"""
+    while not stop.is_set():
+        async with session.get(f"{base}/balance") as response:
+            await response.read()
+        counter[0] += 1
+
+
+def _summary(label: str, latencies):
+    ordered = sorted(latencies)
+    p95 = ordered[max(int(len(ordered) * 0.95) - 1, 0)]
+    print(f"{label:<28} p50={statistics.median(ordered):8.1f} ms  "
+          f"p95={p95:8.1f} ms  max={ordered[-1]:8.1f} ms")
+
+
+async def _run(args):
+    import aiohttp
+
+    base = f"http://127.0.0.1:{args.port}/api/v1"
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=300)) as session:
+        idle = await _measure_orders(session, base, args.orders)
+
+        stop = asyncio.Event()
+        reads = [0]
+        readers = [asyncio.create_task(_reader(session, base, stop, reads)) for _ in range(args.readers)]
+        await asyncio.sleep(args.delay * 2)
+        loaded = await _measure_orders(session, base, args.orders)
+        stop.set()
+        await asyncio.gather(*readers)
+
+    print(f"accounts={args.accounts} readers={args.readers} upstream_delay={args.delay * 1000:.0f} ms")
+    _summary("order/place (idle)", idle)
+    _summary("order/place (under reads)", loaded)
+    print(f"balance reads completed during loaded run: {reads[0]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--accounts", type=int, default=20)
+    parser.add_argument("--readers", type=int, default=20)
+    parser.add_argument("--orders", type=int, default=30)
+    parser.add_argument("--delay", type=float, default=0.2, help="Fake OKX latency (s)")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    fake = start_fake_okx(delay=args.delay)
+    _configure_env(fake.url, args.accounts)
+    server = _start_app(args.port)
+    try:
+        asyncio.run(_run(args))
+    finally:
+        server.should_exit = True
+        fake.shutdown()
+
+
+if __name__ == "__main__":
+    main()